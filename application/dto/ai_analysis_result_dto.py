@@ -26,4 +26,20 @@ class PRMetadataResult(BaseModel):
     suggested_title: str = Field(..., description="Título sugerido")
     suggested_description: str = Field(..., description="Descripción sugerida")
     suggested_labels: List[str] = Field(..., description="Etiquetas sugeridas")
-    reasoning: str = Field(..., description="Razonamiento detrás de las sugerencias") 
\ No newline at end of file
+    reasoning: str = Field(..., description="Razonamiento detrás de las sugerencias")
+
+
+# Estimación del análisis, calculada sin llamar al modelo
+
+class ReviewCostEstimate(BaseModel):
+    """DTO con la estimación previa (sin llamar al modelo) del análisis de un PR"""
+    model: str = Field(..., description="Modelo que se usaría")
+    tokenizer: str = Field(..., description="Tokenizador usado: tiktoken|heuristic")
+    files: int = Field(..., description="Archivos con cambios")
+    cached_files: int = Field(0, description="Archivos con resultado en caché (no se envían)")
+    calls: int = Field(..., description="Llamadas al modelo (fragmentos)")
+    prompt_tokens: int = Field(..., description="Tokens de entrada estimados")
+    estimated_output_tokens: int = Field(..., description="Tokens de salida estimados")
+    estimated_cost_usd: float = Field(..., description="Coste estimado en USD")
+    estimated_latency_seconds: float = Field(..., description="Latencia estimada del análisis")
+    trimmed_hunks: List[str] = Field(default_factory=list, description="Hunks que se descartarían por presupuesto")
@@ -0,0 +1,52 @@
+# Este módulo define el contexto de una revisión: la configuración vigente cargada una sola vez
+# Se comparte entre el análisis y la generación de metadatos para no repetir consultas
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from pydantic import BaseModel, Field
+from application.dto.prompt_dto import PromptDTO, RuleDTO
+from domain.models.pr_guidelines import PRDescriptionTemplate, PRLabel, PRTitleGuideline
+
+
+class ReviewContext(BaseModel):
+    """
+    Instantánea de la configuración de una revisión (prompts, reglas y guías de PR).
+    Se carga al inicio de la revisión y no cambia durante ella.
+    """
+    code_analysis_prompt: PromptDTO = Field(..., description="Prompt del análisis de código")
+    metadata_prompt: PromptDTO = Field(..., description="Prompt de la generación de metadatos")
+    rules: List[RuleDTO] = Field(default_factory=list, description="Reglas activas")
+    title_guidelines: List[PRTitleGuideline] = Field(default_factory=list, description="Guías de título activas")
+    description_template: Optional[PRDescriptionTemplate] = Field(None, description="Plantilla de descripción activa")
+    labels: List[PRLabel] = Field(default_factory=list, description="Etiquetas activas")
+
+    @staticmethod
+    def fetchers(prompt_repository, pr_guidelines_repository) -> Dict[str, Callable[[], Awaitable[Any]]]:
+        """Consultas que cargan cada campo del contexto, para obtenerlas en paralelo."""
+        return {
+            "code_analysis_prompt": lambda: prompt_repository.get_latest_prompt_by_category("code_analysis"),
+            "metadata_prompt": lambda: prompt_repository.get_latest_prompt_by_category("metadata"),
+            "rules": prompt_repository.get_all_active_rules,
+            "title_guidelines": pr_guidelines_repository.get_active_title_guidelines,
+            "description_template": pr_guidelines_repository.get_active_template,
+            "labels": pr_guidelines_repository.get_active_labels,
+        }
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Any]) -> "ReviewContext":
+        """Construye el contexto con los valores obtenidos por `fetchers` (ignora el resto)."""
+        return cls(**{name: values[name] for name in cls.model_fields if name in values})
+
+    @property
+    def title_guidelines_text(self) -> str:
+        return "\n".join(
+            f"{tg.prefix}: {tg.description} (min: {tg.min_length}, max: {tg.max_length})"
+            for tg in self.title_guidelines
+        )
+
+    @property
+    def description_template_text(self) -> str:
+        return self.description_template.template_content if self.description_template else ""
+
+    @property
+    def label_guidelines_text(self) -> str:
+        return "\n".join(f"{label.name}: {label.description}" for label in self.labels)
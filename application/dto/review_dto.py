@@ -0,0 +1,36 @@
+# Este módulo define los DTOs de los listados de revisiones
+# Las páginas usan paginación por cursor (keyset) sobre el id de la revisión
+
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from domain.models.review import ReviewStatus
+
+
+class ReviewSummaryDTO(BaseModel):
+    """
+    Resumen de una revisión para los listados del dashboard.
+    No incluye los comentarios, solo cuántos tiene.
+    """
+    id: int
+    pull_request_id: int
+    pr_number: int = Field(..., description="Número del PR en GitHub")
+    pr_title: str = Field(..., description="Título del PR")
+    repository: str = Field(..., description="Repositorio (owner/repo)")
+    author: str = Field(..., description="Autor del PR")
+    status: ReviewStatus
+    summary: str
+    score: float
+    head_sha: Optional[str] = None
+    comment_count: int = Field(0, description="Número de comentarios de la revisión")
+    created_at: datetime
+    updated_at: datetime
+
+
+class ReviewPageDTO(BaseModel):
+    """
+    Página de revisiones, de la más reciente a la más antigua.
+    `next_cursor` se pasa como `cursor` para obtener la siguiente (None si no hay más).
+    """
+    items: List[ReviewSummaryDTO] = Field(default_factory=list)
+    next_cursor: Optional[int] = None
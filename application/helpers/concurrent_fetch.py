@@ -0,0 +1,86 @@
+# Este módulo obtiene en paralelo entradas independientes (diff, prompts, reglas, guías)
+# Cada entrada tiene su propio timeout y su latencia queda registrada; un fallo se atribuye a su entrada
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FetchResult:
+    """Resultado de `fetch_concurrently`: valores, errores y latencias por entrada."""
+    values: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    latencies: Dict[str, float] = field(default_factory=dict)
+
+
+class FetchLatencyStats:
+    """Latencias acumuladas por entrada."""
+
+    def __init__(self):
+        self._calls: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._total: Dict[str, float] = {}
+        self._max: Dict[str, float] = {}
+
+    def record(self, result: FetchResult) -> None:
+        for name, elapsed in result.latencies.items():
+            self._calls[name] = self._calls.get(name, 0) + 1
+            self._total[name] = self._total.get(name, 0.0) + elapsed
+            self._max[name] = max(self._max.get(name, 0.0), elapsed)
+            if name in result.errors:
+                self._errors[name] = self._errors.get(name, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                "calls": calls,
+                "errors": self._errors.get(name, 0),
+                "avg_seconds": self._total[name] / calls,
+                "max_seconds": self._max[name]
+            }
+            for name, calls in self._calls.items()
+        }
+
+
+async def fetch_concurrently(
+    fetchers: Dict[str, Callable[[], Awaitable[Any]]],
+    timeout: float,
+    timeouts: Optional[Dict[str, float]] = None
+) -> FetchResult:
+    """
+    Ejecuta todas las obtenciones a la vez y espera a que terminen.
+
+    Args:
+        fetchers: Función asíncrona por nombre de entrada
+        timeout: Timeout por defecto de cada entrada (segundos)
+        timeouts: Timeouts específicos por entrada
+
+    Returns:
+        FetchResult: Valores de las entradas obtenidas, errores de las que fallaron
+        o agotaron su timeout, y latencia de cada una
+    """
+    timeouts = timeouts or {}
+    result = FetchResult()
+
+    async def fetch(name: str, fetcher: Callable[[], Awaitable[Any]]) -> None:
+        started = time.perf_counter()
+        limit = timeouts.get(name, timeout)
+        try:
+            result.values[name] = await asyncio.wait_for(fetcher(), timeout=limit)
+        except asyncio.TimeoutError:
+            result.errors[name] = f"timeout tras {limit:.0f}s"
+        except Exception as e:
+            result.errors[name] = f"{type(e).__name__}: {str(e)}"
+        finally:
+            result.latencies[name] = time.perf_counter() - started
+
+    await asyncio.gather(*(fetch(name, fetcher) for name, fetcher in fetchers.items()))
+    logger.debug(
+        "Latencia de entradas: " + ", ".join(f"{name}={elapsed * 1000:.0f}ms" for name, elapsed in result.latencies.items())
+    )
+    return result
@@ -2,6 +2,7 @@
 
 from application.dto.ai_analysis_result_dto import CodeAnalysisResult, PRMetadataResult
 from domain.models.review import Review
+from typing import List
 import logging
 
 logger = logging.getLogger(__name__)
@@ -58,3 +59,43 @@ def update_review_with_analysis(review: Review, code_analysis: CodeAnalysisResul
 
     # Marcar la revisión como completada
     review.complete(code_analysis.score)
+
+
+def merge_code_analysis_results(results: List[CodeAnalysisResult], weights: List[float]) -> CodeAnalysisResult:
+    """
+    Combina los resultados del análisis de varios fragmentos del diff en uno solo.
+
+    Args:
+        results (List[CodeAnalysisResult]): Resultados de cada fragmento, en orden.
+        weights (List[float]): Peso de cada fragmento (p. ej. su tamaño en tokens) para la puntuación.
+
+    Returns:
+        CodeAnalysisResult: Resultado con los comentarios concatenados, los resúmenes y los
+        problemas de seguridad y rendimiento sin duplicados y la puntuación media ponderada.
+    """
+    if len(results) == 1:
+        return results[0]
+
+    def dedupe(items: List[str]) -> List[str]:
+        seen = set()
+        unique = []
+        for item in items:
+            key = " ".join(item.lower().split())
+            if key not in seen:
+                seen.add(key)
+                unique.append(item)
+        return unique
+
+    total_weight = sum(weights)
+    if total_weight > 0:
+        score = sum(result.score * weight for result, weight in zip(results, weights)) / total_weight
+    else:
+        score = sum(result.score for result in results) / len(results)
+
+    return CodeAnalysisResult(
+        summary="\n\n".join(dedupe([result.summary for result in results if result.summary])),
+        score=round(score, 2),
+        comments=[comment for result in results for comment in result.comments],
+        security_concerns=dedupe([c for result in results for c in result.security_concerns]),
+        performance_issues=dedupe([p for result in results for p in result.performance_issues])
+    )
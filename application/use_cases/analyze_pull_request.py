@@ -1,21 +1,26 @@
 # Este módulo implementa el caso de uso principal para analizar Pull Requests
 # Coordina la interacción entre servicios y maneja el flujo de análisis
 
-from typing import List
+from typing import List, Optional, Tuple
 from datetime import datetime
 import logging
 import asyncio
+from application.dto.review_context import ReviewContext
+from application.helpers.concurrent_fetch import FetchLatencyStats, fetch_concurrently
 from application.helpers.transformers import update_review_with_analysis
 from application.use_cases.generate_pr_metadata import GeneratePRMetadataUseCase
+from domain.models.file_patch import FilePatch
 from domain.models.pull_request import PullRequest
 from domain.models.review import Review, ReviewStatus, ReviewComment
-from domain.exceptions import ReviewFailedException
+from domain.exceptions import ReviewFailedException, ReviewInputFetchException
 from infrastructure.database.repositories.reviews_repository import ReviewsRepository
 from infrastructure.database.repositories.prompt_repository import PromptRepository
 from infrastructure.github.github_service import GitHubService
 from infrastructure.ai.langchain_orchestrator import LangchainOrchestrator
 from infrastructure.database.repositories.pull_request_repository import PullRequestRepository
 from infrastructure.database.repositories.pr_guidelines_repository import PRGuidelinesRepository
+from infrastructure.database.config_cache import ConfigurationCache
+from infrastructure.database.review_write_buffer import ReviewWriteBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +34,10 @@ class AnalyzePullRequestUseCase:
         ai_service: LangchainOrchestrator,
         pr_guidelines_repository: PRGuidelinesRepository,
         metadata_generator: GeneratePRMetadataUseCase,  # Nueva dependencia inyectada
-
+        input_timeout: float = 30.0,
+        diff_timeout: float = 120.0,
+        config_cache: Optional[ConfigurationCache] = None,
+        review_writer: Optional[ReviewWriteBuffer] = None
     ):
         """
         Inicializa el caso de uso con sus dependencias.
@@ -40,6 +48,10 @@ class AnalyzePullRequestUseCase:
             prompt_repository: Repositorio para obtener prompts y reglas
             github_service: Servicio para interactuar con GitHub
             ai_service: Servicio para realizar análisis con IA
+            input_timeout: Timeout de cada consulta de configuración (segundos)
+            diff_timeout: Timeout de la descarga de los cambios del PR (segundos)
+            config_cache: Caché de la configuración de revisión (None para consultarla siempre)
+            review_writer: Búfer de guardado diferido (None para guardar cada revisión al momento)
         """
         self.reviews_repo = reviews_repository
         self.pr_repo = pull_request_repository
@@ -48,18 +60,28 @@ class AnalyzePullRequestUseCase:
         self.pr_guidelines_repo = pr_guidelines_repository
         self.metadata_generator = metadata_generator
         self.ai = ai_service
+        self.input_timeout = input_timeout
+        self.diff_timeout = diff_timeout
+        self.config_cache = config_cache
+        self.review_writer = review_writer
+        self.input_stats = FetchLatencyStats()
 
     """
     Caso de uso principal para analizar Pull Requests.
     Coordina el proceso completo de análisis y revisión.
     """
 
-    async def execute(self, pull_request: PullRequest) -> Review:
+    async def execute(self, pull_request: PullRequest, action: Optional[str] = None) -> Review:
         """
         Ejecuta el análisis completo de un Pull Request.
+
+        En los eventos `synchronize` la revisión es incremental: solo se analiza el
+        diff entre el último commit revisado y el nuevo head, y los comentarios de
+        la revisión anterior sobre archivos no modificados se conservan.
         
         Args:
             pull_request: Pull Request a analizar
+            action: Acción del webhook (opened, synchronize, ...)
             
         Returns:
             Review: Resultado del análisis
@@ -67,55 +89,64 @@ class AnalyzePullRequestUseCase:
         Raises:
             ReviewFailedException: Si ocurre un error durante el análisis
         """
+        review = None
+        posted = False
         try:
-            # Guardar PR y obtener ID interno
-            pr_internal_id = self.pr_repo.save(pull_request)
-
-            # Crear review inicial con el ID interno de tech_prs
-            review = Review(
-                pull_request_id=pr_internal_id,  # Usar el ID interno, no el github_id
-                status=ReviewStatus.IN_PROGRESS,
-                summary="",
-                score=0.0,
-                comments=[],
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-
-            # Obtener cambios del PR
-            diff = await self.github.get_pull_request_diff(
-                pull_request.repository,
-                pull_request.number
+            # Guardar el PR y obtener en paralelo los cambios y la configuración de la revisión;
+            # son consultas independientes entre sí. La configuración se carga una sola vez
+            # (ReviewContext) y la usan tanto el análisis como la generación de metadatos;
+            # con la caché de configuración normalmente no requiere ninguna consulta
+            if self.config_cache is not None:
+                context_fetchers = {"review_context": self.config_cache.get}
+            else:
+                context_fetchers = ReviewContext.fetchers(self.prompt_repo, self.pr_guidelines_repo)
+            inputs = await fetch_concurrently(
+                {
+                    "pull_request": lambda: self.pr_repo.save(pull_request),
+                    "file_patches": lambda: self._collect_file_patches(pull_request),
+                    **context_fetchers,
+                },
+                timeout=self.input_timeout,
+                timeouts={"file_patches": self.diff_timeout}
             )
+            self.input_stats.record(inputs)
 
-            # Si el diff es bytes, decodificarlo a UTF-8
-            if isinstance(diff, bytes):
-                diff = diff.decode("utf-8")
+            if "pull_request" in inputs.values:
+                # Crear review inicial con el ID interno de tech_prs
+                review = Review(
+                    pull_request_id=inputs.values["pull_request"],  # Usar el ID interno, no el github_id
+                    status=ReviewStatus.IN_PROGRESS,
+                    summary="",
+                    score=0.0,
+                    comments=[],
+                    head_sha=pull_request.head_sha,
+                    created_at=datetime.utcnow(),
+                    updated_at=datetime.utcnow()
+                )
+            if inputs.errors:
+                raise ReviewInputFetchException(inputs.errors)
 
-            # Obtener prompt activo y reglas
-            code_analysis_prompt = self.prompt_repo.get_latest_prompt_by_category("code_analysis")
-            metadata_prompt = self.prompt_repo.get_latest_prompt_by_category("metadata")
-            
-            # Obtener reglas y guías
-            rules = self.prompt_repo.get_all_active_rules()
-
-            # Recuperar guías de título, plantilla de descripción y lineamientos de etiquetas
-            active_title_guidelines = self.pr_guidelines_repo.get_active_title_guidelines()
-            title_guidelines_str = "\n".join(
-                f"{tg.prefix}: {tg.description} (min: {tg.min_length}, max: {tg.max_length})"
-                for tg in active_title_guidelines
-            )
+            pr_internal_id = inputs.values["pull_request"]
+            file_patches = inputs.values["file_patches"]
+            diff = "".join(patch.diff for patch in file_patches)
+            logger.info(f"PR #{pull_request.number}: {len(file_patches)} archivos modificados")
 
-            active_description_template = self.pr_guidelines_repo.get_active_template()
-            description_template_str = (
-                active_description_template.template_content
-                if active_description_template else ""
-            )
+            # En un push a un PR ya revisado, analizar solo lo que cambió desde la última revisión
+            previous_review, changed_patches = None, None
+            if action == "synchronize":
+                previous_review, changed_patches = await self._get_incremental_patches(
+                    pull_request, pr_internal_id, file_patches
+                )
+            if changed_patches == []:
+                # El push no cambió ningún archivo del diff del PR (rebase, merge de la rama base):
+                # se conserva la revisión anterior con el nuevo head_sha, sin volver a publicarla
+                logger.info(f"PR #{pull_request.number}: sin cambios en el diff; se conserva la revisión anterior")
+                self._keep_previous(review, previous_review, file_patches)
+                await self._persist(review)
+                return review
+            analysis_diff = diff if changed_patches is None else "".join(patch.diff for patch in changed_patches)
 
-            active_labels = self.pr_guidelines_repo.get_active_labels()
-            label_guidelines_str = "\n".join(
-                f"{label.name}: {label.description}" for label in active_labels
-            )
+            review_context = inputs.values.get("review_context") or ReviewContext.from_values(inputs.values)
 
             # Definir contexto adicional
             context = {
@@ -127,18 +158,18 @@ class AnalyzePullRequestUseCase:
 
             # Realizar análisis en paralelo
             code_analysis_task = self.ai.analyze_code(
-                diff=diff,
-                prompt=code_analysis_prompt.prompt_text,
-                rules=rules,
+                diff=analysis_diff,
+                prompt=review_context.code_analysis_prompt.prompt_text,
+                rules=review_context.rules,
                 context=context
             )
             
             metadata_task = self.ai.generate_metadata(
-                prompt=metadata_prompt.prompt_text,
+                prompt=review_context.metadata_prompt.prompt_text,
                 context=context,
-                title_guidelines=title_guidelines_str,
-                description_template=description_template_str,
-                label_guidelines=label_guidelines_str
+                title_guidelines=review_context.title_guidelines_text,
+                description_template=review_context.description_template_text,
+                label_guidelines=review_context.label_guidelines_text
             )
             
             # Esperar resultados
@@ -148,21 +179,24 @@ class AnalyzePullRequestUseCase:
             )
             
             
-            pull_request = await self.metadata_generator.execute(pull_request)
+            pull_request = self.metadata_generator.execute(pull_request, review_context)
 
             # Actualizar review con resultados
             update_review_with_analysis(review, code_analysis, metadata)
+            new_comments = list(review.comments)
+            if previous_review is not None:
+                self._carry_forward(review, previous_review, file_patches, changed_patches)
 
-            # Guardar en base de datos
-            await self.reviews_repo.save(review)
-
-            # Publicar comentarios en GitHub
+            # Publicar comentarios en GitHub (los arrastrados ya están publicados)
             await self.github.create_review_comments(
                 repository=pull_request.repository,
                 pr_number=pull_request.number,
-                review=review,
+                review=review.model_copy(update={"comments": new_comments}),
                 diff=diff,
+                installation_id=pull_request.installation_id,
+                commit_id=pull_request.head_sha
             )
+            posted = True
 
             # Crear un comentario adicional con la metadata sugerida para que el usuario la revise
             metadata = {
@@ -174,13 +208,122 @@ class AnalyzePullRequestUseCase:
             await self.github.create_metadata_comment(
                 repository=pull_request.repository,
                 pr_number=pull_request.number,
-                metadata=metadata
+                metadata=metadata,
+                installation_id=pull_request.installation_id
             )
+
+            # Guardar en base de datos una vez publicada: la latencia de la BD no retrasa el feedback
+            await self._persist(review)
             return review
 
         except Exception as e:
             logger.error(f"Error analizando PR: {str(e)}", exc_info=True)
             if review:
                 review.fail(str(e))
-                await self.reviews_repo.save(review)
-            raise ReviewFailedException(str(e))
+                await self._persist(review)
+            # `posted`: los comentarios ya están en GitHub; reintentar la revisión los duplicaría
+            raise ReviewFailedException(str(e), details={"posted": posted})
+
+    async def _persist(self, review: Review) -> None:
+        """Guarda la revisión, en diferido si hay búfer de escritura."""
+        if self.review_writer is not None:
+            self.review_writer.submit(review)
+        else:
+            await self.reviews_repo.save(review)
+
+    async def _collect_file_patches(self, pull_request: PullRequest) -> List[FilePatch]:
+        """Cambios del PR archivo por archivo (con tope de tamaño y respaldo paginado)."""
+        return [
+            patch async for patch in self.github.iter_pull_request_files(
+                pull_request.repository,
+                pull_request.number,
+                installation_id=pull_request.installation_id
+            )
+        ]
+
+    async def _get_incremental_patches(
+            self,
+            pull_request: PullRequest,
+            pr_internal_id: int,
+            file_patches: List[FilePatch]
+    ) -> Tuple[Optional[Review], Optional[List[FilePatch]]]:
+        """
+        Obtiene los archivos que cambiaron desde la última revisión completada.
+
+        Returns:
+            Tuple[Optional[Review], Optional[List[FilePatch]]]: Revisión anterior y parches del
+            incremento (limitados a archivos del diff del PR), o (None, None) si hay que
+            revisar el PR completo
+        """
+        # Con guardado diferido la revisión anterior puede seguir en el búfer, aún no en la BD
+        previous_review = None
+        if self.review_writer is not None:
+            previous_review = self.review_writer.last_completed(pr_internal_id)
+        if previous_review is None:
+            previous_review = await self.reviews_repo.get_last_completed_by_pr_id(pr_internal_id)
+        if previous_review is None or not previous_review.head_sha or not pull_request.head_sha:
+            return None, None
+        if previous_review.head_sha == pull_request.head_sha:
+            return None, None
+
+        compare_patches = await self.github.get_compare_files(
+            pull_request.repository,
+            previous_review.head_sha,
+            pull_request.head_sha,
+            installation_id=pull_request.installation_id
+        )
+        if compare_patches is None:
+            logger.info(f"PR #{pull_request.number}: no se puede revisar de forma incremental; revisión completa")
+            return None, None
+
+        pr_paths = {patch.path for patch in file_patches}
+        changed = [patch for patch in compare_patches if patch.path in pr_paths and patch.diff]
+        logger.info(
+            f"PR #{pull_request.number}: revisión incremental desde {previous_review.head_sha[:7]}, "
+            f"{len(changed)} de {len(file_patches)} archivos cambiados"
+        )
+        return previous_review, changed
+
+    @staticmethod
+    def _keep_previous(review: Review, previous_review: Review, file_patches: List[FilePatch]) -> None:
+        """Copia en la revisión nueva el resultado de la anterior (comentarios de archivos que siguen en el PR)."""
+        pr_paths = {patch.path for patch in file_patches}
+        review.summary = previous_review.summary
+        review.security_concerns = list(previous_review.security_concerns)
+        review.performance_issues = list(previous_review.performance_issues)
+        review.suggested_title = previous_review.suggested_title
+        review.suggested_description = previous_review.suggested_description
+        review.suggested_labels = list(previous_review.suggested_labels)
+        review.comments = [
+            comment.model_copy(update={"id": None, "review_id": None})
+            for comment in previous_review.comments
+            if not comment.file_path or comment.file_path in pr_paths
+        ]
+        review.complete(previous_review.score)
+
+    @staticmethod
+    def _carry_forward(
+            review: Review,
+            previous_review: Review,
+            file_patches: List[FilePatch],
+            changed_patches: List[FilePatch]
+    ) -> None:
+        """
+        Conserva los comentarios de la revisión anterior que siguen siendo válidos
+        (archivos del PR no modificados por el push) y pondera la puntuación por archivos.
+        """
+        pr_paths = {patch.path for patch in file_patches}
+        changed_paths = {patch.path for patch in changed_patches}
+        review.comments.extend(
+            comment.model_copy(update={"id": None, "review_id": None})
+            for comment in previous_review.comments
+            if comment.file_path in pr_paths and comment.file_path not in changed_paths
+        )
+
+        unchanged = len(pr_paths - changed_paths)
+        if changed_paths:
+            review.score = round(
+                (previous_review.score * unchanged + review.score * len(changed_paths))
+                / (unchanged + len(changed_paths)),
+                2
+            )
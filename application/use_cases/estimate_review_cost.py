@@ -0,0 +1,80 @@
+# Este módulo implementa el caso de uso que estima el coste de revisar un Pull Request
+# Permite conocer tokens, coste y latencia esperados sin llamar al modelo (dry-run)
+
+import asyncio
+import logging
+from typing import Optional
+from application.dto.ai_analysis_result_dto import ReviewCostEstimate
+from infrastructure.database.repositories.prompt_repository import PromptRepository
+from infrastructure.github.github_service import GitHubService
+from infrastructure.ai.langchain_orchestrator import LangchainOrchestrator
+
+logger = logging.getLogger(__name__)
+
+
+class EstimateReviewCostUseCase:
+    """
+    Caso de uso para estimar, antes de analizarlo, cuánto costaría revisar un PR.
+    Usa el mismo diff, prompt, reglas y presupuesto que el análisis real.
+    """
+
+    def __init__(
+        self,
+        prompt_repository: PromptRepository,
+        github_service: GitHubService,
+        ai_service: LangchainOrchestrator
+    ):
+        self.prompt_repo = prompt_repository
+        self.github = github_service
+        self.ai = ai_service
+
+    async def execute(
+        self,
+        repository: str,
+        pr_number: int,
+        installation_id: Optional[int] = None
+    ) -> ReviewCostEstimate:
+        """
+        Estima tokens, coste y latencia del análisis de código del PR.
+
+        Args:
+            repository (str): Repositorio en formato owner/repo.
+            pr_number (int): Número del Pull Request.
+            installation_id (Optional[int]): ID de la instalación de la GitHub App.
+
+        Returns:
+            ReviewCostEstimate: Estimación sin llamar al modelo.
+        """
+        async def fetch_diff() -> str:
+            patches = [
+                patch async for patch in self.github.iter_pull_request_files(
+                    repository, pr_number, installation_id=installation_id
+                )
+            ]
+            return "".join(patch.diff for patch in patches)
+
+        pr_data, diff = await asyncio.gather(
+            self.github.get_pull_request(repository, pr_number, installation_id=installation_id),
+            fetch_diff()
+        )
+
+        code_analysis_prompt = await self.prompt_repo.get_latest_prompt_by_category("code_analysis")
+        rules = await self.prompt_repo.get_all_active_rules()
+        context = {
+            "repository": repository,
+            "pr_number": pr_number,
+            "pr_title": pr_data.get("title"),
+            "pr_body": pr_data.get("body")
+        }
+
+        estimate = await self.ai.estimate_code_analysis(
+            diff=diff,
+            prompt=code_analysis_prompt.prompt_text,
+            rules=rules,
+            context=context
+        )
+        logger.info(
+            f"Estimación para {repository}#{pr_number}: {estimate.prompt_tokens} tokens, "
+            f"{estimate.calls} llamadas, ${estimate.estimated_cost_usd:.4f}"
+        )
+        return estimate
@@ -1,38 +1,36 @@
 import logging
 from datetime import datetime
 from domain.models.pull_request import PullRequest
+from application.dto.review_context import ReviewContext
 from domain.exceptions import PRMetadataGenerationException
-from infrastructure.database.repositories.pr_guidelines_repository import PRGuidelinesRepository
 
 logger = logging.getLogger(__name__)
 
 class GeneratePRMetadataUseCase:
     """
     Caso de uso para generar metadatos (título, descripción y etiquetas)
-    para un Pull Request utilizando las configuraciones almacenadas en la BD.
+    para un Pull Request utilizando las configuraciones de la revisión.
+    No accede a la BD: las guías llegan en el ReviewContext cargado una vez por revisión.
     """
 
-    def __init__(self, pr_guidelines_repo: PRGuidelinesRepository):
-        self.pr_guidelines_repo = pr_guidelines_repo
-
-    async def execute(self, pull_request: PullRequest) -> PullRequest:
+    def execute(self, pull_request: PullRequest, context: ReviewContext) -> PullRequest:
         """
         Genera y actualiza los metadatos sugeridos para el PR.
 
         Args:
             pull_request (PullRequest): Modelo de dominio del PR.
+            context (ReviewContext): Configuración cargada al inicio de la revisión.
 
         Returns:
             PullRequest: El PR actualizado con metadatos generados.
         """
         try:
-            # Recuperar configuraciones activas
-            title_guidelines = self.pr_guidelines_repo.get_active_title_guidelines()
-            template = self.pr_guidelines_repo.get_active_template()
-            active_labels = self.pr_guidelines_repo.get_active_labels()
+            title_guidelines = context.title_guidelines
+            template = context.description_template
+            active_labels = context.labels
 
-            # Validar el título actual con las guías
-            valid_title = False
+            # Validar el título actual con las guías (sin guías activas, cualquier título es válido)
+            valid_title = not title_guidelines
             for guideline in title_guidelines:
                 if guideline.validate_title(pull_request.title):
                     valid_title = True
@@ -47,13 +45,13 @@ class GeneratePRMetadataUseCase:
 
             # Aplicar la plantilla de descripción (si se define una)
             if template:
-                context = {
+                template_values = {
                     "pr_number": pull_request.number,
                     "title": pull_request.title,
                     "author": pull_request.author,
                     "repository": pull_request.repository
                 }
-                pull_request.body = template.apply_template(context)
+                pull_request.body = template.apply_template(template_values)
 
             # Actualizar etiquetas sugeridas
             if pull_request.suggested_labels:
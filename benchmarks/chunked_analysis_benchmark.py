@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Benchmark del análisis de código por fragmentos (map-reduce).
+
+Usa un LLM simulado cuya latencia crece con el tamaño del prompt y compara,
+para PRs de 1, 10 y 100 archivos, el tiempo total de:
+  - "single":  todo el diff en una sola llamada
+  - "chunked": una llamada por archivo (por hunks si supera --chunk-tokens), en paralelo y combinadas
+
+Uso:
+    python benchmarks/chunked_analysis_benchmark.py --files 1 10 100 --chunk-tokens 2000 --concurrency 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain.prompts import ChatPromptTemplate  # noqa: E402
+from infrastructure.ai.diff_chunker import estimate_tokens  # noqa: E402
+from infrastructure.ai.langchain_orchestrator import LangchainOrchestrator  # noqa: E402
+
+PROMPT = "Revisa el diff:\n{diff}\nReglas:\n{rules}\nContexto:\n{context}\n{format_instructions}"
+
+
+class FakeLLM:
+    """LLM simulado: latencia fija más un coste por token de entrada."""
+
+    def __init__(self, base_latency: float, seconds_per_1k_tokens: float):
+        self.base_latency = base_latency
+        self.seconds_per_1k_tokens = seconds_per_1k_tokens
+        self.calls = 0
+
+    async def agenerate(self, messages_list):
+        self.calls += 1
+        prompt = "".join(message.content for message in messages_list[0])
+        await asyncio.sleep(self.base_latency + estimate_tokens(prompt) / 1000 * self.seconds_per_1k_tokens)
+        text = json.dumps({
+            "summary": "ok",
+            "score": 80,
+            "comments": [{
+                "file_path": "src/module_0.py",
+                "line_number": 1,
+                "content": "comentario",
+                "type": "style",
+                "severity": "low"
+            }],
+            "security_concerns": ["entrada sin validar"],
+            "performance_issues": []
+        })
+        return SimpleNamespace(generations=[[SimpleNamespace(text=text)]])
+
+
+def build_diff(files: int, lines_per_file: int = 120) -> str:
+    parts = []
+    for f in range(files):
+        path = f"src/module_{f}.py"
+        parts.append(f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n")
+        for h in range(0, lines_per_file, 20):
+            parts.append(f"@@ -{h + 1},10 +{h + 1},20 @@\n")
+            parts.extend(f" context_line_{h}_{i} = compute(value_{i})\n" for i in range(10))
+            parts.extend(f"+added_line_{h}_{i} = transform(value_{i}, option=True)\n" for i in range(10))
+    return "".join(parts)
+
+
+async def run(mode: str, diff: str, args) -> tuple:
+    orchestrator = LangchainOrchestrator(
+        openai_api_key="benchmark",
+        chunk_max_tokens=args.chunk_tokens,
+        max_concurrency=args.concurrency
+    )
+    orchestrator.llm = FakeLLM(args.base_latency, args.seconds_per_1k_tokens)
+    start = time.perf_counter()
+    if mode == "single":
+        result = await orchestrator._analyze_chunk(ChatPromptTemplate.from_template(PROMPT), diff, "", {})
+    else:
+        result = await orchestrator.analyze_code(diff=diff, prompt=PROMPT, rules=[], context={})
+    return time.perf_counter() - start, orchestrator.llm.calls, len(result.comments)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--chunk-tokens", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--base-latency", type=float, default=0.05, help="Segundos fijos por llamada")
+    parser.add_argument("--seconds-per-1k-tokens", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"{'files':>6} {'tokens':>8} {'single':>10} {'chunked':>10} {'calls':>6} {'speedup':>8}")
+    for files in args.files:
+        diff = build_diff(files)
+        single, _, _ = await run("single", diff, args)
+        chunked, calls, _ = await run("chunked", diff, args)
+        print(
+            f"{files:>6} {estimate_tokens(diff):>8} {single * 1000:>8.0f}ms "
+            f"{chunked * 1000:>8.0f}ms {calls:>6} {single / chunked:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
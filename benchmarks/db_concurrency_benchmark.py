@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""
+Benchmark de la latencia del webhook con revisiones concurrentes.
+
+Simula N revisiones en paralelo que hacen las consultas a Supabase de una
+revisión real (guardar el PR, prompts, reglas, guías y dos guardados de la
+revisión) con los repositorios del proyecto sobre un cliente falso cuyo
+`.execute()` bloquea `--db-latency` segundos, como el cliente síncrono.
+Mientras tanto llegan webhooks cada `--webhook-interval` segundos y se mide
+cuánto tarda el handler (trivial) en responder:
+  - "blocking": `.execute()` dentro del event loop (comportamiento anterior)
+  - "offloaded": consultas en el pool acotado de hilos (run_db)
+
+Uso:
+    python benchmarks/db_concurrency_benchmark.py --reviews 50 --db-latency 0.02 --threads 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from domain.models.pull_request import PullRequest, PullRequestStatus  # noqa: E402
+from domain.models.review import Review, ReviewComment, ReviewStatus  # noqa: E402
+from infrastructure.database import db_executor  # noqa: E402
+from infrastructure.database.repositories.pr_guidelines_repository import PRGuidelinesRepository  # noqa: E402
+from infrastructure.database.repositories.prompt_repository import PromptRepository  # noqa: E402
+from infrastructure.database.repositories.pull_request_repository import PullRequestRepository  # noqa: E402
+from infrastructure.database.repositories.reviews_repository import ReviewsRepository  # noqa: E402
+
+PROMPT_ROW = {"id": "1", "name": "code", "version": "1", "prompt_text": "{diff}", "is_active": True}
+
+
+class FakeQuery:
+    """Constructor de consultas de PostgREST cuyo execute() bloquea como una petición HTTP."""
+
+    def __init__(self, table: str, latency: float):
+        self.table = table
+        self.latency = latency
+        self.writes = False
+
+    def __getattr__(self, name):
+        if name in ("insert", "update", "upsert"):
+            self.writes = True
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        time.sleep(self.latency)
+        if self.writes:
+            return SimpleNamespace(data=[{"id": 1}])
+        if self.table == "tech_analysis_prompts":
+            return SimpleNamespace(data=[PROMPT_ROW])
+        return SimpleNamespace(data=[])
+
+
+class FakeRpc:
+    """Llamada a una función de la BD (save_review) que bloquea como una petición HTTP."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def execute(self):
+        time.sleep(self.latency)
+        return SimpleNamespace(data={"id": 1, "comments": []})
+
+
+class FakeSupabase:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(name, self.latency)
+
+    def rpc(self, name: str, params: dict) -> FakeRpc:
+        return FakeRpc(self.latency)
+
+
+class InlineExecutor:
+    """Ejecuta la consulta en el event loop, bloqueándolo (comportamiento anterior)."""
+
+    async def run(self, query):
+        return query.execute()
+
+
+async def simulate_review(supabase: FakeSupabase, number: int, llm_latency: float) -> None:
+    now = datetime.utcnow()
+    pull_request = PullRequest(
+        github_id=number, number=number, title="feat: x", body="", status=PullRequestStatus.OPEN,
+        author="dev", repository="owner/repo", base_branch="main", head_branch="f",
+        created_at=now, updated_at=now, suggested_title=""
+    )
+    prompts = PromptRepository(supabase)
+    guidelines = PRGuidelinesRepository(supabase)
+    reviews = ReviewsRepository(supabase)
+
+    pr_id = await PullRequestRepository(supabase).save(pull_request)
+    review = Review(pull_request_id=pr_id, status=ReviewStatus.IN_PROGRESS, summary="", score=0.0)
+    await prompts.get_latest_prompt_by_category("code_analysis")
+    await prompts.get_latest_prompt_by_category("metadata")
+    await prompts.get_all_active_rules()
+    await guidelines.get_active_title_guidelines()
+    await guidelines.get_active_template()
+    await guidelines.get_active_labels()
+    await asyncio.sleep(llm_latency)  # Llamada al modelo
+    await reviews.save(review)
+    review.status = ReviewStatus.COMPLETED
+    review.comments = [ReviewComment(file_path="a.py", line_number=1, content="c")]
+    await reviews.save(review)
+
+
+async def run_mode(mode: str, args) -> dict:
+    db_executor._executor = InlineExecutor() if mode == "blocking" else db_executor.DatabaseExecutor(args.threads)
+    supabase = FakeSupabase(args.db_latency)
+    latencies = []
+    done = asyncio.Event()
+
+    async def handle_webhook(received_at: float) -> None:
+        await asyncio.sleep(0)  # Handler trivial: parsear y encolar
+        latencies.append(time.perf_counter() - received_at)
+
+    async def webhook_traffic() -> None:
+        # Llegadas a ritmo fijo: si el loop estuvo bloqueado, las atrasadas cuentan desde su llegada
+        handlers = []
+        arrival = time.perf_counter()
+        while not done.is_set():
+            while arrival <= time.perf_counter():
+                handlers.append(asyncio.create_task(handle_webhook(arrival)))
+                arrival += args.webhook_interval
+            await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+        await asyncio.gather(*handlers)
+
+    traffic = asyncio.create_task(webhook_traffic())
+    start = time.perf_counter()
+    await asyncio.gather(*(simulate_review(supabase, n, args.llm_latency) for n in range(args.reviews)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await traffic
+    if isinstance(db_executor._executor, db_executor.DatabaseExecutor):
+        db_executor._executor.shutdown()
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "reviews_seconds": elapsed,
+        "webhooks": len(latencies),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "max_ms": latencies[-1] * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reviews", type=int, default=50, help="Revisiones concurrentes")
+    parser.add_argument("--db-latency", type=float, default=0.02, help="Segundos por consulta a Supabase")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Segundos de la llamada al modelo")
+    parser.add_argument("--threads", type=int, default=10, help="Tamaño del pool de hilos (DB_MAX_THREADS)")
+    parser.add_argument("--webhook-interval", type=float, default=0.01, help="Segundos entre webhooks")
+    args = parser.parse_args()
+
+    print(f"{'modo':<10} {'revisiones (s)':>15} {'webhooks':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9}")
+    for mode in ("blocking", "offloaded"):
+        r = asyncio.run(run_mode(mode, args))
+        print(f"{r['mode']:<10} {r['reviews_seconds']:>15.2f} {r['webhooks']:>9} "
+              f"{r['p50_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['max_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
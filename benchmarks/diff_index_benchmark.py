@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Microbenchmark de la ubicación de comentarios en el diff.
+
+Compara, escalando el tamaño del diff y el número de comentarios:
+  - "legacy": re-parsear el diff por cada comentario y recorrer archivos/hunks linealmente
+  - "index":  construir DiffIndex una vez y consultar con dict + bisect
+
+Uso:
+    python benchmarks/diff_index_benchmark.py --lines 1000 5000 20000 --comments 10 80
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import unidiff
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from domain.models.review import ReviewComment  # noqa: E402
+from infrastructure.github.diff_index import DiffIndex  # noqa: E402
+
+HUNK_CONTEXT = 3
+HUNK_ADDED = 4
+
+
+def build_diff(total_lines: int, files: int = 20) -> str:
+    """Genera un diff sintético de aproximadamente `total_lines` líneas repartidas en `files` archivos."""
+    hunk_size = 2 * HUNK_CONTEXT + HUNK_ADDED
+    hunks_per_file = max(1, total_lines // (files * (hunk_size + 1)))
+    parts = []
+    for f in range(files):
+        path = f"src/module_{f}.py"
+        parts.append(f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n")
+        offset = 0
+        for h in range(hunks_per_file):
+            source_start = h * 50 + 1
+            target_start = source_start + offset
+            parts.append(
+                f"@@ -{source_start},{2 * HUNK_CONTEXT} +{target_start},{hunk_size} @@\n"
+            )
+            parts.extend(f" context {h}-{i}\n" for i in range(HUNK_CONTEXT))
+            parts.extend(f"+added {h}-{i}\n" for i in range(HUNK_ADDED))
+            parts.extend(f" context {h}-{i}\n" for i in range(HUNK_CONTEXT))
+            offset += HUNK_ADDED
+    return "".join(parts)
+
+
+def build_comments(count: int, files: int = 20, max_line: int = 2000) -> list:
+    rng = random.Random(42)
+    return [
+        ReviewComment(
+            file_path=f"src/module_{rng.randrange(files)}.py",
+            line_number=rng.randrange(1, max_line),
+            content="comment",
+        )
+        for _ in range(count)
+    ]
+
+
+def legacy_locate(diff: str, comments: list) -> int:
+    """Reproduce el algoritmo anterior de GitHubService.create_review_comments."""
+    found = 0
+    for comment in comments:
+        patch_set = unidiff.PatchSet(diff.splitlines(keepends=True))
+        target_file = None
+        for patched_file in patch_set:
+            if patched_file.path == comment.file_path:
+                target_file = patched_file
+                break
+        if target_file:
+            for hunk in target_file:
+                if hunk.target_start <= comment.line_number < hunk.target_start + hunk.target_length:
+                    found += 1
+                    break
+    return found
+
+
+def index_locate(diff: str, comments: list) -> int:
+    located, _ = DiffIndex.from_diff(diff).partition(comments)
+    return len(located)
+
+
+def _time(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--comments", type=int, nargs="+", default=[10, 80])
+    args = parser.parse_args()
+
+    print(f"{'lines':>7} {'comments':>9} {'legacy':>10} {'index':>10} {'speedup':>8}")
+    for lines in args.lines:
+        diff = build_diff(lines)
+        for count in args.comments:
+            comments = build_comments(count)
+            assert legacy_locate(diff, comments[:5]) == index_locate(diff, comments[:5])
+            legacy = _time(legacy_locate, diff, comments)
+            index = _time(index_locate, diff, comments)
+            print(
+                f"{diff.count(chr(10)):>7} {count:>9} {legacy * 1000:>8.1f}ms "
+                f"{index * 1000:>8.1f}ms {legacy / index:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""
+Benchmark del cliente HTTP de GitHubService contra un servidor GitHub falso local.
+
+Compara la latencia por revisión (diff + review + comentario de metadata)
+entre:
+  - "per-call": un httpx.AsyncClient nuevo por petición (comportamiento anterior)
+  - "pooled":   el cliente compartido con keep-alive de GitHubService
+
+El servidor falso simula el coste del handshake TCP+TLS durmiendo `--handshake-ms`
+cada vez que acepta una conexión nueva, y `--rtt-ms` por cada petición.
+
+Uso:
+    python benchmarks/github_client_benchmark.py --reviews 50 --handshake-ms 30 --rtt-ms 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import httpx
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from domain.models.review import Review, ReviewStatus  # noqa: E402
+from infrastructure.github.github_service import GitHubService  # noqa: E402
+
+FAKE_DIFF = (
+    "diff --git a/app.py b/app.py\n"
+    "--- a/app.py\n"
+    "+++ b/app.py\n"
+    "@@ -1,2 +1,3 @@\n"
+    " import os\n"
+    "+import sys\n"
+    " print(os.getcwd())\n"
+)
+
+
+class FakeGitHubServer:
+    """Servidor HTTP/1.1 mínimo con keep-alive que imita los endpoints usados en una revisión."""
+
+    def __init__(self, handshake_ms: float, rtt_ms: float):
+        self.handshake = handshake_ms / 1000
+        self.rtt = rtt_ms / 1000
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+        self.port = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _route(self, method: str, path: str):
+        if path.endswith("/installation"):
+            return 200, "application/json", json.dumps({"id": 1})
+        if path.endswith("/access_tokens"):
+            return 201, "application/json", json.dumps(
+                {"token": "ghs_fake", "expires_at": "2099-01-01T00:00:00Z"}
+            )
+        if method == "GET" and "/pulls/" in path:
+            return 200, "text/plain", FAKE_DIFF
+        return 201, "application/json", json.dumps({"id": 1})
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.handshake)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode().split(" ", 2)
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value.strip())
+                if length:
+                    await reader.readexactly(length)
+
+                self.requests += 1
+                await asyncio.sleep(self.rtt)
+                status, content_type, body = self._route(method, path.split("?")[0])
+                payload = body.encode()
+                writer.write(
+                    f"HTTP/1.1 {status} OK\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: keep-alive\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class PerCallClientGitHubService(GitHubService):
+    """Reproduce el comportamiento anterior: un cliente nuevo por cada petición."""
+
+    async def _send_once(self, method: str, url: str, max_bytes=None, **kwargs) -> httpx.Response:
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self._timeout) as client:
+            return await self._transmit(client, method, url, max_bytes, **kwargs)
+
+
+def _private_key() -> str:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.TraditionalOpenSSL,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+async def _run_review(service: GitHubService) -> float:
+    review = Review(pull_request_id=1, status=ReviewStatus.COMPLETED, summary="ok", score=80.0)
+    start = time.perf_counter()
+    diff = await service.get_pull_request_diff("owner/repo", 1)
+    await service.create_review_comments("owner/repo", 1, review, diff, commit_id="abc123")
+    await service.create_metadata_comment("owner/repo", 1, {"suggested_title": "feat: x"})
+    return time.perf_counter() - start
+
+
+async def _bench(label: str, service: GitHubService, server: FakeGitHubServer, reviews: int) -> None:
+    server.connections = server.requests = 0
+    await _run_review(service)  # Calentamiento: resuelve la instalación y obtiene su token
+    latencies = [await _run_review(service) for _ in range(reviews)]
+    await service.close()
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<9} mean={statistics.mean(latencies) * 1000:7.2f}ms "
+        f"p50={statistics.median(latencies) * 1000:7.2f}ms p95={p95 * 1000:7.2f}ms "
+        f"connections={server.connections} requests={server.requests}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reviews", type=int, default=50)
+    parser.add_argument("--handshake-ms", type=float, default=30.0)
+    parser.add_argument("--rtt-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    server = FakeGitHubServer(args.handshake_ms, args.rtt_ms)
+    await server.start()
+    base_url = f"http://127.0.0.1:{server.port}"
+    private_key = _private_key()
+
+    print(f"{args.reviews} revisiones, handshake={args.handshake_ms}ms, rtt={args.rtt_ms}ms")
+    await _bench("per-call", PerCallClientGitHubService("1", private_key, base_url=base_url), server, args.reviews)
+    await _bench("pooled", GitHubService("1", private_key, base_url=base_url), server, args.reviews)
+    await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
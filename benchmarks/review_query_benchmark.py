@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+"""
+Benchmark de las consultas frecuentes de revisiones con y sin los índices de las migraciones.
+
+Crea un esquema reducido de tech_prs, tech_reviews y tech_review_comments con
+`--reviews` revisiones (por defecto 1M), y mide la latencia de las consultas que
+hacen los repositorios:
+  - pr_by_github_id:    upsert/lectura de PullRequestRepository
+  - latest_review:      ReviewsRepository.get_by_pr_id
+  - last_completed:     ReviewsRepository.get_last_completed_by_pr_id
+  - review_comments:    comentarios embebidos de una revisión
+  - repository_page:    listado por repositorio con cursor (keyset)
+primero solo con las claves primarias y unique, y después con los índices de
+005, 008, 009 y 011.
+
+Por defecto usa un SQLite temporal; con --database-url se ejecuta en Postgres,
+en un esquema `review_benchmark` que se elimina al terminar.
+
+Uso:
+    python benchmarks/review_query_benchmark.py --reviews 1000000 --samples 200
+    python benchmarks/review_query_benchmark.py --database-url postgresql://... --reviews 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+REVIEWS_PER_PR = 4
+REPOSITORIES = 200
+AUTHORS = 1000
+
+SCHEMA = [
+    "create table tech_prs (id integer primary key, github_id bigint unique not null, number integer not null, "
+    "repository text not null, author text not null)",
+    "create table tech_reviews (id integer primary key, pull_request_id bigint not null, status text not null, "
+    "score float not null, head_sha text, created_at {timestamp} not null)",
+    "create table tech_review_comments (id integer primary key, review_id bigint not null, file_path text not null, "
+    "line_number integer not null, content text not null, fingerprint text not null)",
+]
+
+INDEXES = [
+    "create index idx_tech_reviews_pr_completed on tech_reviews(pull_request_id, created_at desc) "
+    "where status = 'completed'",
+    "create unique index idx_tech_review_comments_review_fingerprint on tech_review_comments(review_id, fingerprint)",
+    "create index idx_tech_prs_repository on tech_prs(repository, id)",
+    "create index idx_tech_prs_author on tech_prs(author, id)",
+    "create index idx_tech_reviews_pr_id_desc on tech_reviews(pull_request_id, id desc)",
+    "create index idx_tech_reviews_pr_created on tech_reviews(pull_request_id, created_at desc)",
+]
+
+QUERIES = {
+    "pr_by_github_id": "select id from tech_prs where github_id = {p}",
+    "latest_review": "select * from tech_reviews where pull_request_id = {p} order by created_at desc limit 1",
+    "last_completed": "select * from tech_reviews where pull_request_id = {p} and status = 'completed' "
+                      "and head_sha is not null order by created_at desc limit 1",
+    "review_comments": "select * from tech_review_comments where review_id = {p}",
+    "repository_page": "select r.id, r.status, r.score, p.number from tech_reviews r "
+                       "join tech_prs p on p.id = r.pull_request_id "
+                       "where p.repository = {p} and r.id < {p} order by r.id desc limit 50",
+}
+
+
+class SQLiteDatabase:
+    placeholder = "?"
+
+    def __init__(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.connection = sqlite3.connect(os.path.join(self._dir.name, "bench.db"))
+
+    def create_schema(self):
+        for statement in SCHEMA:
+            self.connection.execute(statement.format(timestamp="text"))
+
+    def populate(self, reviews: int, comments_per_review: int):
+        prs = reviews // REVIEWS_PER_PR
+        self.connection.execute(
+            f"with recursive s(n) as (select 1 union all select n + 1 from s where n < {prs}) "
+            f"insert into tech_prs select n, 1000000 + n, n, 'owner/repo' || (n % {REPOSITORIES}), "
+            f"'dev' || (n % {AUTHORS}) from s"
+        )
+        self.connection.execute(
+            f"with recursive s(n) as (select 1 union all select n + 1 from s where n < {reviews}) "
+            f"insert into tech_reviews select n, 1 + (n % {prs}), "
+            f"case when n % 3 = 0 then 'failed' else 'completed' end, 80.0, 'sha' || n, "
+            f"datetime('2024-01-01', '+' || n || ' seconds') from s"
+        )
+        self.connection.execute(
+            f"with recursive s(n) as (select 1 union all select n + 1 from s where n < {reviews * comments_per_review}) "
+            f"insert into tech_review_comments select n, 1 + (n % {reviews}), 'src/file.py', n % 500, "
+            f"'comentario', 'fp' || n from s"
+        )
+        self.connection.commit()
+
+    def execute(self, statement: str):
+        self.connection.execute(statement)
+        self.connection.execute("analyze")
+
+    def query(self, sql: str, params):
+        return self.connection.execute(sql, params).fetchall()
+
+    def close(self):
+        self.connection.close()
+        self._dir.cleanup()
+
+
+class PostgresDatabase:
+    placeholder = "%s"
+
+    def __init__(self, database_url: str):
+        import psycopg2
+        self.connection = psycopg2.connect(database_url)
+        self.connection.autocommit = True
+        self.cursor = self.connection.cursor()
+        self.cursor.execute("drop schema if exists review_benchmark cascade")
+        self.cursor.execute("create schema review_benchmark")
+        self.cursor.execute("set search_path to review_benchmark")
+
+    def create_schema(self):
+        for statement in SCHEMA:
+            self.cursor.execute(statement.format(timestamp="timestamptz"))
+
+    def populate(self, reviews: int, comments_per_review: int):
+        prs = reviews // REVIEWS_PER_PR
+        self.cursor.execute(
+            f"insert into tech_prs select n, 1000000 + n, n, 'owner/repo' || (n % {REPOSITORIES}), "
+            f"'dev' || (n % {AUTHORS}) from generate_series(1, {prs}) n"
+        )
+        self.cursor.execute(
+            f"insert into tech_reviews select n, 1 + (n % {prs}), "
+            f"case when n % 3 = 0 then 'failed' else 'completed' end, 80.0, 'sha' || n, "
+            f"timestamptz '2024-01-01' + n * interval '1 second' from generate_series(1, {reviews}) n"
+        )
+        self.cursor.execute(
+            f"insert into tech_review_comments select n, 1 + (n % {reviews}), 'src/file.py', n % 500, "
+            f"'comentario', 'fp' || n from generate_series(1, {reviews * comments_per_review}) n"
+        )
+        self.cursor.execute("analyze")
+
+    def execute(self, statement: str):
+        self.cursor.execute(statement)
+        self.cursor.execute("analyze")
+
+    def query(self, sql: str, params):
+        self.cursor.execute(sql, params)
+        return self.cursor.fetchall()
+
+    def close(self):
+        self.cursor.execute("drop schema if exists review_benchmark cascade")
+        self.connection.close()
+
+
+def measure(db, reviews: int, samples: int) -> dict:
+    prs = reviews // REVIEWS_PER_PR
+    rng = random.Random(42)
+    params = {
+        "pr_by_github_id": lambda: (1000000 + rng.randint(1, prs),),
+        "latest_review": lambda: (rng.randint(1, prs),),
+        "last_completed": lambda: (rng.randint(1, prs),),
+        "review_comments": lambda: (rng.randint(1, reviews),),
+        "repository_page": lambda: (f"owner/repo{rng.randrange(REPOSITORIES)}", rng.randint(reviews // 2, reviews)),
+    }
+    results = {}
+    for name, sql in QUERIES.items():
+        sql = sql.replace("{p}", db.placeholder)
+        latencies = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            db.query(sql, params[name]())
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+        results[name] = (statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99) - 1] * 1000)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reviews", type=int, default=1_000_000, help="Revisiones generadas")
+    parser.add_argument("--comments-per-review", type=int, default=2, help="Comentarios por revisión")
+    parser.add_argument("--samples", type=int, default=200, help="Ejecuciones de cada consulta")
+    parser.add_argument("--database-url", default=None, help="Postgres en el que ejecutar (por defecto SQLite)")
+    args = parser.parse_args()
+
+    db = PostgresDatabase(args.database_url) if args.database_url else SQLiteDatabase()
+    try:
+        started = time.perf_counter()
+        db.create_schema()
+        db.populate(args.reviews, args.comments_per_review)
+        print(f"{args.reviews} revisiones generadas en {time.perf_counter() - started:.1f}s "
+              f"({'postgres' if args.database_url else 'sqlite'})")
+
+        without_indexes = measure(db, args.reviews, args.samples)
+        for statement in INDEXES:
+            db.execute(statement)
+        with_indexes = measure(db, args.reviews, args.samples)
+    finally:
+        db.close()
+
+    print(f"{'consulta':<18} {'sin índices p50/p99 (ms)':>26} {'con índices p50/p99 (ms)':>26}")
+    for name in QUERIES:
+        before, after = without_indexes[name], with_indexes[name]
+        print(f"{name:<18} {before[0]:>12.3f} / {before[1]:>11.3f} {after[0]:>12.3f} / {after[1]:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
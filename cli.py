@@ -1,41 +1,58 @@
 #!/usr/bin/env python
-import os
 import subprocess
 import sys
 import typer
 from infrastructure.config.settings import get_settings
-from infrastructure.database.supabase_client import get_client
+from infrastructure.database.migration_runner import MigrationError, MigrationRunner, connect, load_migrations
 
 app = typer.Typer(help="CLI para gestionar migraciones, seeds y tests de la aplicación.")
 
+def _migration_runner(database_url: str) -> MigrationRunner:
+    database_url = database_url or get_settings().DATABASE_URL
+    if not database_url:
+        typer.echo("Falta DATABASE_URL (cadena de conexión Postgres de Supabase) o --database-url.")
+        raise typer.Exit(code=1)
+    connection, dialect = connect(database_url)
+    return MigrationRunner(connection, dialect=dialect)
+
 @app.command()
-def migrate(version: str = ""):
+def migrate(version: str = "", database_url: str = ""):
     """
     Ejecuta las migraciones de la base de datos.
 
-    Si se pasa una versión específica, se puede usar para retroceder o avanzar a una migración en particular.
-    En este ejemplo se recorren todos los archivos SQL en el directorio de migraciones.
+    Aplica en orden los archivos de infrastructure/database/migrations que aún no figuran en
+    schema_migrations, cada uno en su propia transacción. Con --version se aplican solo hasta esa versión.
     """
     typer.echo("Ejecutando migraciones...")
-    # Se asume que las migraciones están en infrastructure/database/migrations
-    migrations_path = os.path.join(os.path.dirname(__file__), "infrastructure", "database", "migrations")
-    if not os.path.isdir(migrations_path):
-        typer.echo("No se encontró el directorio de migraciones.")
+    runner = _migration_runner(database_url)
+    try:
+        applied = runner.migrate(target=version or None)
+    except MigrationError as e:
+        typer.echo(str(e))
         raise typer.Exit(code=1)
+    for migration in applied:
+        typer.echo(f"Migración aplicada: {migration.version}_{migration.name}")
+    typer.echo(f"Migraciones completadas ({len(applied)} aplicadas).")
 
-    files = sorted([f for f in os.listdir(migrations_path) if f.endswith(".sql")])
-    for file in files:
-        file_path = os.path.join(migrations_path, file)
-        typer.echo(f"Ejecutando migración: {file}")
-        with open(file_path, "r", encoding="utf-8") as f:
-            sql = f.read()
-        # Aquí se debe ejecutar el SQL contra la base de datos.
-        # Por simplicidad, mostramos el contenido. En un entorno real se usaría el cliente de Supabase o psql.
-        typer.echo(sql)
-        # Por ejemplo, se podría ejecutar:
-        # client = get_client(get_settings())
-        # client.query(sql)   <-- Dependerá de la API del cliente.
-    typer.echo("Migraciones completadas.")
+@app.command()
+def migration_status(database_url: str = ""):
+    """
+    Muestra las migraciones aplicadas y las pendientes.
+    """
+    runner = _migration_runner(database_url)
+    applied = runner.applied()
+    for migration in load_migrations():
+        state = f"aplicada {applied[migration.version]['applied_at']}" if migration.version in applied else "pendiente"
+        typer.echo(f"{migration.version}_{migration.name}: {state}")
+
+@app.command()
+def baseline(version: str, database_url: str = ""):
+    """
+    Marca como aplicadas, sin ejecutarlas, las migraciones hasta la versión indicada.
+    Para bases de datos creadas a mano antes de usar `migrate`.
+    """
+    marked = _migration_runner(database_url).baseline(version)
+    typer.echo(f"{len(marked)} migraciones marcadas como aplicadas hasta la versión {version}.")
 
 @app.command()
 def seed(environment: str = "development"):
@@ -70,3 +70,40 @@ class ReviewFailedException(DomainException):
 class PRMetadataGenerationException(Exception):
     """Excepción para errores al generar metadatos del PR."""
     pass
+
+class GitHubUnavailableException(DomainException):
+    """Excepción para cuando el circuito hacia GitHub está abierto por fallos repetidos"""
+    def __init__(self, retry_after: float):
+        super().__init__(
+            code="GITHUB_UNAVAILABLE",
+            message="GitHub no está disponible temporalmente",
+            details={"retry_after": retry_after}
+        )
+
+class ReviewQueueFullException(DomainException):
+    """Excepción para cuando no se pueden encolar más revisiones"""
+    def __init__(self, message: str):
+        super().__init__(
+            code="REVIEW_QUEUE_FULL",
+            message=message
+        )
+
+class ReviewInputFetchException(DomainException):
+    """Excepción para cuando no se pueden obtener las entradas de una revisión"""
+    def __init__(self, errors: dict):
+        super().__init__(
+            code="REVIEW_INPUT_FETCH_FAILED",
+            message="No se pudieron obtener las entradas de la revisión: " + "; ".join(
+                f"{name} ({error})" for name, error in errors.items()
+            ),
+            details={"errors": errors}
+        )
+
+class CodeAnalysisFailedException(DomainException):
+    """Excepción para cuando falla el análisis de alguno de los fragmentos del diff"""
+    def __init__(self, failed_files: list, errors: list):
+        super().__init__(
+            code="CODE_ANALYSIS_FAILED",
+            message="No se pudo analizar: " + ", ".join(failed_files),
+            details={"failed_files": failed_files, "errors": errors}
+        )
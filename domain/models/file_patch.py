@@ -0,0 +1,112 @@
+# Este módulo define el modelo de dominio para el parche de un archivo dentro de un PR
+# Permite tratar el diff como una secuencia de archivos en lugar de un único texto
+
+import re
+from typing import List, Optional
+from pydantic import BaseModel
+
+_DIFF_GIT_HEADER = re.compile(r"^diff --git a/(.+?) b/(.+)$", re.MULTILINE)
+_TARGET_HEADER = re.compile(r"^\+\+\+ (?:b/)?(.+)$", re.MULTILINE)
+
+
+class FilePatch(BaseModel):
+    """
+    Modelo que representa los cambios de un archivo.
+    `diff` contiene la sección completa en formato unificado (cabeceras y hunks).
+    """
+    path: str
+    status: str = "modified"  # added, removed, modified, renamed
+    previous_path: Optional[str] = None
+    diff: str = ""
+    additions: int = 0
+    deletions: int = 0
+
+    @property
+    def header(self) -> str:
+        """Cabeceras del archivo (todo lo anterior al primer hunk)."""
+        index = self.diff.find("\n@@")
+        return self.diff if index == -1 else self.diff[:index + 1]
+
+    @property
+    def hunks(self) -> List[str]:
+        """Hunks del archivo, cada uno empezando por su línea `@@`."""
+        body = self.diff[len(self.header):]
+        if not body:
+            return []
+        parts = re.split(r"(?m)^(?=@@ )", body)
+        return [part for part in parts if part]
+
+    @classmethod
+    def from_unified_diff(cls, diff: str) -> List["FilePatch"]:
+        """
+        Divide un diff unificado completo en parches por archivo.
+
+        Args:
+            diff: Diff del PR en formato unificado
+
+        Returns:
+            List[FilePatch]: Un parche por cada sección `diff --git`
+        """
+        starts = [match.start() for match in _DIFF_GIT_HEADER.finditer(diff)]
+        patches = []
+        for i, start in enumerate(starts):
+            section = diff[start:starts[i + 1] if i + 1 < len(starts) else len(diff)]
+            source, target = _DIFF_GIT_HEADER.match(section).groups()
+            target_match = _TARGET_HEADER.search(section)
+            path = target_match.group(1) if target_match and target_match.group(1) != "/dev/null" else target
+
+            if "\nnew file mode" in section:
+                status = "added"
+            elif "\ndeleted file mode" in section:
+                status = "removed"
+            elif source != target:
+                status = "renamed"
+            else:
+                status = "modified"
+
+            lines = section.splitlines()
+            patches.append(cls(
+                path=path,
+                status=status,
+                previous_path=source if source != path else None,
+                diff=section,
+                additions=sum(1 for line in lines if line.startswith("+") and not line.startswith("+++")),
+                deletions=sum(1 for line in lines if line.startswith("-") and not line.startswith("---"))
+            ))
+        return patches
+
+    @classmethod
+    def from_github_file(cls, data: dict) -> "FilePatch":
+        """
+        Crea un parche a partir de un elemento de `/pulls/{n}/files`.
+        La API solo devuelve los hunks, así que se reconstruyen las cabeceras.
+
+        Args:
+            data: Elemento de la respuesta de GitHub
+
+        Returns:
+            FilePatch: Parche del archivo (sin hunks si GitHub no incluye `patch`, p. ej. binarios)
+        """
+        path = data["filename"]
+        previous_path = data.get("previous_filename")
+        status = data.get("status", "modified")
+        patch = data.get("patch")
+
+        diff = ""
+        if patch:
+            source = previous_path or path
+            diff = (
+                f"diff --git a/{source} b/{path}\n"
+                f"--- {'/dev/null' if status == 'added' else 'a/' + source}\n"
+                f"+++ {'/dev/null' if status == 'removed' else 'b/' + path}\n"
+                f"{patch}\n"
+            )
+
+        return cls(
+            path=path,
+            status=status,
+            previous_path=previous_path,
+            diff=diff,
+            additions=data.get("additions", 0),
+            deletions=data.get("deletions", 0)
+        )
@@ -30,11 +30,13 @@ class PullRequest(BaseModel):
     repository: str
     base_branch: str
     head_branch: str
+    head_sha: Optional[str] = None  # SHA del último commit de la rama origen
     created_at: datetime
     updated_at: datetime
     labels: List[str] = []
     suggested_labels: List[str] = []
     suggested_title: str
+    installation_id: Optional[int] = None  # Instalación de la GitHub App que emitió el evento
 
     @classmethod
     def from_github_payload(cls, payload: dict) -> "PullRequest":
@@ -58,11 +60,13 @@ class PullRequest(BaseModel):
             repository=payload["repository"]["full_name"],
             base_branch=pr_data["base"]["ref"],
             head_branch=pr_data["head"]["ref"],
+            head_sha=pr_data["head"].get("sha"),
             created_at=datetime.fromisoformat(pr_data["created_at"].replace("Z", "+00:00")),
             updated_at=datetime.fromisoformat(pr_data["updated_at"].replace("Z", "+00:00")),
             labels=[label["name"] for label in pr_data.get("labels", [])],
             suggested_title='',
             suggested_labels=[],
+            installation_id=(payload.get("installation") or {}).get("id"),
         )
 
     def is_ready_for_review(self) -> bool:
@@ -1,6 +1,7 @@
 # Este módulo define los modelos relacionados con las revisiones de código
 # Incluye la revisión principal y sus comentarios asociados
 
+import hashlib
 from datetime import datetime
 from typing import List, Optional
 from enum import Enum
@@ -25,6 +26,14 @@ class ReviewComment(BaseModel):
     content: str
     suggestion: Optional[str] = None
 
+    def fingerprint(self) -> str:
+        """
+        Huella estable del comentario (archivo, línea, contenido y sugerencia).
+        Debe coincidir con la calculada en 008_review_upsert.sql.
+        """
+        raw = "\x1f".join([self.file_path, str(self.line_number), self.content, self.suggestion or ""])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
 class Review(BaseModel):
     """
     Modelo principal de una revisión de código.
@@ -35,6 +44,7 @@ class Review(BaseModel):
     status: ReviewStatus
     summary: str
     score: float
+    head_sha: Optional[str] = None  # Commit del PR sobre el que se hizo la revisión
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     suggested_title: Optional[str] = None
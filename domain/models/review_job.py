@@ -0,0 +1,38 @@
+# Este módulo define el modelo de dominio de los trabajos de la cola persistente de revisiones
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+from domain.models.pull_request import PullRequest
+
+
+class ReviewJobStatus(str, Enum):
+    """Estados de un trabajo de revisión."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    DEAD = "dead"  # Sin intentos restantes; requiere reintento manual
+    SUPERSEDED = "superseded"  # Sustituido por un evento más reciente del mismo PR
+
+
+class ReviewJobRecord(BaseModel):
+    """Trabajo persistido en la cola de revisiones."""
+    id: int
+    repository: str
+    pr_number: int
+    action: Optional[str] = None
+    delivery_id: Optional[str] = None
+    payload: Dict[str, Any]
+    status: ReviewJobStatus
+    priority: int = 0
+    attempts: int = 0
+    max_attempts: int = 5
+    run_after: datetime
+    lease_until: Optional[datetime] = None
+    locked_by: Optional[str] = None
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    def pull_request(self) -> PullRequest:
+        return PullRequest(**self.payload)
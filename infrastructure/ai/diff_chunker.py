@@ -0,0 +1,89 @@
+# Este módulo divide el diff de un PR en fragmentos acotados por tokens
+# Permite analizar PRs grandes en varias llamadas al modelo en lugar de una sola
+
+from dataclasses import dataclass, field
+from typing import Callable, List
+from domain.models.file_patch import FilePatch
+
+# Aproximación de caracteres por token para código en modelos de OpenAI
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimación rápida del número de tokens de un texto."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class DiffChunk:
+    """Fragmento del diff que se analiza en una sola llamada al modelo."""
+    files: List[str] = field(default_factory=list)
+    parts: List[str] = field(default_factory=list)
+    tokens: int = 0
+
+    @property
+    def diff(self) -> str:
+        return "".join(self.parts)
+
+    def add(self, path: str, text: str, tokens: int) -> None:
+        if path not in self.files:
+            self.files.append(path)
+        self.parts.append(text)
+        self.tokens += tokens
+
+
+def chunk_file_patches(
+    patches: List[FilePatch],
+    max_tokens: int,
+    count_tokens: Callable[[str], int] = estimate_tokens
+) -> List[DiffChunk]:
+    """
+    Agrupa los parches en fragmentos de como máximo `max_tokens` tokens.
+
+    Los archivos completos se empaquetan juntos mientras quepan. Un archivo que
+    por sí solo supera el presupuesto se divide por hunks, repitiendo sus
+    cabeceras en cada fragmento para que el modelo sepa a qué archivo pertenecen.
+    Un hunk que por sí solo supera el presupuesto se envía en su propio fragmento.
+
+    Args:
+        patches: Parches por archivo del PR
+        max_tokens: Presupuesto de tokens del diff por fragmento
+        count_tokens: Función de conteo de tokens (por defecto, la estimación por caracteres)
+
+    Returns:
+        List[DiffChunk]: Fragmentos en el orden original de los archivos
+    """
+    chunks: List[DiffChunk] = []
+    current = DiffChunk()
+
+    def flush() -> None:
+        nonlocal current
+        if current.parts:
+            chunks.append(current)
+            current = DiffChunk()
+
+    for patch in patches:
+        if not patch.diff:
+            continue
+        tokens = count_tokens(patch.diff)
+        if tokens <= max_tokens:
+            if current.tokens + tokens > max_tokens:
+                flush()
+            current.add(patch.path, patch.diff, tokens)
+            continue
+
+        # Archivo demasiado grande: se reparte por hunks
+        header = patch.header
+        header_tokens = count_tokens(header)
+        flush()
+        for hunk in patch.hunks:
+            hunk_tokens = count_tokens(hunk)
+            if current.parts and current.tokens + hunk_tokens > max_tokens:
+                flush()
+            if not current.parts:
+                current.add(patch.path, header, header_tokens)
+            current.add(patch.path, hunk, hunk_tokens)
+        flush()
+
+    flush()
+    return chunks
@@ -1,20 +1,62 @@
+import asyncio
 import logging
-from typing import List, Dict, Any
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
 from langchain_community.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
+from langchain.schema import BaseMessage
 from langchain.output_parsers import PydanticOutputParser
-from application.dto.ai_analysis_result_dto import CodeAnalysisResult, PRMetadataResult
+from application.dto.ai_analysis_result_dto import CodeAnalysisResult, PRMetadataResult, ReviewCostEstimate
 from application.dto.prompt_dto import RuleDTO
+from application.helpers.transformers import merge_code_analysis_results
+from domain.exceptions import CodeAnalysisFailedException
+from domain.models.file_patch import FilePatch
+from infrastructure.ai.diff_chunker import DiffChunk, chunk_file_patches
+from infrastructure.ai.llm_cache import LLMResultCache
+from infrastructure.ai.token_budget import TokenBudget, TokenUsageStats, TrimmedHunk
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class _AnalysisPlan:
+    """Entradas preparadas para analizar (o estimar) un diff."""
+    prompt_template: ChatPromptTemplate
+    formatted_rules: str
+    overhead_tokens: int
+    chunk_limit: int
+    patches: List[FilePatch]
+    trimmed: List[TrimmedHunk]
+    chunks: Dict[str, List[DiffChunk]]
+    keys: Dict[str, str]
+
+
 class LangchainOrchestrator:
     """
     Orquestador para interactuar con modelos de IA usando LangChain.
     Maneja la generación y estructuración de revisiones de código usando structured outputs.
     """
 
-    def __init__(self, openai_api_key: str):
+    def __init__(
+            self,
+            openai_api_key: str,
+            chunk_max_tokens: int = 12000,
+            max_concurrency: int = 4,
+            cache: Optional[LLMResultCache] = None,
+            max_review_tokens: int = 200_000
+    ):
+        """
+        Args:
+            openai_api_key: API key de OpenAI
+            chunk_max_tokens: Tokens de diff por llamada; un archivo mayor se analiza por hunks en varias llamadas
+            max_concurrency: Llamadas simultáneas al modelo al analizar fragmentos
+            cache: Caché de resultados del LLM (opcional)
+            max_review_tokens: Tokens de diff máximos por revisión; el exceso se recorta por hunks
+        """
+        self.cache = cache
+        self.chunk_max_tokens = chunk_max_tokens
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
         self.llm = ChatOpenAI(
             model_name="o1-mini",
             # model_name="gpt-4o-mini-2024-07-18",
@@ -23,6 +65,8 @@ class LangchainOrchestrator:
         )
         self.code_analysis_parser = PydanticOutputParser(pydantic_object=CodeAnalysisResult)
         self.metadata_parser = PydanticOutputParser(pydantic_object=PRMetadataResult)
+        self.budget = TokenBudget(self.llm.model_name, max_review_tokens=max_review_tokens)
+        self.usage = TokenUsageStats()
 
     def _format_rules(self, rules: List[RuleDTO]) -> str:
         """
@@ -40,23 +84,244 @@ class LangchainOrchestrator:
             rules: List[RuleDTO],
             context: Dict[str, Any]
     ) -> CodeAnalysisResult:
-        """Analiza el código usando el prompt de análisis"""
+        """
+        Analiza el código usando el prompt de análisis.
+
+        Cada archivo se analiza y se cachea por separado (los que superan
+        `chunk_max_tokens` se dividen por hunks), así un archivo sin cambios
+        siempre se sirve de la caché y un push solo paga por lo que cambió.
+        Los archivos pendientes se analizan en paralelo con concurrencia
+        acotada (map) y los resultados se combinan en uno solo (reduce).
+
+        Raises:
+            CodeAnalysisFailedException: Si falla algún archivo (los demás quedan en caché)
+        """
+        plan = self._plan_analysis(diff, prompt, rules, context)
+        self.usage.trimmed_hunks += len(plan.trimmed)
+
+        if not plan.patches:
+            # Diff sin secciones por archivo: una sola llamada, cacheada por el diff completo
+            key = self._analysis_key(prompt, plan.formatted_rules, diff)
+            cached = await self._cache_get(key)
+            if cached is not None:
+                return CodeAnalysisResult.model_validate_json(cached)
+            result = await self._analyze_chunk(plan.prompt_template, diff, plan.formatted_rules, context)
+            await self._cache_put(key, result.model_dump_json())
+            return result
+
+        results: Dict[str, CodeAnalysisResult] = {}
+        for patch in plan.patches:
+            cached = await self._cache_get(plan.keys[patch.path])
+            if cached is not None:
+                results[patch.path] = CodeAnalysisResult.model_validate_json(cached)
+
+        pending = [patch for patch in plan.patches if patch.path not in results]
+        if results:
+            logger.info(f"Análisis en caché para {len(results)} de {len(plan.patches)} archivos")
+        if pending:
+            results.update(await self._analyze_files(plan, pending, context))
+
+        return merge_code_analysis_results(
+            [results[patch.path] for patch in plan.patches],
+            [sum(chunk.tokens for chunk in plan.chunks[patch.path]) for patch in plan.patches]
+        )
+
+    async def estimate_code_analysis(
+            self,
+            diff: str,
+            prompt: str,
+            rules: List[RuleDTO],
+            context: Dict[str, Any]
+    ) -> ReviewCostEstimate:
+        """
+        Estima tokens, coste y latencia de `analyze_code` sin llamar al modelo.
+        Aplica el mismo presupuesto, la misma división en fragmentos y descuenta los archivos en caché.
+        """
+        plan = self._plan_analysis(diff, prompt, rules, context)
+        cached_files = 0
+        if not plan.patches:
+            calls = 1
+            prompt_tokens = plan.overhead_tokens + self.budget.counter.count(diff)
+        else:
+            pending = []
+            for patch in plan.patches:
+                if self.cache is not None and await self.cache.contains(plan.keys[patch.path]):
+                    cached_files += 1
+                else:
+                    pending.extend(plan.chunks[patch.path])
+            calls = len(pending)
+            prompt_tokens = sum(plan.overhead_tokens + chunk.tokens for chunk in pending)
+
+        output_tokens = calls * self.budget.profile.expected_output_tokens
+        return ReviewCostEstimate(
+            model=self.budget.model,
+            tokenizer=self.budget.counter.tokenizer,
+            files=len(plan.patches),
+            cached_files=cached_files,
+            calls=calls,
+            prompt_tokens=prompt_tokens,
+            estimated_output_tokens=output_tokens,
+            estimated_cost_usd=round(self.budget.estimate_cost(prompt_tokens, output_tokens), 6),
+            estimated_latency_seconds=round(self.budget.estimate_latency(calls, self.max_concurrency), 2),
+            trimmed_hunks=[str(hunk) for hunk in plan.trimmed]
+        )
+
+    def _plan_analysis(
+            self,
+            diff: str,
+            prompt: str,
+            rules: List[RuleDTO],
+            context: Dict[str, Any]
+    ) -> "_AnalysisPlan":
+        """Prepara el análisis: prompt, tokens fijos, parches dentro del presupuesto y claves de caché."""
         formatted_rules = self._format_rules(rules)
         prompt_template = ChatPromptTemplate.from_template(prompt)
-        
-        messages = prompt_template.format_messages(
-            diff=diff,
-            rules=formatted_rules,
-            context=str(context),
-            format_instructions=self.code_analysis_parser.get_format_instructions()
+        overhead_tokens = self._count_messages(
+            self._format_code_messages(prompt_template, "", formatted_rules, context)
+        )
+        patches = [patch for patch in FilePatch.from_unified_diff(diff) if patch.diff]
+        patches, trimmed = self.budget.trim(patches, overhead_tokens)
+        chunk_limit = self.budget.chunk_limit(overhead_tokens, self.chunk_max_tokens)
+        return _AnalysisPlan(
+            prompt_template=prompt_template,
+            formatted_rules=formatted_rules,
+            overhead_tokens=overhead_tokens,
+            chunk_limit=chunk_limit,
+            patches=patches,
+            trimmed=trimmed,
+            # Los fragmentos de un archivo dependen solo de ese archivo: no se mueven si cambia otro
+            chunks={patch.path: chunk_file_patches([patch], chunk_limit, self.budget.counter.count) for patch in patches},
+            keys={patch.path: self._analysis_key(prompt, formatted_rules, patch.diff) for patch in patches}
         )
+
+    async def _analyze_files(
+            self,
+            plan: "_AnalysisPlan",
+            pending: List[FilePatch],
+            context: Dict[str, Any]
+    ) -> Dict[str, CodeAnalysisResult]:
+        """
+        Analiza los archivos pendientes (una llamada por fragmento) y guarda en caché los que terminan bien.
+
+        Raises:
+            CodeAnalysisFailedException: Si falla alguno; los archivos sin analizar no se omiten en silencio
+        """
+        calls = [(patch, chunk) for patch in pending for chunk in plan.chunks[patch.path]]
+        if len(calls) > 1:
+            logger.info(f"Analizando {len(pending)} de {len(plan.patches)} archivos en {len(calls)} llamadas")
+        outcomes = await asyncio.gather(
+            *(
+                self._analyze_chunk(
+                    plan.prompt_template,
+                    chunk.diff,
+                    plan.formatted_rules,
+                    self._chunk_context(context, chunk, index, len(calls)) if len(calls) > 1 else context
+                )
+                for index, (_, chunk) in enumerate(calls)
+            ),
+            return_exceptions=True
+        )
+
+        partials: Dict[str, List[CodeAnalysisResult]] = {patch.path: [] for patch in pending}
+        errors: Dict[str, str] = {}
+        for (patch, chunk), outcome in zip(calls, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Error analizando {patch.path}: {str(outcome)}")
+                errors.setdefault(patch.path, str(outcome))
+            else:
+                partials[patch.path].append(outcome)
+
+        results: Dict[str, CodeAnalysisResult] = {}
+        for patch in pending:
+            if patch.path in errors:
+                continue
+            results[patch.path] = merge_code_analysis_results(
+                partials[patch.path], [chunk.tokens for chunk in plan.chunks[patch.path]]
+            )
+            await self._cache_put(plan.keys[patch.path], results[patch.path].model_dump_json())
+
+        if errors:
+            # Se guardan los archivos correctos: al reintentar solo se repiten los que fallaron
+            raise CodeAnalysisFailedException(list(errors), list(errors.values()))
+        return results
+
+    @staticmethod
+    def _chunk_context(context: Dict[str, Any], chunk: DiffChunk, index: int, total: int) -> Dict[str, Any]:
+        """Añade al contexto qué parte del PR contiene el fragmento."""
+        return {**context, "chunk": f"{index + 1}/{total}", "chunk_files": chunk.files}
+
+    def _analysis_key(self, prompt: str, formatted_rules: str, diff: str) -> str:
+        return LLMResultCache.make_key(
+            "analyze_code",
+            getattr(self.llm, "model_name", ""),
+            prompt,
+            formatted_rules,
+            self.code_analysis_parser.get_format_instructions(),
+            diff
+        )
+
+    async def _cache_get(self, key: str) -> Optional[str]:
+        return await self.cache.get(key) if self.cache is not None else None
+
+    async def _cache_put(self, key: str, value: str) -> None:
+        if self.cache is not None:
+            await self.cache.put(key, value)
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Métricas de la caché de resultados del LLM (vacío si está deshabilitada)."""
+        return self.cache.stats() if self.cache is not None else {}
+
+    async def _analyze_chunk(
+            self,
+            prompt_template: ChatPromptTemplate,
+            diff: str,
+            formatted_rules: str,
+            context: Dict[str, Any]
+    ) -> CodeAnalysisResult:
+        """Realiza una llamada al modelo para un diff (completo o fragmento)."""
+        messages = self._format_code_messages(prompt_template, diff, formatted_rules, context)
         logger.info(f"------messages_analyze_code------------: {messages}")
-        response = await self.llm.agenerate([messages])
+        estimated_tokens = self._count_messages(messages)
+        async with self._semaphore:
+            response = await self.llm.agenerate([messages])
+        self._record_usage(estimated_tokens, response)
         llm_response = self.code_analysis_parser.parse(response.generations[0][0].text)
         logger.info(f"------analyze_code_ll_response------------: {llm_response}")
 
         return llm_response
 
+    def _format_code_messages(
+            self,
+            prompt_template: ChatPromptTemplate,
+            diff: str,
+            formatted_rules: str,
+            context: Dict[str, Any]
+    ) -> List[BaseMessage]:
+        return prompt_template.format_messages(
+            diff=diff,
+            rules=formatted_rules,
+            context=str(context),
+            format_instructions=self.code_analysis_parser.get_format_instructions()
+        )
+
+    def _count_messages(self, messages: List[BaseMessage]) -> int:
+        # Unos pocos tokens por mensaje para el rol y los separadores del formato de chat
+        return sum(self.budget.counter.count(message.content) + 4 for message in messages)
+
+    def _record_usage(self, estimated_tokens: int, response: Any) -> None:
+        """Registra los tokens estimados junto con los que reporta el proveedor."""
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage")
+        self.usage.record(estimated_tokens, usage)
+        if usage:
+            logger.info(
+                f"Tokens de entrada: estimados {estimated_tokens}, reales {usage.get('prompt_tokens')}; "
+                f"salida {usage.get('completion_tokens')}"
+            )
+
+    def usage_stats(self) -> Dict[str, float]:
+        """Tokens estimados frente a reales de las llamadas realizadas."""
+        return self.usage.stats()
+
     async def generate_metadata(
             self,
             context: Dict[str, Any],
@@ -78,8 +343,21 @@ class LangchainOrchestrator:
             label_guidelines=label_guidelines,
             format_instructions=self.metadata_parser.get_format_instructions()
         )
-        
+
+        # El prompt formateado ya incluye todas las entradas (PR, guías e instrucciones)
+        key = LLMResultCache.make_key(
+            "generate_metadata",
+            getattr(self.llm, "model_name", ""),
+            *(message.content for message in messages)
+        )
+        cached = await self._cache_get(key)
+        if cached is not None:
+            return PRMetadataResult.model_validate_json(cached)
+
+        estimated_tokens = self._count_messages(messages)
         response = await self.llm.agenerate([messages])
+        self._record_usage(estimated_tokens, response)
         llm_response = self.metadata_parser.parse(response.generations[0][0].text)
         logger.info(f"------metadata_llm_response------------: {llm_response}")
+        await self._cache_put(key, llm_response.model_dump_json())
         return llm_response
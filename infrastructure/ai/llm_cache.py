@@ -0,0 +1,209 @@
+# Este módulo implementa una caché direccionada por contenido para los resultados del LLM
+# Evita repetir llamadas al modelo con entradas idénticas (force-push sin cambios, reaperturas, reentregas)
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from infrastructure.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Se incrementa cuando cambia el formato de lo almacenado para invalidar entradas antiguas
+CACHE_FORMAT_VERSION = "1"
+
+
+class LLMResultCache:
+    """
+    Caché de resultados del LLM indexada por el hash de sus entradas.
+
+    Nivel en memoria: LRU acotado por número de entradas.
+    Nivel persistente (opcional): tabla SQLite en `db_path`, que sobrevive a
+    reinicios y se promueve a memoria al leerse.
+    Ambos niveles expiran las entradas tras `ttl` segundos.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 7 * 24 * 3600,
+        db_path: Optional[str] = None,
+        max_db_entries: int = 50_000,
+        clock: Callable[[], float] = time.time
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.max_db_entries = max_db_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._db_entries = 0
+        if db_path:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed_at ON llm_cache (accessed_at)")
+            self._db.commit()
+            self._db_entries = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Hash SHA-256 de las entradas que determinan la respuesta del modelo."""
+        digest = hashlib.sha256(CACHE_FORMAT_VERSION.encode())
+        for part in parts:
+            encoded = (part or "").encode()
+            # Prefijo de longitud para que ("ab", "c") y ("a", "bc") no colisionen
+            digest.update(f"{len(encoded)}:".encode())
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Busca la entrada en memoria y, si no está, en SQLite."""
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            created_at, value = entry
+            if now - created_at < self.ttl:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return value
+            del self._entries[key]
+
+        if self._db is not None:
+            row = await asyncio.to_thread(self._read_db, key, now)
+            if row is not None:
+                created_at, value = row
+                self._store_memory(key, created_at, value)
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def contains(self, key: str) -> bool:
+        """Indica si hay una entrada vigente, sin contarla como acierto ni promoverla."""
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            return True
+        if self._db is not None:
+            return await asyncio.to_thread(self._contains_db, key, now)
+        return False
+
+    async def put(self, key: str, value: str) -> None:
+        """Guarda la entrada en memoria y, si está configurado, en SQLite."""
+        now = self._clock()
+        self._store_memory(key, now, value)
+        if self._db is not None:
+            await asyncio.to_thread(self._write_db, key, value, now)
+
+    def stats(self) -> Dict[str, float]:
+        """Contadores de uso de la caché."""
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+            "entries": len(self._entries),
+            "evictions": self.evictions
+        }
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+    def _store_memory(self, key: str, created_at: float, value: str) -> None:
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _read_db(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT created_at, value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[0] >= self.ttl:
+                self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._db.commit()
+                self._db_entries -= 1
+                return None
+            self._db.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            return row
+
+    def _contains_db(self, key: str, now: float) -> bool:
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT 1 FROM llm_cache WHERE key = ? AND created_at > ?", (key, now - self.ttl)
+            ).fetchone() is not None
+
+    def _write_db(self, key: str, value: str, now: float) -> None:
+        with self._db_lock:
+            is_new = self._db.execute("SELECT 1 FROM llm_cache WHERE key = ?", (key,)).fetchone() is None
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            if is_new:
+                self._db_entries += 1
+                if self._db_entries > self.max_db_entries:
+                    self._trim_db(now)
+            self._db.commit()
+
+    def _trim_db(self, now: float) -> None:
+        """Elimina las entradas expiradas y, si no basta, el 10% menos usado recientemente."""
+        removed = self._db.execute("DELETE FROM llm_cache WHERE created_at <= ?", (now - self.ttl,)).rowcount
+        remaining = self._db_entries - removed
+        if remaining > self.max_db_entries:
+            removed += self._db.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY accessed_at LIMIT ?)",
+                (max(1, remaining // 10),)
+            ).rowcount
+        self._db_entries -= removed
+        self.evictions += removed
+
+
+def get_llm_cache(settings: Settings) -> Optional[LLMResultCache]:
+    """
+    Crea la caché de resultados del LLM según la configuración.
+
+    Args:
+        settings (Settings): Configuración de la aplicación
+
+    Returns:
+        Optional[LLMResultCache]: Caché configurada, o None si está deshabilitada
+    """
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    return LLMResultCache(
+        max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+        ttl=settings.LLM_CACHE_TTL,
+        db_path=settings.LLM_CACHE_DB_PATH,
+        max_db_entries=settings.LLM_CACHE_MAX_DB_ENTRIES
+    )
@@ -0,0 +1,232 @@
+# Este módulo estima los tokens de los prompts de revisión y aplica el presupuesto por modelo
+# Permite saber antes de llamar al modelo cuánto se va a enviar, recortar lo necesario y estimar coste y latencia
+
+import logging
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from domain.models.file_patch import FilePatch
+from infrastructure.ai.diff_chunker import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # Dependencia opcional: sin ella se usa la aproximación por caracteres
+    tiktoken = None
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """Límites, precios (USD por millón de tokens) y rendimiento aproximado de un modelo."""
+    context_window: int
+    max_output_tokens: int
+    input_cost_per_million: float
+    output_cost_per_million: float
+    expected_output_tokens: int  # Salida típica de una revisión (incluye tokens de razonamiento)
+    output_tokens_per_second: float
+    base_latency: float  # Segundos hasta el primer token
+
+
+MODEL_PROFILES: Dict[str, ModelProfile] = {
+    "o1-mini": ModelProfile(128_000, 65_536, 3.0, 12.0, 4_000, 70.0, 2.0),
+    "gpt-4o-mini": ModelProfile(128_000, 16_384, 0.15, 0.6, 1_500, 80.0, 0.5),
+    "gpt-4o": ModelProfile(128_000, 16_384, 2.5, 10.0, 1_500, 60.0, 0.8),
+}
+
+# Archivos cuyo diff aporta poco a la revisión; son lo primero que se recorta
+_LOW_VALUE_PATH = re.compile(
+    r"(^|/)(package-lock\.json|yarn\.lock|pnpm-lock\.yaml|poetry\.lock|Pipfile\.lock|Cargo\.lock|go\.sum)$"
+    r"|\.min\.(js|css)$|\.map$|\.svg$|\.snap$|(^|/)(vendor|dist|build|node_modules)/"
+)
+
+
+def get_model_profile(model: str) -> ModelProfile:
+    """Perfil del modelo; los nombres con fecha (p. ej. `gpt-4o-mini-2024-07-18`) usan el de su familia."""
+    for name in sorted(MODEL_PROFILES, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_PROFILES[name]
+    return MODEL_PROFILES["o1-mini"]
+
+
+class TokenCounter:
+    """
+    Cuenta tokens con el tokenizador local del modelo (tiktoken).
+    Si tiktoken no está instalado o no puede cargar la codificación, usa la aproximación por caracteres.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                try:
+                    self._encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    self._encoding = tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                logger.warning(f"No se pudo cargar el tokenizador de {model}: {str(e)}")
+
+    @property
+    def tokenizer(self) -> str:
+        return "tiktoken" if self._encoding is not None else "heuristic"
+
+    def count(self, text: str) -> int:
+        if self._encoding is None:
+            return estimate_tokens(text)
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+@dataclass(frozen=True)
+class TrimmedHunk:
+    """Hunk descartado por el presupuesto."""
+    path: str
+    index: int
+    tokens: int
+
+    def __str__(self) -> str:
+        return f"{self.path}#{self.index}"
+
+
+class TokenBudget:
+    """
+    Política de presupuesto por modelo.
+
+    - Contexto: cada llamada debe caber en la ventana del modelo dejando margen
+      para la respuesta; un hunk que por sí solo no cabe se descarta.
+    - Presupuesto: el diff de una revisión no supera `max_review_tokens`; si lo
+      hace se descartan los hunks de menor valor, siempre en el mismo orden.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        max_review_tokens: int = 200_000,
+        counter: Optional[TokenCounter] = None
+    ):
+        self.model = model
+        self.profile = get_model_profile(model)
+        self.max_review_tokens = max_review_tokens
+        self.counter = counter or TokenCounter(model)
+
+    @property
+    def prompt_limit(self) -> int:
+        """Tokens de entrada por llamada, reservando espacio para la respuesta."""
+        return self.profile.context_window - 2 * self.profile.expected_output_tokens
+
+    def chunk_limit(self, overhead_tokens: int, chunk_max_tokens: int) -> int:
+        """Tokens de diff por fragmento para que el prompt completo quepa en el contexto."""
+        return max(1, min(chunk_max_tokens, self.prompt_limit - overhead_tokens))
+
+    @staticmethod
+    def hunk_value(patch: FilePatch, hunk: str) -> int:
+        """Valor de un hunk para la revisión: 0 archivos generados, 1 solo borrados, 2 código nuevo."""
+        if _LOW_VALUE_PATH.search(patch.path):
+            return 0
+        if patch.status == "removed" or not any(
+                line.startswith("+") for line in hunk.splitlines()[1:]):
+            return 1
+        return 2
+
+    def trim(self, patches: List[FilePatch], overhead_tokens: int) -> Tuple[List[FilePatch], List[TrimmedHunk]]:
+        """
+        Aplica la política a los parches del PR.
+
+        Args:
+            patches: Parches por archivo
+            overhead_tokens: Tokens del prompt sin el diff (plantilla, reglas, instrucciones)
+
+        Returns:
+            Tuple[List[FilePatch], List[TrimmedHunk]]: Parches recortados y hunks descartados
+        """
+        per_call = self.prompt_limit - overhead_tokens
+        hunks = []
+        for file_index, patch in enumerate(patches):
+            for hunk_index, hunk in enumerate(patch.hunks):
+                hunks.append((file_index, hunk_index, hunk, self.counter.count(hunk)))
+
+        dropped = {(f, h) for f, h, _, tokens in hunks if tokens > per_call}
+        total = sum(tokens for f, h, _, tokens in hunks if (f, h) not in dropped)
+        if total > self.max_review_tokens:
+            # Menor valor primero; a igual valor, los más grandes y luego por posición (determinista)
+            candidates = sorted(
+                (hunk for hunk in hunks if (hunk[0], hunk[1]) not in dropped),
+                key=lambda hunk: (self.hunk_value(patches[hunk[0]], hunk[2]), -hunk[3], hunk[0], hunk[1])
+            )
+            for f, h, _, tokens in candidates:
+                if total <= self.max_review_tokens:
+                    break
+                dropped.add((f, h))
+                total -= tokens
+
+        if not dropped:
+            return patches, []
+
+        trimmed = [
+            TrimmedHunk(patches[f].path, h, tokens)
+            for f, h, _, tokens in hunks if (f, h) in dropped
+        ]
+        kept = []
+        for file_index, patch in enumerate(patches):
+            patch_hunks = patch.hunks
+            remaining = [hunk for h, hunk in enumerate(patch_hunks) if (file_index, h) not in dropped]
+            if len(remaining) == len(patch_hunks):
+                kept.append(patch)
+            elif remaining:
+                kept.append(patch.model_copy(update={"diff": patch.header + "".join(remaining)}))
+        logger.warning(
+            f"Presupuesto de {self.max_review_tokens} tokens superado; se descartan {len(trimmed)} hunks"
+        )
+        return kept, trimmed
+
+    def estimate_cost(self, prompt_tokens: int, output_tokens: int) -> float:
+        return (
+            prompt_tokens * self.profile.input_cost_per_million
+            + output_tokens * self.profile.output_cost_per_million
+        ) / 1_000_000
+
+    def estimate_latency(self, calls: int, concurrency: int) -> float:
+        """Segundos estimados: las llamadas se ejecutan en tandas de `concurrency`."""
+        if calls == 0:
+            return 0.0
+        per_call = self.profile.base_latency + (
+            self.profile.expected_output_tokens / self.profile.output_tokens_per_second
+        )
+        return math.ceil(calls / max(concurrency, 1)) * per_call
+
+
+class TokenUsageStats:
+    """Tokens estimados frente a los reportados por el proveedor."""
+
+    def __init__(self):
+        self.calls = 0
+        self.estimated_prompt_tokens = 0
+        self.actual_prompt_tokens = 0
+        self.completion_tokens = 0
+        self.reported_calls = 0
+        self._estimated_reported = 0
+        self.trimmed_hunks = 0
+
+    def record(self, estimated_prompt_tokens: int, usage: Optional[Dict[str, int]]) -> None:
+        self.calls += 1
+        self.estimated_prompt_tokens += estimated_prompt_tokens
+        if usage and usage.get("prompt_tokens") is not None:
+            self.reported_calls += 1
+            self._estimated_reported += estimated_prompt_tokens
+            self.actual_prompt_tokens += usage["prompt_tokens"]
+            self.completion_tokens += usage.get("completion_tokens", 0)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "estimated_prompt_tokens": self.estimated_prompt_tokens,
+            "actual_prompt_tokens": self.actual_prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "trimmed_hunks": self.trimmed_hunks,
+            # Relación real/estimado en las llamadas con uso reportado (1.0 = estimación exacta)
+            "estimate_ratio": (
+                self.actual_prompt_tokens / self._estimated_reported
+                if self._estimated_reported else 0.0
+            )
+        }
@@ -1,14 +1,29 @@
 from dependency_injector import containers, providers
 from infrastructure.config.settings import get_settings
 from infrastructure.database.supabase_client import get_client
+from infrastructure.database.db_executor import configure_db_executor
+from infrastructure.database.config_cache import get_config_cache
+from infrastructure.database.review_write_buffer import get_review_write_buffer
 from infrastructure.database.repositories.prompt_repository import PromptRepository
 from infrastructure.database.repositories.reviews_repository import ReviewsRepository
 from infrastructure.database.repositories.pull_request_repository import PullRequestRepository
 from infrastructure.database.repositories.pr_guidelines_repository import PRGuidelinesRepository
+from infrastructure.database.repositories.review_jobs_repository import ReviewJobsRepository
+from infrastructure.database.repositories.webhook_deliveries_repository import WebhookDeliveriesRepository
 from infrastructure.github.github_service import GitHubService
+from infrastructure.github.response_cache import get_response_cache
+from infrastructure.github.rate_limiter import GitHubRateLimiter
+from infrastructure.github.retry_policy import CircuitBreaker, RetryPolicy
+from infrastructure.github.webhook_deduplicator import get_webhook_deduplicator
 from infrastructure.ai.langchain_orchestrator import LangchainOrchestrator
+from infrastructure.ai.llm_cache import get_llm_cache
 from application.use_cases.generate_pr_metadata import GeneratePRMetadataUseCase
 from application.use_cases.analyze_pull_request import AnalyzePullRequestUseCase
+from application.use_cases.estimate_review_cost import EstimateReviewCostUseCase
+from infrastructure.workers.review_worker_pool import ReviewWorkerPool
+from infrastructure.workers.review_coordinator import ReviewCoordinator
+from infrastructure.workers.sqlite_job_queue import SQLiteJobQueue
+from infrastructure.workers.durable_review_worker import DurableReviewWorker
 
 class Container(containers.DeclarativeContainer):
     """
@@ -23,31 +38,94 @@ class Container(containers.DeclarativeContainer):
     # utilizando la configuración proporcionada.
     supabase_client = providers.Singleton(get_client, settings=config)
 
+    # Pool acotado de hilos en el que los repositorios ejecutan las consultas síncronas de Supabase.
+    db_executor = providers.Singleton(configure_db_executor, max_workers=config.provided.DB_MAX_THREADS)
+
     # Proveedores para los repositorios que se encargarán del acceso a datos.
     prompt_repository = providers.Factory(PromptRepository, supabase=supabase_client)
     reviews_repository = providers.Factory(ReviewsRepository, supabase=supabase_client)
     pull_request_repository = providers.Factory(PullRequestRepository, supabase=supabase_client)
     pr_guidelines_repository = providers.Factory(PRGuidelinesRepository, supabase=supabase_client)
 
-    # Proveedor para el servicio de GitHub, inyectando el App ID y la llave privada.
+    # Caché de proceso de prompts, reglas y guías de PR (None si está deshabilitada).
+    config_cache = providers.Singleton(
+        get_config_cache,
+        settings=config,
+        prompt_repository=prompt_repository,
+        pr_guidelines_repository=pr_guidelines_repository,
+    )
+
+    # Búfer de guardado diferido de las revisiones (None si está deshabilitado).
+    review_write_buffer = providers.Singleton(
+        get_review_write_buffer,
+        settings=config,
+        repository=reviews_repository,
+    )
+
+    # Caché de respuestas condicionales para las lecturas de GitHub (None si está deshabilitada).
+    github_response_cache = providers.Singleton(get_response_cache, settings=config)
+
+    # Planificador compartido que respeta el rate limit de GitHub por instalación.
+    github_rate_limiter = providers.Singleton(
+        GitHubRateLimiter,
+        requests_per_second=config.provided.GITHUB_RATE_LIMIT_RPS,
+        burst=config.provided.GITHUB_RATE_LIMIT_BURST,
+        write_interval=config.provided.GITHUB_WRITE_INTERVAL,
+        max_wait=config.provided.GITHUB_RATE_LIMIT_MAX_WAIT,
+    )
+
+    # Política de reintentos y circuit breaker para errores transitorios de GitHub.
+    github_retry_policy = providers.Singleton(
+        RetryPolicy,
+        max_attempts=config.provided.GITHUB_RETRY_MAX_ATTEMPTS,
+        base_delay=config.provided.GITHUB_RETRY_BASE_DELAY,
+        max_delay=config.provided.GITHUB_RETRY_MAX_DELAY,
+    )
+    github_circuit_breaker = providers.Singleton(
+        CircuitBreaker,
+        failure_threshold=config.provided.GITHUB_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=config.provided.GITHUB_CIRCUIT_RESET_TIMEOUT,
+    )
+
+    # Proveedor para el servicio de GitHub, inyectando el App ID, la llave privada
+    # y la configuración del pool de conexiones HTTP compartido.
     github_service = providers.Singleton(
         GitHubService,
         app_id=config.provided.GITHUB_APP_ID,
         private_key=config.provided.GITHUB_APP_PRIVATE_KEY,
+        base_url=config.provided.GITHUB_API_URL,
+        http2=config.provided.GITHUB_HTTP2,
+        max_connections=config.provided.GITHUB_MAX_CONNECTIONS,
+        max_keepalive_connections=config.provided.GITHUB_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=config.provided.GITHUB_KEEPALIVE_EXPIRY,
+        timeout=config.provided.GITHUB_TIMEOUT,
+        connect_timeout=config.provided.GITHUB_CONNECT_TIMEOUT,
+        token_refresh_margin=config.provided.GITHUB_TOKEN_REFRESH_MARGIN,
+        response_cache=github_response_cache,
+        rate_limiter=github_rate_limiter,
+        rate_limit_retries=config.provided.GITHUB_RATE_LIMIT_RETRIES,
+        retry_policy=github_retry_policy,
+        circuit_breaker=github_circuit_breaker,
+        max_diff_bytes=config.provided.GITHUB_MAX_DIFF_BYTES,
+        files_page_concurrency=config.provided.GITHUB_FILES_PAGE_CONCURRENCY,
     )
 
+    # Caché de resultados del LLM (None si está deshabilitada).
+    llm_cache = providers.Singleton(get_llm_cache, settings=config)
+
     # Proveedor para el servicio de IA, inyectando la API key de OpenAI.
     ai_service = providers.Singleton(
         LangchainOrchestrator,
         openai_api_key=config.provided.OPENAI_API_KEY,
+        chunk_max_tokens=config.provided.AI_CHUNK_MAX_TOKENS,
+        max_concurrency=config.provided.AI_MAX_CONCURRENCY,
+        cache=llm_cache,
+        max_review_tokens=config.provided.AI_MAX_REVIEW_TOKENS,
     )
 
-    # Proveedor para el caso de uso que genera metadatos para los PR,
-    # usando el repositorio de guías.
-    metadata_generator = providers.Singleton(
-        GeneratePRMetadataUseCase,
-        pr_guidelines_repo=pr_guidelines_repository,
-    )
+    # Proveedor para el caso de uso que genera metadatos para los PR;
+    # recibe las guías en el ReviewContext de cada revisión.
+    metadata_generator = providers.Singleton(GeneratePRMetadataUseCase)
 
     # Proveedor para el caso de uso principal de análisis de Pull Requests,
     # inyectando todos los repositorios y servicios necesarios.
@@ -60,4 +138,70 @@ class Container(containers.DeclarativeContainer):
         ai_service=ai_service,
         pr_guidelines_repository=pr_guidelines_repository,
         metadata_generator=metadata_generator,
+        input_timeout=config.provided.REVIEW_INPUT_TIMEOUT,
+        diff_timeout=config.provided.REVIEW_DIFF_TIMEOUT,
+        config_cache=config_cache,
+        review_writer=review_write_buffer,
+    )
+
+    # Pool de workers que ejecuta las revisiones fuera de la petición del webhook.
+    review_worker_pool = providers.Singleton(
+        ReviewWorkerPool,
+        use_case=analyze_pull_request_use_case,
+        workers=config.provided.REVIEW_WORKERS,
+        max_queue_size=config.provided.REVIEW_QUEUE_MAX_SIZE,
+        drain_timeout=config.provided.REVIEW_DRAIN_TIMEOUT,
+    )
+
+    # Proveedor del coordinador por PR que agrupa eventos y sustituye revisiones obsoletas.
+    review_coordinator = providers.Singleton(
+        ReviewCoordinator,
+        pool=review_worker_pool,
+        debounce_seconds=config.provided.REVIEW_DEBOUNCE_SECONDS,
+    )
+
+    # Proveedor para la estimación previa (dry-run) del coste de revisar un PR.
+    estimate_review_cost_use_case = providers.Singleton(
+        EstimateReviewCostUseCase,
+        prompt_repository=prompt_repository,
+        github_service=github_service,
+        ai_service=ai_service,
+    )
+
+    # Cola persistente de revisiones según REVIEW_QUEUE_BACKEND (None con el backend en memoria).
+    review_job_queue = providers.Selector(
+        config.provided.REVIEW_QUEUE_BACKEND,
+        memory=providers.Object(None),
+        sqlite=providers.Singleton(SQLiteJobQueue, db_path=config.provided.REVIEW_JOBS_DB_PATH),
+        supabase=providers.Singleton(ReviewJobsRepository, supabase=supabase_client),
+    )
+
+    # Worker que consume la cola persistente (backends sqlite y supabase).
+    durable_review_worker = providers.Singleton(
+        DurableReviewWorker,
+        queue=review_job_queue,
+        use_case=analyze_pull_request_use_case,
+        concurrency=config.provided.REVIEW_WORKERS,
+        lease_seconds=config.provided.REVIEW_JOB_LEASE_SECONDS,
+        poll_interval=config.provided.REVIEW_JOB_POLL_INTERVAL,
+        max_attempts=config.provided.REVIEW_JOB_MAX_ATTEMPTS,
+        retry_base_delay=config.provided.REVIEW_JOB_RETRY_DELAY,
+        debounce_seconds=config.provided.REVIEW_DEBOUNCE_SECONDS,
+        drain_timeout=config.provided.REVIEW_DRAIN_TIMEOUT,
+        worker_id=config.provided.REVIEW_WORKER_ID,
+    )
+
+    # Deduplicador de entregas de webhook (memoria y, opcionalmente, tech_webhook_deliveries).
+    webhook_deduplicator = providers.Singleton(
+        get_webhook_deduplicator,
+        settings=config,
+        store=providers.Singleton(WebhookDeliveriesRepository, supabase=supabase_client),
+    )
+
+    # Destino de los eventos del webhook: el coordinador en memoria o el worker de la cola persistente.
+    review_dispatcher = providers.Selector(
+        config.provided.REVIEW_QUEUE_BACKEND,
+        memory=review_coordinator,
+        sqlite=durable_review_worker,
+        supabase=durable_review_worker,
     )
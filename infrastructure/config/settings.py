@@ -17,10 +17,50 @@ class Settings(BaseSettings):
 
     # Configuración de OpenAI
     OPENAI_API_KEY: str
+    AI_CHUNK_MAX_TOKENS: int = 12000  # Tokens de diff por llamada; un archivo mayor se analiza por hunks
+    AI_MAX_CONCURRENCY: int = 4  # Llamadas simultáneas al modelo por análisis
+    AI_MAX_REVIEW_TOKENS: int = 200000  # Tokens de diff por revisión; el exceso se recorta por hunks
+
+    # Pool de workers de revisiones (el webhook solo encola)
+    REVIEW_WORKERS: int = 4
+    REVIEW_QUEUE_MAX_SIZE: int = 1000
+    REVIEW_DRAIN_TIMEOUT: float = 120.0  # Segundos para terminar las revisiones en curso al apagar
+    REVIEW_DEBOUNCE_SECONDS: float = 5.0  # Ventana en la que los eventos de un mismo PR se agrupan
+    REVIEW_INPUT_TIMEOUT: float = 30.0  # Timeout de cada consulta de prompts, reglas y guías
+    REVIEW_DIFF_TIMEOUT: float = 120.0  # Timeout de la descarga de los cambios del PR
+    REVIEW_WRITE_BEHIND: bool = True  # Guardar las revisiones en lotes tras publicarlas en GitHub
+    REVIEW_WRITE_MAX_BATCH: int = 50  # Revisiones por lote de guardado
+    REVIEW_WRITE_FLUSH_INTERVAL: float = 1.0  # Segundos máximos que una revisión espera a guardarse
+    REVIEW_WRITE_MAX_RETRIES: int = 3  # Reintentos de un lote antes de volcarlo a disco
+    REVIEW_WRITE_SPILL_PATH: Optional[str] = "data/review_spill.jsonl"  # Volcado si la BD no responde
+    CONFIG_CACHE_TTL: float = 300.0  # Segundos que se reutilizan prompts, reglas y guías (0 deshabilita la caché)
+
+    # Cola de revisiones: memory (en proceso), sqlite (persistente local) o supabase (compartida entre réplicas)
+    REVIEW_QUEUE_BACKEND: str = "memory"
+    REVIEW_JOBS_DB_PATH: str = "data/review_jobs.db"  # Archivo de la cola con el backend sqlite
+    REVIEW_JOB_LEASE_SECONDS: float = 300.0  # Si el worker no renueva el lease, otra réplica retoma el trabajo
+    REVIEW_JOB_MAX_ATTEMPTS: int = 5  # Después el trabajo queda en 'dead'
+    REVIEW_JOB_RETRY_DELAY: float = 30.0  # Base del backoff exponencial entre intentos
+    REVIEW_JOB_POLL_INTERVAL: float = 2.0  # Segundos entre consultas a la cola cuando está vacía
+    REVIEW_WORKER_ID: Optional[str] = None  # Por defecto host-pid
+
+    # Deduplicación de entregas de webhook (X-GitHub-Delivery y huella PR + head SHA)
+    WEBHOOK_DEDUPE_TTL: float = 24 * 3600  # Segundos durante los que una entrega repetida se ignora
+    WEBHOOK_DEDUPE_MAX_ENTRIES: int = 10000
+    WEBHOOK_DEDUPE_PERSISTENT: bool = True  # Compartir entre réplicas en tech_webhook_deliveries
+
+    # Caché de resultados del LLM (clave: modelo, prompt, reglas e instrucciones y diff de cada archivo)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    LLM_CACHE_TTL: float = 7 * 24 * 3600  # Segundos
+    LLM_CACHE_DB_PATH: Optional[str] = None  # Archivo SQLite para persistir entre reinicios
+    LLM_CACHE_MAX_DB_ENTRIES: int = 50000
 
     # Configuración de Supabase
     SUPABASE_URL: str
     SUPABASE_SERVICE_KEY: str
+    DATABASE_URL: Optional[str] = None  # Conexión Postgres directa (solo para `cli.py migrate`)
+    DB_MAX_THREADS: int = 10  # Consultas simultáneas a Supabase (se ejecutan fuera del event loop)
 
     # Variables opcionales con valores por defecto
     ENVIRONMENT: str = "development"
@@ -29,6 +69,40 @@ class Settings(BaseSettings):
     DB_NAME: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
 
+    # Cliente HTTP compartido para la API de GitHub
+    GITHUB_API_URL: str = "https://api.github.com"
+    GITHUB_HTTP2: bool = False  # Multiplexa las peticiones sobre una sola conexión (requiere h2)
+    GITHUB_MAX_CONNECTIONS: int = 20
+    GITHUB_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    GITHUB_KEEPALIVE_EXPIRY: float = 30.0  # Segundos que una conexión ociosa permanece abierta
+    GITHUB_TIMEOUT: float = 30.0
+    GITHUB_CONNECT_TIMEOUT: float = 5.0
+    GITHUB_TOKEN_REFRESH_MARGIN: float = 300.0  # Segundos antes de expirar en que se renueva el token
+
+    # Caché de respuestas condicionales (ETag / Last-Modified) para lecturas de GitHub
+    GITHUB_CACHE_ENABLED: bool = True
+    GITHUB_CACHE_MAX_ENTRIES: int = 512
+    GITHUB_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    GITHUB_CACHE_DIR: Optional[str] = None  # Directorio del nivel en disco (deshabilitado si es None)
+
+    # Planificador de peticiones según el rate limit de GitHub
+    GITHUB_RATE_LIMIT_RPS: float = 10.0  # Ritmo sostenido por instalación
+    GITHUB_RATE_LIMIT_BURST: int = 20
+    GITHUB_WRITE_INTERVAL: float = 1.0  # Segundos mínimos entre escrituras al mismo repositorio
+    GITHUB_RATE_LIMIT_MAX_WAIT: float = 900.0  # Espera máxima por rate limit antes de fallar
+    GITHUB_RATE_LIMIT_RETRIES: int = 3
+
+    # Reintentos con backoff y circuit breaker para errores transitorios de GitHub
+    GITHUB_RETRY_MAX_ATTEMPTS: int = 3
+    GITHUB_RETRY_BASE_DELAY: float = 0.5
+    GITHUB_RETRY_MAX_DELAY: float = 8.0
+    GITHUB_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Fallos consecutivos que abren el circuito
+    GITHUB_CIRCUIT_RESET_TIMEOUT: float = 30.0  # Segundos con el circuito abierto antes de probar
+
+    # Descarga del diff de los PRs
+    GITHUB_MAX_DIFF_BYTES: int = 5 * 1024 * 1024  # Por encima se usa el endpoint paginado /files
+    GITHUB_FILES_PAGE_CONCURRENCY: int = 4
+
     class Config:
         env_file = ".env"  # Archivo de variables de entorno
         case_sensitive = True  # Las variables son sensibles a mayúsculas/minúsculas
@@ -0,0 +1,146 @@
+# Este módulo implementa la caché en memoria de la configuración de las revisiones
+# Prompts, reglas y guías de PR cambian pocas veces por semana: se cargan una vez y se reutilizan
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+from application.dto.review_context import ReviewContext
+from application.helpers.concurrent_fetch import fetch_concurrently
+from domain.exceptions import ReviewInputFetchException
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigurationCache:
+    """
+    Caché de proceso del ReviewContext (prompts, reglas, guías de título, plantilla y etiquetas).
+
+    - Cada instantánea se sirve durante `ttl` segundos.
+    - `invalidate()` incrementa la versión y descarta la instantánea; se llama tras
+      cada escritura de configuración desde la API.
+    - Los fallos concurrentes de la caché se agrupan en una única carga (single-flight).
+    - Una carga iniciada antes de una invalidación no se guarda: ya es obsoleta.
+    """
+
+    def __init__(
+        self,
+        prompt_repository,
+        pr_guidelines_repository,
+        ttl: float = 300.0,
+        load_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            prompt_repository: Repositorio de prompts y reglas
+            pr_guidelines_repository: Repositorio de guías de PR
+            ttl: Segundos durante los que se sirve una instantánea
+            load_timeout: Timeout de cada consulta de la carga (segundos)
+            clock: Fuente de tiempo (inyectable para tests)
+        """
+        self._fetchers = ReviewContext.fetchers(prompt_repository, pr_guidelines_repository)
+        self.ttl = ttl
+        self.load_timeout = load_timeout
+        self._clock = clock
+        self._version = 0
+        self._context: Optional[ReviewContext] = None
+        self._loaded_at = 0.0
+        self._loaded_version = -1
+        self._inflight: Optional[asyncio.Task] = None
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._invalidations = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    async def get(self) -> ReviewContext:
+        """
+        Obtiene la configuración vigente, cargándola si no hay instantánea válida.
+
+        Raises:
+            ReviewInputFetchException: Si alguna de las consultas de la carga falla
+        """
+        if self._is_fresh():
+            self._hits += 1
+            return self._context
+
+        self._misses += 1
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._load(self._version))
+        # shield: cancelar una revisión no debe cancelar la carga que comparten otras
+        return await asyncio.shield(self._inflight)
+
+    def invalidate(self, reason: str = "") -> int:
+        """
+        Descarta la instantánea tras un cambio de configuración.
+
+        Returns:
+            int: Nueva versión de la configuración
+        """
+        self._version += 1
+        self._context = None
+        self._inflight = None  # Las siguientes peticiones no esperan a una carga ya obsoleta
+        self._invalidations += 1
+        logger.info(f"Caché de configuración invalidada (versión {self._version}){': ' + reason if reason else ''}")
+        return self._version
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Instantánea cacheada y su versión, para el endpoint de administración."""
+        fresh = self._is_fresh()
+        return {
+            "version": self._version,
+            "cached": fresh,
+            "age_seconds": self._clock() - self._loaded_at if fresh else None,
+            "expires_in_seconds": self._loaded_at + self.ttl - self._clock() if fresh else None,
+            "context": self._context.model_dump() if fresh else None,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "version": self._version,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "loads": self._loads,
+            "invalidations": self._invalidations,
+        }
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._context is not None
+            and self._loaded_version == self._version
+            and self._clock() - self._loaded_at < self.ttl
+        )
+
+    async def _load(self, version: int) -> ReviewContext:
+        try:
+            self._loads += 1
+            inputs = await fetch_concurrently(self._fetchers, timeout=self.load_timeout)
+            if inputs.errors:
+                raise ReviewInputFetchException(inputs.errors)
+            context = ReviewContext.from_values(inputs.values)
+            if version == self._version:
+                self._context = context
+                self._loaded_at = self._clock()
+                self._loaded_version = version
+            return context
+        finally:
+            if version == self._version:
+                self._inflight = None
+
+
+def get_config_cache(settings, prompt_repository, pr_guidelines_repository) -> Optional[ConfigurationCache]:
+    """Crea la caché de configuración según la configuración (None si está deshabilitada)."""
+    if settings.CONFIG_CACHE_TTL <= 0:
+        return None
+    return ConfigurationCache(
+        prompt_repository,
+        pr_guidelines_repository,
+        ttl=settings.CONFIG_CACHE_TTL,
+        load_timeout=settings.REVIEW_INPUT_TIMEOUT,
+    )
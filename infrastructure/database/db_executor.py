@@ -0,0 +1,93 @@
+# Este módulo ejecuta las consultas del cliente síncrono de Supabase fuera del event loop
+# Cada .execute() es una petición HTTP bloqueante; hecha dentro de una corrutina detiene
+# todas las revisiones y webhooks concurrentes mientras dura el round trip
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseExecutor:
+    """
+    Pool acotado de hilos para las consultas a Supabase.
+
+    `max_workers` limita las consultas simultáneas; las demás esperan turno
+    sin bloquear el event loop.
+    """
+
+    def __init__(self, max_workers: int = 10):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="supabase")
+        self.in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    async def run(self, query: Any) -> Any:
+        """
+        Ejecuta `query.execute()` en el pool.
+
+        Args:
+            query: Consulta de PostgREST construida con el cliente síncrono
+
+        Returns:
+            APIResponse: Respuesta de la consulta
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._executor, query.execute)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.in_flight -= 1
+            self.calls += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "errors": self.errors,
+            # Incluye la espera por un hilo libre
+            "avg_seconds": self.total_seconds / self.calls if self.calls else 0.0,
+            "max_seconds": self.max_seconds
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+_executor: Optional[DatabaseExecutor] = None
+
+
+def configure_db_executor(max_workers: int = 10) -> DatabaseExecutor:
+    """Crea el pool de consultas con el tamaño configurado (reemplaza al anterior)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+    _executor = DatabaseExecutor(max_workers=max_workers)
+    return _executor
+
+
+def get_db_executor() -> DatabaseExecutor:
+    """Pool de consultas del proceso; se crea con el tamaño por defecto si no se configuró."""
+    global _executor
+    if _executor is None:
+        _executor = DatabaseExecutor()
+    return _executor
+
+
+async def run_db(query: Any) -> Any:
+    """Ejecuta una consulta de Supabase sin bloquear el event loop."""
+    return await get_db_executor().run(query)
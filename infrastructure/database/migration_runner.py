@@ -0,0 +1,220 @@
+# Este módulo aplica las migraciones SQL de infrastructure/database/migrations
+# Registra las versiones aplicadas en schema_migrations y aplica cada archivo pendiente en su propia transacción
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+
+# Clave del advisory lock que serializa migraciones lanzadas a la vez (p. ej. varias réplicas)
+_POSTGRES_LOCK_KEY = 7254311
+
+_MIGRATION_FILE = re.compile(r"^(\d+)_(.+)\.sql$")
+
+
+class MigrationError(Exception):
+    """Error al aplicar una migración o al validar las ya aplicadas."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Archivo de migración: versión (prefijo numérico), nombre y SQL."""
+    version: str
+    name: str
+    path: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode("utf-8")).hexdigest()
+
+
+def load_migrations(migrations_dir: str = MIGRATIONS_DIR) -> List[Migration]:
+    """Lee los archivos `NNN_nombre.sql` del directorio, ordenados por versión."""
+    migrations = []
+    for file in os.listdir(migrations_dir):
+        match = _MIGRATION_FILE.match(file)
+        if not match:
+            continue
+        path = os.path.join(migrations_dir, file)
+        with open(path, encoding="utf-8") as f:
+            migrations.append(Migration(version=match.group(1), name=match.group(2), path=path, sql=f.read()))
+    migrations.sort(key=lambda m: int(m.version))
+
+    versions = [m.version for m in migrations]
+    duplicated = {v for v in versions if versions.count(v) > 1}
+    if duplicated:
+        raise MigrationError(f"Versiones de migración duplicadas: {', '.join(sorted(duplicated))}")
+    return migrations
+
+
+class MigrationRunner:
+    """
+    Aplica las migraciones pendientes sobre una conexión DB-API.
+
+    - `postgres` (psycopg2): cada archivo se ejecuta completo, con un advisory lock
+      para que dos procesos no apliquen la misma migración.
+    - `sqlite`: sustituto local para tests; el archivo se divide en sentencias.
+
+    Si un archivo ya aplicado cambia, `migrate` falla en lugar de aplicar sobre un esquema distinto.
+    """
+
+    def __init__(self, connection, dialect: str = "postgres", migrations_dir: str = MIGRATIONS_DIR):
+        """
+        Args:
+            connection: Conexión DB-API (psycopg2 o sqlite3)
+            dialect: "postgres" o "sqlite"
+            migrations_dir: Directorio de los archivos de migración
+        """
+        if dialect not in ("postgres", "sqlite"):
+            raise ValueError(f"Dialecto no soportado: {dialect}")
+        self.connection = connection
+        self.dialect = dialect
+        self.migrations_dir = migrations_dir
+        self._placeholder = "%s" if dialect == "postgres" else "?"
+
+    def applied(self) -> Dict[str, Dict[str, Any]]:
+        """Migraciones ya aplicadas, indexadas por versión."""
+        self._ensure_table()
+        cursor = self.connection.cursor()
+        cursor.execute("select version, name, checksum, applied_at from schema_migrations order by version")
+        rows = cursor.fetchall()
+        self.connection.commit()
+        return {row[0]: {"name": row[1], "checksum": row[2], "applied_at": row[3]} for row in rows}
+
+    def pending(self, target: Optional[str] = None) -> List[Migration]:
+        """Migraciones sin aplicar hasta `target` (incluida), validando las aplicadas."""
+        applied = self.applied()
+        pending = []
+        for migration in load_migrations(self.migrations_dir):
+            if target is not None and int(migration.version) > int(target):
+                break
+            recorded = applied.get(migration.version)
+            if recorded is None:
+                pending.append(migration)
+            elif recorded["checksum"] is not None and recorded["checksum"] != migration.checksum:
+                raise MigrationError(
+                    f"La migración {migration.version}_{migration.name} cambió después de aplicarse; "
+                    f"crea una migración nueva en lugar de editarla"
+                )
+        return pending
+
+    def migrate(self, target: Optional[str] = None) -> List[Migration]:
+        """
+        Aplica las migraciones pendientes en orden, cada una en su transacción.
+
+        Returns:
+            List[Migration]: Migraciones aplicadas
+        """
+        applied = []
+        for migration in self.pending(target):
+            self._apply(migration)
+            applied.append(migration)
+        return applied
+
+    def baseline(self, version: str) -> List[Migration]:
+        """
+        Marca como aplicadas, sin ejecutarlas, las migraciones hasta `version`.
+        Para bases creadas antes de que existiera el registro de migraciones.
+        """
+        marked = []
+        for migration in self.pending(version):
+            cursor = self.connection.cursor()
+            self._record(cursor, migration)
+            self.connection.commit()
+            marked.append(migration)
+        return marked
+
+    def _apply(self, migration: Migration) -> None:
+        logger.info(f"Aplicando migración {migration.version}_{migration.name}")
+        cursor = self.connection.cursor()
+        try:
+            if self.dialect == "postgres":
+                cursor.execute("select pg_advisory_xact_lock(%s)", (_POSTGRES_LOCK_KEY,))
+                # Otro proceso pudo aplicarla mientras se esperaba el lock
+                cursor.execute("select 1 from schema_migrations where version = %s", (migration.version,))
+                if cursor.fetchone():
+                    self.connection.rollback()
+                    return
+                cursor.execute(migration.sql)
+            else:
+                cursor.execute("begin")
+                for statement in _split_sqlite(migration.sql):
+                    cursor.execute(statement)
+            self._record(cursor, migration)
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise MigrationError(f"Error aplicando la migración {migration.version}_{migration.name}: {str(e)}") from e
+
+    def _record(self, cursor, migration: Migration) -> None:
+        p = self._placeholder
+        cursor.execute(
+            f"insert into schema_migrations (version, name, checksum, applied_at) values ({p}, {p}, {p}, {p})",
+            (migration.version, migration.name, migration.checksum, datetime.utcnow().isoformat())
+        )
+
+    def _ensure_table(self) -> None:
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "create table if not exists schema_migrations ("
+            "version text primary key, name text not null, checksum text, applied_at text not null)"
+        )
+        self.connection.commit()
+
+
+def _split_sqlite(sql: str) -> List[str]:
+    """Divide un script en sentencias completas de SQLite."""
+    statements, current = [], ""
+    for line in sql.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            if current.strip():
+                statements.append(current.strip())
+            current = ""
+    if current.strip() and not current.strip().startswith("--"):
+        statements.append(current.strip())
+    return statements
+
+
+def connect(database_url: str):
+    """
+    Abre la conexión para las migraciones.
+
+    Returns:
+        Tuple: (conexión, dialecto); `sqlite:///ruta` abre un SQLite local, el resto Postgres
+    """
+    if database_url.startswith("sqlite:///"):
+        connection = sqlite3.connect(database_url[len("sqlite:///"):], isolation_level=None)
+        return _SQLiteConnection(connection), "sqlite"
+    import psycopg2  # Solo hace falta para migrar contra Postgres
+    return psycopg2.connect(database_url), "postgres"
+
+
+class _SQLiteConnection:
+    """Conexión SQLite en modo autocommit con commit/rollback explícitos."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def cursor(self):
+        return self._connection.cursor()
+
+    def commit(self) -> None:
+        if self._connection.in_transaction:
+            self._connection.execute("commit")
+
+    def rollback(self) -> None:
+        if self._connection.in_transaction:
+            self._connection.execute("rollback")
+
+    def close(self) -> None:
+        self._connection.close()
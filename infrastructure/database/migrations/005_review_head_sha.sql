@@ -0,0 +1,9 @@
+-- Guardar el SHA del head revisado para poder hacer revisiones incrementales
+-- En un 'synchronize' solo se analiza el diff entre el último SHA revisado y el nuevo head
+alter table tech_reviews
+    add column if not exists head_sha text;                  -- SHA del commit revisado
+
+-- Última revisión completada de un PR (la base de la revisión incremental)
+create index if not exists idx_tech_reviews_pr_completed
+    on tech_reviews(pull_request_id, created_at desc)
+    where status = 'completed';
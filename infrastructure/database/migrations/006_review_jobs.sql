@@ -0,0 +1,142 @@
+-- Cola persistente de revisiones compartida por todas las réplicas
+-- Los workers reclaman trabajos con un lease; si una réplica muere, el lease expira y otra lo retoma
+create table if not exists tech_review_jobs (
+    id bigint primary key generated always as identity,
+    repository text not null,                              -- Repositorio del PR (owner/repo)
+    pr_number integer not null,                            -- Número del PR
+    action text,                                           -- Acción del webhook (opened, synchronize...)
+    delivery_id text,                                      -- X-GitHub-Delivery del webhook
+    payload jsonb not null,                                -- Pull Request serializado
+    status text not null default 'queued',                 -- queued, running, completed, dead, superseded
+    priority integer not null default 0,                   -- Mayor prioridad se reclama antes
+    attempts integer not null default 0,                   -- Intentos ya iniciados
+    max_attempts integer not null default 5,               -- Al agotarse el trabajo pasa a 'dead'
+    run_after timestamp with time zone not null default now(),  -- No se reclama antes (debounce y backoff)
+    lease_until timestamp with time zone,                  -- Fin del lease del worker que lo ejecuta
+    locked_by text,                                        -- Worker que tiene el lease
+    last_error text,                                       -- Último error
+    created_at timestamp with time zone default now(),
+    updated_at timestamp with time zone default now()
+);
+
+-- Trabajos reclamables en orden de prioridad
+create index if not exists idx_tech_review_jobs_claim
+    on tech_review_jobs(priority desc, run_after, id)
+    where status = 'queued';
+
+-- Leases expirados y trabajos activos de un PR
+create index if not exists idx_tech_review_jobs_running
+    on tech_review_jobs(lease_until)
+    where status = 'running';
+create index if not exists idx_tech_review_jobs_pr
+    on tech_review_jobs(repository, pr_number)
+    where status in ('queued', 'running');
+
+-- Encola un trabajo. Los trabajos en cola del mismo PR se sustituyen (debounce);
+-- si p_supersede_running, también los que están en ejecución
+create or replace function enqueue_review_job(
+    p_repository text,
+    p_pr_number integer,
+    p_action text,
+    p_delivery_id text,
+    p_payload jsonb,
+    p_priority integer,
+    p_max_attempts integer,
+    p_delay_seconds float,
+    p_supersede_running boolean
+) returns bigint
+language plpgsql
+as $$
+declare
+    v_id bigint;
+begin
+    update tech_review_jobs
+       set status = 'superseded', lease_until = null, updated_at = now()
+     where repository = p_repository
+       and pr_number = p_pr_number
+       and (status = 'queued' or (p_supersede_running and status = 'running'));
+
+    insert into tech_review_jobs (
+        repository, pr_number, action, delivery_id, payload, priority, max_attempts, run_after
+    ) values (
+        p_repository, p_pr_number, p_action, p_delivery_id, p_payload, p_priority, p_max_attempts,
+        now() + make_interval(secs => p_delay_seconds)
+    )
+    returning id into v_id;
+    return v_id;
+end;
+$$;
+
+-- Reclama hasta p_limit trabajos para p_worker. SKIP LOCKED evita que dos réplicas
+-- reclamen el mismo trabajo sin bloquearse entre sí
+create or replace function claim_review_jobs(
+    p_worker text,
+    p_limit integer,
+    p_lease_seconds float
+) returns setof tech_review_jobs
+language plpgsql
+as $$
+begin
+    -- Los leases expirados sin intentos restantes pasan a 'dead'
+    update tech_review_jobs
+       set status = 'dead', lease_until = null, locked_by = null,
+           last_error = coalesce(last_error, 'Lease expirado'), updated_at = now()
+     where status = 'running' and lease_until < now() and attempts >= max_attempts;
+
+    return query
+    update tech_review_jobs j
+       set status = 'running',
+           attempts = j.attempts + 1,
+           locked_by = p_worker,
+           lease_until = now() + make_interval(secs => p_lease_seconds),
+           updated_at = now()
+      from (
+            select id
+              from tech_review_jobs
+             where (status = 'queued' and run_after <= now())
+                or (status = 'running' and lease_until < now())
+             order by priority desc, run_after, id
+             limit p_limit
+               for update skip locked
+           ) claimable
+     where j.id = claimable.id
+    returning j.*;
+end;
+$$;
+
+-- Renueva el lease; devuelve false si el trabajo ya no pertenece al worker (p. ej. fue sustituido)
+create or replace function renew_review_job(
+    p_id bigint,
+    p_worker text,
+    p_lease_seconds float
+) returns boolean
+language plpgsql
+as $$
+begin
+    update tech_review_jobs
+       set lease_until = now() + make_interval(secs => p_lease_seconds), updated_at = now()
+     where id = p_id and locked_by = p_worker and status = 'running';
+    return found;
+end;
+$$;
+
+-- Registra el fallo de un intento: se reprograma tras p_retry_delay_seconds o, si es null, pasa a 'dead'
+create or replace function fail_review_job(
+    p_id bigint,
+    p_worker text,
+    p_error text,
+    p_retry_delay_seconds float
+) returns void
+language plpgsql
+as $$
+begin
+    update tech_review_jobs
+       set status = case when p_retry_delay_seconds is null then 'dead' else 'queued' end,
+           run_after = now() + make_interval(secs => coalesce(p_retry_delay_seconds, 0)),
+           lease_until = null,
+           locked_by = null,
+           last_error = p_error,
+           updated_at = now()
+     where id = p_id and locked_by = p_worker and status = 'running';
+end;
+$$;
@@ -0,0 +1,53 @@
+-- Entregas de webhook ya procesadas, para ignorar reentregas de GitHub y reenvíos manuales
+-- Una entrega es duplicada si se repite su X-GitHub-Delivery o la huella (repositorio, PR, head SHA, acción)
+create table if not exists tech_webhook_deliveries (
+    delivery_id text primary key,                          -- X-GitHub-Delivery
+    fingerprint text not null,                             -- SHA-256 de repositorio, PR, head SHA y acción
+    repository text not null,
+    pr_number integer not null,
+    head_sha text,
+    action text,
+    received_at timestamp with time zone not null default now()
+);
+
+create index if not exists idx_tech_webhook_deliveries_fingerprint
+    on tech_webhook_deliveries(fingerprint, received_at desc);
+create index if not exists idx_tech_webhook_deliveries_received_at
+    on tech_webhook_deliveries(received_at);
+
+-- Registra la entrega y devuelve false si ya se había recibido dentro de p_ttl_seconds.
+-- El advisory lock serializa las entregas con la misma huella que llegan a la vez
+create or replace function register_webhook_delivery(
+    p_delivery_id text,
+    p_fingerprint text,
+    p_repository text,
+    p_pr_number integer,
+    p_head_sha text,
+    p_action text,
+    p_ttl_seconds float
+) returns boolean
+language plpgsql
+as $$
+begin
+    perform pg_advisory_xact_lock(hashtext(p_fingerprint));
+
+    if exists (
+        select 1 from tech_webhook_deliveries
+         where delivery_id = p_delivery_id
+            or (fingerprint = p_fingerprint
+                and received_at > now() - make_interval(secs => p_ttl_seconds))
+    ) then
+        return false;
+    end if;
+
+    insert into tech_webhook_deliveries (delivery_id, fingerprint, repository, pr_number, head_sha, action)
+    values (p_delivery_id, p_fingerprint, p_repository, p_pr_number, p_head_sha, p_action);
+
+    -- Mantener la tabla acotada: de vez en cuando se borran las entregas expiradas
+    if random() < 0.01 then
+        delete from tech_webhook_deliveries
+         where received_at < now() - make_interval(secs => p_ttl_seconds);
+    end if;
+    return true;
+end;
+$$;
@@ -0,0 +1,91 @@
+-- Guardado transaccional de una revisión y sus comentarios en una sola llamada (RPC save_review)
+-- Los comentarios se identifican por una huella estable: solo se insertan o borran los que cambiaron
+alter table tech_review_comments
+    add column if not exists fingerprint text;             -- SHA-256 de archivo, línea, contenido y sugerencia
+
+-- Misma huella que ReviewComment.fingerprint() (campos separados por chr(31))
+update tech_review_comments
+   set fingerprint = encode(sha256(convert_to(concat_ws(chr(31),
+           file_path, line_number::text, content, coalesce(suggestion, '')), 'UTF8')), 'hex')
+ where fingerprint is null;
+
+-- Comentarios idénticos repetidos en una misma revisión: se conserva el primero
+delete from tech_review_comments c
+ using tech_review_comments d
+ where c.review_id = d.review_id
+   and c.fingerprint = d.fingerprint
+   and c.id > d.id;
+
+create unique index if not exists idx_tech_review_comments_review_fingerprint
+    on tech_review_comments(review_id, fingerprint);
+
+-- Crea (p_review_id null) o actualiza la revisión y deja sus comentarios exactamente como p_comments.
+-- Devuelve {"id": ..., "comments": [{"id": ..., "fingerprint": ...}]}
+create or replace function save_review(
+    p_review_id bigint,
+    p_review jsonb,
+    p_comments jsonb
+) returns jsonb
+language plpgsql
+as $$
+declare
+    v_review_id bigint := p_review_id;
+    v_comments jsonb;
+begin
+    if v_review_id is null then
+        insert into tech_reviews (
+            pull_request_id, status, summary, score, head_sha,
+            suggested_title, suggested_labels, updated_at, created_at
+        ) values (
+            (p_review->>'pull_request_id')::bigint,
+            p_review->>'status',
+            p_review->>'summary',
+            (p_review->>'score')::float,
+            p_review->>'head_sha',
+            p_review->>'suggested_title',
+            coalesce(p_review->'suggested_labels', '[]'::jsonb),
+            (p_review->>'updated_at')::timestamptz,
+            (p_review->>'updated_at')::timestamptz
+        )
+        returning id into v_review_id;
+    else
+        update tech_reviews
+           set status = p_review->>'status',
+               summary = p_review->>'summary',
+               score = (p_review->>'score')::float,
+               head_sha = p_review->>'head_sha',
+               suggested_title = p_review->>'suggested_title',
+               suggested_labels = coalesce(p_review->'suggested_labels', '[]'::jsonb),
+               updated_at = (p_review->>'updated_at')::timestamptz
+         where id = v_review_id;
+        if not found then
+            raise exception 'Revisión % no encontrada', v_review_id;
+        end if;
+    end if;
+
+    -- Borrar solo los comentarios que ya no están
+    delete from tech_review_comments
+     where review_id = v_review_id
+       and (fingerprint is null or fingerprint not in (
+           select e->>'fingerprint' from jsonb_array_elements(p_comments) e
+       ));
+
+    -- Insertar solo los nuevos; los que no cambiaron conservan su fila
+    insert into tech_review_comments (review_id, file_path, line_number, content, suggestion, fingerprint)
+    select v_review_id,
+           e->>'file_path',
+           (e->>'line_number')::integer,
+           e->>'content',
+           e->>'suggestion',
+           e->>'fingerprint'
+      from jsonb_array_elements(p_comments) e
+    on conflict (review_id, fingerprint) do nothing;
+
+    select coalesce(jsonb_agg(jsonb_build_object('id', id, 'fingerprint', fingerprint)), '[]'::jsonb)
+      into v_comments
+      from tech_review_comments
+     where review_id = v_review_id;
+
+    return jsonb_build_object('id', v_review_id, 'comments', v_comments);
+end;
+$$;
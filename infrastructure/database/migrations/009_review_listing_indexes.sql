@@ -0,0 +1,5 @@
+-- Índices de los listados de revisiones por repositorio y por autor (paginación por cursor)
+-- Filtro por columnas de tech_prs y orden por tech_reviews.id descendente
+create index if not exists idx_tech_prs_repository on tech_prs(repository, id);
+create index if not exists idx_tech_prs_author on tech_prs(author, id);
+create index if not exists idx_tech_reviews_pr_id_desc on tech_reviews(pull_request_id, id desc);
@@ -0,0 +1,19 @@
+-- Guardado por lotes de revisiones (write-behind): una llamada y una transacción por lote
+-- Cada elemento es {"review_id": ..., "review": {...}, "comments": [...]}, como los parámetros de save_review
+create or replace function save_reviews(p_reviews jsonb) returns jsonb
+language plpgsql
+as $$
+declare
+    v_item jsonb;
+    v_results jsonb := '[]'::jsonb;
+begin
+    for v_item in select value from jsonb_array_elements(p_reviews) loop
+        v_results := v_results || jsonb_build_array(save_review(
+            (v_item->>'review_id')::bigint,
+            v_item->'review',
+            v_item->'comments'
+        ));
+    end loop;
+    return v_results;
+end;
+$$;
@@ -0,0 +1,23 @@
+-- Índices para las consultas frecuentes de las revisiones y la configuración
+-- Se sustituyen los índices que otro índice ya cubre (solo añaden coste a las escrituras)
+
+-- tech_prs.github_id ya tiene el índice de su restricción unique (upsert de PullRequestRepository.save)
+drop index if exists idx_tech_prs_github_id;
+
+-- Última revisión de un PR (get_by_pr_id): filtro por PR y orden por fecha, resuelto con un solo acceso
+create index if not exists idx_tech_reviews_pr_created
+    on tech_reviews(pull_request_id, created_at desc);
+-- Cubierto por idx_tech_reviews_pr_created e idx_tech_reviews_pr_id_desc
+drop index if exists idx_tech_reviews_pr_id;
+
+-- Comentarios de una revisión (select embebido y save_review): cubierto por el unique (review_id, fingerprint)
+drop index if exists idx_tech_review_comments_review_id;
+
+-- Prompt más reciente de una categoría: idx_prompts_category_version (004) ya sirve el orden por versión
+
+-- Reglas activas ordenadas por prioridad (get_all_active_rules): índice parcial que devuelve el orden
+create index if not exists idx_tech_rules_active_priority
+    on tech_analysis_rules(priority) where is_active = true;
+drop index if exists idx_tech_rules_active;
+
+-- Guías, plantillas y etiquetas activas: ya tienen índices parciales (003)
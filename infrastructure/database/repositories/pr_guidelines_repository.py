@@ -2,6 +2,7 @@ import logging
 from typing import List, Optional
 from datetime import datetime
 from supabase import Client
+from infrastructure.database.db_executor import run_db
 from domain.models.pr_guidelines import (
     PRTitleGuideline,
     PRDescriptionTemplate,
@@ -16,48 +17,43 @@ class PRGuidelinesRepository:
     def __init__(self, supabase: Client):
         self.supabase = supabase
 
-    def get_active_title_guidelines(self) -> List[PRTitleGuideline]:
+    async def get_active_title_guidelines(self) -> List[PRTitleGuideline]:
         """Obtiene todas las guías de título activas"""
-        result = self.supabase.table("tech_pr_title_guidelines")\
-            .select("*")\
-            .eq("is_active", True)\
-            .execute()
+        result = await run_db(self.supabase.table("tech_pr_title_guidelines")
+            .select("*")
+            .eq("is_active", True))
             
         return [PRTitleGuideline(**data) for data in result.data]
 
-    def get_active_template(self) -> Optional[PRDescriptionTemplate]:
+    async def get_active_template(self) -> Optional[PRDescriptionTemplate]:
         """Obtiene la plantilla de descripción activa"""
-        result = self.supabase.table("tech_pr_description_templates")\
-            .select("*")\
-            .eq("is_active", True)\
-            .limit(1)\
-            .execute()
+        result = await run_db(self.supabase.table("tech_pr_description_templates")
+            .select("*")
+            .eq("is_active", True)
+            .limit(1))
             
         return PRDescriptionTemplate(**result.data[0]) if result.data else None
 
-    def get_active_labels(self) -> List[PRLabel]:
+    async def get_active_labels(self) -> List[PRLabel]:
         """Obtiene todas las etiquetas activas"""
-        result = self.supabase.table("tech_pr_labels")\
-            .select("*")\
-            .eq("is_active", True)\
-            .execute()
+        result = await run_db(self.supabase.table("tech_pr_labels")
+            .select("*")
+            .eq("is_active", True))
             
         return [PRLabel(**data) for data in result.data]
 
-    def save_title_guideline(self, guideline: PRTitleGuideline) -> PRTitleGuideline:
+    async def save_title_guideline(self, guideline: PRTitleGuideline) -> PRTitleGuideline:
         """Guarda o actualiza una guía de título"""
         data = guideline.dict(exclude={'id', 'created_at', 'updated_at'})
         data['updated_at'] = datetime.utcnow().isoformat()
 
         if guideline.id:
-            result = self.supabase.table("tech_pr_title_guidelines")\
-                .update(data)\
-                .eq("id", guideline.id)\
-                .execute()
+            result = await run_db(self.supabase.table("tech_pr_title_guidelines")
+                .update(data)
+                .eq("id", guideline.id))
         else:
             data['created_at'] = data['updated_at']
-            result = self.supabase.table("tech_pr_title_guidelines")\
-                .insert(data)\
-                .execute()
+            result = await run_db(self.supabase.table("tech_pr_title_guidelines")
+                .insert(data))
 
         return PRTitleGuideline(**result.data[0]) 
\ No newline at end of file
@@ -2,6 +2,7 @@ import logging
 from typing import Optional, List
 from datetime import datetime
 from supabase import Client
+from infrastructure.database.db_executor import run_db
 from pydantic import BaseModel
 from application.dto.prompt_dto import CreatePromptDTO, UpdatePromptDTO, CreateRuleDTO, UpdateRuleDTO, PromptDTO, RuleDTO
 from infrastructure.database.supabase_client import get_client
@@ -34,7 +35,7 @@ class PromptRepository:
         self.table = "tech_analysis_prompts"
         self.rules_table = "tech_analysis_rules"
 
-    def get_active_prompt(self) -> PromptDTO:
+    async def get_active_prompt(self) -> PromptDTO:
         """
         Obtiene el único prompt activo en el sistema.
         
@@ -44,10 +45,9 @@ class PromptRepository:
         Raises:
             PromptNotFoundException: Si no hay un prompt activo
         """
-        result = self.supabase.table(self.table)\
-            .select("*")\
-            .eq("is_active", True)\
-            .execute()
+        result = await run_db(self.supabase.table(self.table)
+            .select("*")
+            .eq("is_active", True))
 
         if not result.data:
             raise PromptNotFoundException("No active prompt found")
@@ -55,22 +55,21 @@ class PromptRepository:
         data = result.data[0]
         return PromptDTO(**data)
 
-    def get_all_active_rules(self) -> List[RuleDTO]:
+    async def get_all_active_rules(self) -> List[RuleDTO]:
         """
         Obtiene todas las reglas activas ordenadas por prioridad.
         
         Returns:
             List[RuleDTO]: Lista de reglas activas
         """
-        result = self.supabase.table(self.rules_table)\
-            .select("*")\
-            .eq("is_active", True)\
-            .order("priority")\
-            .execute()
+        result = await run_db(self.supabase.table(self.rules_table)
+            .select("*")
+            .eq("is_active", True)
+            .order("priority"))
 
         return [RuleDTO(**rule) for rule in result.data]
 
-    def create_prompt(self, dto: CreatePromptDTO) -> Prompt:
+    async def create_prompt(self, dto: CreatePromptDTO) -> Prompt:
         """Crea un nuevo prompt"""
         data = {
             "name": dto.name,
@@ -80,13 +79,12 @@ class PromptRepository:
             "is_active": True
         }
         
-        result = self.supabase.table(self.table)\
-            .insert(data)\
-            .execute()
+        result = await run_db(self.supabase.table(self.table)
+            .insert(data))
             
         return Prompt(**result.data[0])
 
-    def update_prompt(self, prompt_id: str, dto: UpdatePromptDTO) -> Optional[Prompt]:
+    async def update_prompt(self, prompt_id: str, dto: UpdatePromptDTO) -> Optional[Prompt]:
         """Actualiza un prompt existente"""
         data = {
             "prompt_text": dto.prompt_text,
@@ -95,17 +93,16 @@ class PromptRepository:
             "updated_at": datetime.utcnow().isoformat()
         }
         
-        result = self.supabase.table(self.table)\
-            .update(data)\
-            .eq("id", prompt_id)\
-            .execute()
+        result = await run_db(self.supabase.table(self.table)
+            .update(data)
+            .eq("id", prompt_id))
             
         if not result.data:
             return None
             
         return Prompt(**result.data[0])
 
-    def create_rule(self, dto: CreateRuleDTO) -> dict:
+    async def create_rule(self, dto: CreateRuleDTO) -> dict:
         """Crea una nueva regla"""
         data = {
             "name": dto.name,
@@ -117,48 +114,44 @@ class PromptRepository:
             "is_active": True
         }
         
-        result = self.supabase.table(self.rules_table)\
-            .insert(data)\
-            .execute()
+        result = await run_db(self.supabase.table(self.rules_table)
+            .insert(data))
             
         return result.data[0]
 
-    def update_rule(self, rule_id: str, dto: UpdateRuleDTO) -> Optional[dict]:
+    async def update_rule(self, rule_id: str, dto: UpdateRuleDTO) -> Optional[dict]:
         """Actualiza una regla existente"""
         data = {k: v for k, v in dto.dict().items() if v is not None}
         data["updated_at"] = datetime.utcnow().isoformat()
         
-        result = self.supabase.table(self.rules_table)\
-            .update(data)\
-            .eq("id", rule_id)\
-            .execute()
+        result = await run_db(self.supabase.table(self.rules_table)
+            .update(data)
+            .eq("id", rule_id))
             
         if not result.data:
             return None
             
         return result.data[0]
 
-    def get_prompts_by_name(self, name: str) -> List[Prompt]:
+    async def get_prompts_by_name(self, name: str) -> List[Prompt]:
         """Obtiene todos los prompts con un nombre específico"""
-        result = self.supabase.table(self.table)\
-            .select("*")\
-            .eq("name", name)\
-            .order("created_at", desc=True)\
-            .execute()
+        result = await run_db(self.supabase.table(self.table)
+            .select("*")
+            .eq("name", name)
+            .order("created_at", desc=True))
             
         return [Prompt(**data) for data in result.data]
 
-    def get_rules_by_type(self, rule_type: str) -> List[dict]:
+    async def get_rules_by_type(self, rule_type: str) -> List[dict]:
         """Obtiene todas las reglas de un tipo específico"""
-        result = self.supabase.table(self.rules_table)\
-            .select("*")\
-            .eq("rule_type", rule_type)\
-            .order("priority", desc=True)\
-            .execute()
+        result = await run_db(self.supabase.table(self.rules_table)
+            .select("*")
+            .eq("rule_type", rule_type)
+            .order("priority", desc=True))
             
         return result.data
 
-    def save_prompt(self, prompt: PromptDTO) -> PromptDTO:
+    async def save_prompt(self, prompt: PromptDTO) -> PromptDTO:
         """
         Guarda un prompt en la base de datos.
         Si el prompt es activo, desactiva todos los demás.
@@ -171,10 +164,9 @@ class PromptRepository:
         """
         # Si el prompt será activo, desactivar todos los demás
         if prompt.is_active:
-            self.supabase.table(self.table)\
-                .update({"is_active": False})\
-                .neq("id", prompt.id if prompt.id else "")\
-                .execute()
+            await run_db(self.supabase.table(self.table)
+                .update({"is_active": False})
+                .neq("id", prompt.id if prompt.id else ""))
 
         # Preparar datos
         prompt_data = {
@@ -188,28 +180,25 @@ class PromptRepository:
 
         if prompt.id:
             # Actualizar existente
-            result = self.supabase.table(self.table)\
-                .update(prompt_data)\
-                .eq("id", prompt.id)\
-                .execute()
+            result = await run_db(self.supabase.table(self.table)
+                .update(prompt_data)
+                .eq("id", prompt.id))
         else:
             # Crear nuevo
             prompt_data["created_at"] = datetime.utcnow().isoformat()
-            result = self.supabase.table(self.table)\
-                .insert(prompt_data)\
-                .execute()
+            result = await run_db(self.supabase.table(self.table)
+                .insert(prompt_data))
 
         prompt.id = result.data[0]["id"]
         return prompt
 
-    def get_latest_prompt_by_category(self, category: str) -> PromptDTO:
+    async def get_latest_prompt_by_category(self, category: str) -> PromptDTO:
         """Obtiene el prompt más reciente de una categoría específica"""
-        result = self.supabase.table(self.table)\
-            .select("*")\
-            .eq("category", category)\
-            .order("version", desc=True)\
-            .limit(1)\
-            .execute()
+        result = await run_db(self.supabase.table(self.table)
+            .select("*")
+            .eq("category", category)
+            .order("version", desc=True)
+            .limit(1))
 
         if not result.data:
             raise PromptNotFoundException(f"No prompt found for category: {category}")
@@ -1,7 +1,8 @@
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from supabase import Client
+from infrastructure.database.db_executor import run_db
 from domain.models.pull_request import PullRequest, PullRequestStatus
 
 logger = logging.getLogger(__name__)
@@ -14,9 +15,12 @@ class PullRequestRepository:
     def __init__(self, supabase: Client):
         self.supabase = supabase
 
-    def save(self, pull_request: PullRequest) -> int:
+    async def save(self, pull_request: PullRequest) -> int:
         """
         Guarda o actualiza un Pull Request en la base de datos.
+
+        Es un único upsert sobre `github_id` (único en tech_prs): una sola petición y
+        sin filas duplicadas cuando llegan a la vez dos webhooks del mismo PR nuevo.
         
         Args:
             pull_request: Pull Request a guardar
@@ -24,7 +28,34 @@ class PullRequestRepository:
         Returns:
             int: ID interno del PR en la base de datos
         """
-        pr_data = {
+        result = await run_db(self.supabase.table("tech_prs")
+            .upsert(self._to_row(pull_request), on_conflict="github_id"))
+        return result.data[0]["id"]
+
+    async def save_many(self, pull_requests: List[PullRequest], batch_size: int = 500) -> Dict[int, int]:
+        """
+        Guarda o actualiza muchos Pull Requests con upserts por lotes (backfills).
+
+        Args:
+            pull_requests: Pull Requests a guardar
+            batch_size: PRs por petición
+
+        Returns:
+            Dict[int, int]: ID interno de cada PR, indexado por github_id
+        """
+        # Un mismo upsert no puede actualizar dos veces la misma fila: se queda la última versión de cada PR
+        rows = list({pr.github_id: self._to_row(pr) for pr in pull_requests}.values())
+        ids: Dict[int, int] = {}
+        for start in range(0, len(rows), batch_size):
+            result = await run_db(self.supabase.table("tech_prs")
+                .upsert(rows[start:start + batch_size], on_conflict="github_id"))
+            ids.update({row["github_id"]: row["id"] for row in result.data})
+        logger.info(f"{len(ids)} PRs guardados en {(len(rows) + batch_size - 1) // batch_size} lotes")
+        return ids
+
+    @staticmethod
+    def _to_row(pull_request: PullRequest) -> dict:
+        return {
             "github_id": pull_request.github_id,
             "number": pull_request.number,
             "title": pull_request.title,
@@ -39,27 +70,7 @@ class PullRequestRepository:
             "labels": pull_request.labels
         }
 
-        # Intentar obtener PR existente primero
-        existing = self.supabase.table("tech_prs")\
-            .select("id")\
-            .eq("github_id", pull_request.github_id)\
-            .execute()
-
-        if existing.data:
-            # Actualizar existente
-            self.supabase.table("tech_prs")\
-                .update(pr_data)\
-                .eq("id", existing.data[0]["id"])\
-                .execute()
-            return existing.data[0]["id"]
-        else:
-            # Crear nuevo
-            result = self.supabase.table("tech_prs")\
-                .insert(pr_data)\
-                .execute()
-            return result.data[0]["id"]
-
-    def get_by_github_id(self, github_id: int) -> Optional[int]:
+    async def get_by_github_id(self, github_id: int) -> Optional[int]:
         """
         Obtiene el ID interno de un PR por su GitHub ID.
         
@@ -69,18 +80,16 @@ class PullRequestRepository:
         Returns:
             Optional[int]: ID interno del PR o None si no existe
         """
-        result = self.supabase.table("tech_prs")\
-            .select("id")\
-            .eq("github_id", github_id)\
-            .execute()
+        result = await run_db(self.supabase.table("tech_prs")
+            .select("id")
+            .eq("github_id", github_id))
             
         return result.data[0]["id"] if result.data else None
 
     async def get_by_id(self, pr_id: int) -> Optional[PullRequest]:
-        result = await self.supabase.table("tech_prs")\
-            .select("*")\
-            .eq("id", pr_id)\
-            .execute()
+        result = await run_db(self.supabase.table("tech_prs")
+            .select("*")
+            .eq("id", pr_id))
             
         if not result.data:
             return None
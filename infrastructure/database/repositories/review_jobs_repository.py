@@ -0,0 +1,130 @@
+# Este módulo implementa la cola persistente de revisiones sobre Supabase
+# El reclamo, la renovación del lease y los fallos se hacen con funciones SQL (ver 006_review_jobs.sql)
+import logging
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from supabase import Client
+from infrastructure.database.db_executor import run_db
+from domain.models.review_job import ReviewJobRecord, ReviewJobStatus
+
+logger = logging.getLogger(__name__)
+
+class ReviewJobsRepository:
+    """
+    Cola de trabajos de revisión en la tabla tech_review_jobs.
+    Varias réplicas pueden consumirla a la vez: `claim` usa FOR UPDATE SKIP LOCKED.
+    """
+
+    def __init__(self, supabase: Client):
+        self.supabase = supabase
+
+    async def enqueue(
+        self,
+        repository: str,
+        pr_number: int,
+        action: Optional[str],
+        payload: Dict[str, Any],
+        delivery_id: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: int = 5,
+        delay_seconds: float = 0.0,
+        supersede_running: bool = False
+    ) -> int:
+        """
+        Encola una revisión sustituyendo las que esperan del mismo PR.
+
+        Args:
+            repository: Repositorio del PR
+            pr_number: Número del PR
+            action: Acción del webhook
+            payload: Pull Request serializado
+            delivery_id: X-GitHub-Delivery del webhook
+            priority: Prioridad (mayor se reclama antes)
+            max_attempts: Intentos antes de pasar a 'dead'
+            delay_seconds: Segundos hasta que el trabajo es reclamable
+            supersede_running: Sustituir también la revisión en ejecución del PR
+
+        Returns:
+            int: ID del trabajo
+        """
+        result = await run_db(self.supabase.rpc("enqueue_review_job", {
+            "p_repository": repository,
+            "p_pr_number": pr_number,
+            "p_action": action,
+            "p_delivery_id": delivery_id,
+            "p_payload": payload,
+            "p_priority": priority,
+            "p_max_attempts": max_attempts,
+            "p_delay_seconds": delay_seconds,
+            "p_supersede_running": supersede_running
+        }))
+        return result.data
+
+    async def claim(self, worker_id: str, limit: int, lease_seconds: float) -> List[ReviewJobRecord]:
+        """Reclama hasta `limit` trabajos reclamables (en cola o con el lease expirado)."""
+        result = await run_db(self.supabase.rpc("claim_review_jobs", {
+            "p_worker": worker_id,
+            "p_limit": limit,
+            "p_lease_seconds": lease_seconds
+        }))
+        return [ReviewJobRecord(**row) for row in result.data or []]
+
+    async def renew(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        """Renueva el lease. Devuelve False si el trabajo ya no pertenece al worker."""
+        result = await run_db(self.supabase.rpc("renew_review_job", {
+            "p_id": job_id,
+            "p_worker": worker_id,
+            "p_lease_seconds": lease_seconds
+        }))
+        return bool(result.data)
+
+    async def complete(self, job_id: int, worker_id: str) -> None:
+        await run_db(self.supabase.table("tech_review_jobs")
+            .update({
+                "status": ReviewJobStatus.COMPLETED.value,
+                "lease_until": None,
+                "updated_at": datetime.utcnow().isoformat()
+            })
+            .eq("id", job_id)
+            .eq("locked_by", worker_id)
+            .eq("status", ReviewJobStatus.RUNNING.value))
+
+    async def fail(self, job_id: int, worker_id: str, error: str, retry_delay: Optional[float]) -> None:
+        """Registra un intento fallido; con `retry_delay` None el trabajo pasa a 'dead'."""
+        await run_db(self.supabase.rpc("fail_review_job", {
+            "p_id": job_id,
+            "p_worker": worker_id,
+            "p_error": error,
+            "p_retry_delay_seconds": retry_delay
+        }))
+
+    async def list_by_status(self, status: ReviewJobStatus, limit: int = 50) -> List[ReviewJobRecord]:
+        result = await run_db(self.supabase.table("tech_review_jobs")
+            .select("*")
+            .eq("status", status.value)
+            .order("updated_at", desc=True)
+            .limit(limit))
+        return [ReviewJobRecord(**row) for row in result.data or []]
+
+    async def retry(self, job_id: int) -> bool:
+        """Vuelve a encolar un trabajo 'dead' con los intentos a cero."""
+        result = await run_db(self.supabase.table("tech_review_jobs")
+            .update({
+                "status": ReviewJobStatus.QUEUED.value,
+                "attempts": 0,
+                "run_after": datetime.utcnow().isoformat(),
+                "updated_at": datetime.utcnow().isoformat()
+            })
+            .eq("id", job_id)
+            .eq("status", ReviewJobStatus.DEAD.value))
+        return bool(result.data)
+
+    async def count_by_status(self) -> Dict[str, int]:
+        counts = {}
+        for status in (ReviewJobStatus.QUEUED, ReviewJobStatus.RUNNING, ReviewJobStatus.DEAD):
+            result = await run_db(self.supabase.table("tech_review_jobs")
+                .select("id", count="exact")
+                .eq("status", status.value)
+                .limit(1))
+            counts[status.value] = result.count or 0
+        return counts
@@ -4,10 +4,21 @@ import logging
 from typing import Optional, List
 from datetime import datetime
 from supabase import Client
+from application.dto.review_dto import ReviewPageDTO, ReviewSummaryDTO
+from infrastructure.database.db_executor import run_db
 from domain.models.review import Review, ReviewComment, ReviewStatus
 
 logger = logging.getLogger(__name__)
 
+# Revisión con sus comentarios embebidos (PostgREST): una sola petición
+REVIEW_WITH_COMMENTS = "*, tech_review_comments(*)"
+
+# Columnas de los listados: datos del PR (inner join para filtrar por él) y número de comentarios
+REVIEW_SUMMARY = (
+    "id, pull_request_id, status, summary, score, head_sha, created_at, updated_at, "
+    "tech_prs!inner(number, title, repository, author), tech_review_comments(count)"
+)
+
 class ReviewsRepository:
     """
     Repositorio para gestionar las revisiones de código.
@@ -19,7 +30,10 @@ class ReviewsRepository:
 
     async def save(self, review: Review) -> Review:
         """
-        Guarda una revisión y sus comentarios en las tablas correspondientes.
+        Guarda una revisión y sus comentarios en una sola transacción (RPC save_review).
+
+        Los comentarios se comparan por su huella: solo se insertan los nuevos y se
+        borran los que ya no están, y los ids vuelven en la misma respuesta.
         
         Args:
             review: Revisión a guardar
@@ -27,64 +41,69 @@ class ReviewsRepository:
         Returns:
             Review: Revisión guardada con ID actualizado
         """
-        # Preparar datos de la revisión
+        params = self._save_params(review)
+        result = await run_db(self.supabase.rpc("save_review", {
+            "p_review_id": params["review_id"],
+            "p_review": params["review"],
+            "p_comments": params["comments"]
+        }))
+        self._apply_saved(review, result.data)
+        return review
+
+    async def save_many(self, reviews: List[Review]) -> List[Review]:
+        """
+        Guarda varias revisiones en una sola llamada y transacción (RPC save_reviews).
+
+        Args:
+            reviews: Revisiones a guardar
+
+        Returns:
+            List[Review]: Las mismas revisiones con sus IDs actualizados
+        """
+        if not reviews:
+            return reviews
+        result = await run_db(self.supabase.rpc("save_reviews", {
+            "p_reviews": [self._save_params(review) for review in reviews]
+        }))
+        for review, saved in zip(reviews, result.data):
+            self._apply_saved(review, saved)
+        return reviews
+
+    @staticmethod
+    def _save_params(review: Review) -> dict:
+        """Parámetros de save_review para una revisión."""
         review_data = {
             "pull_request_id": review.pull_request_id,
             "status": review.status.value,
             "summary": review.summary,
             "score": review.score,
+            "head_sha": review.head_sha,
             "suggested_title": review.suggested_title,
             "suggested_labels": review.suggested_labels,
             "updated_at": datetime.utcnow().isoformat()
         }
 
-        if review.id:
-            # Actualizar revisión existente
-            result = self.supabase.table("tech_reviews") \
-                .update(review_data) \
-                .eq("id", review.id) \
-                .execute()
-        else:
-            # Crear nueva revisión
-            review_data["created_at"] = datetime.utcnow().isoformat()
-            result = self.supabase.table("tech_reviews") \
-                .insert(review_data) \
-                .execute()
-
-        review_id = result.data[0]["id"]
-        review.id = review_id
-
-        # Manejar comentarios en tabla separada
-        if review.comments:
-            # Eliminar comentarios anteriores si existen
-            if review.id:
-                self.supabase.table("tech_review_comments") \
-                    .delete() \
-                    .eq("review_id", review_id) \
-                    .execute()
-
-            # Insertar nuevos comentarios
-            comments_data = [
-                {
-                    "review_id": review_id,
-                    "file_path": comment.file_path,
-                    "line_number": comment.line_number,
-                    "content": comment.content,
-                    "suggestion": comment.suggestion
-                }
-                for comment in review.comments
-            ]
-
-            comments_result = self.supabase.table("tech_review_comments") \
-                .insert(comments_data) \
-                .execute()
-
-            # Actualizar IDs de comentarios
-            for i, comment in enumerate(review.comments):
-                comment.id = comments_result.data[i]["id"]
-                comment.review_id = review_id
-
-        return review
+        # Un comentario repetido en la misma revisión se guarda una sola vez
+        comments_data = {}
+        for comment in review.comments:
+            fingerprint = comment.fingerprint()
+            comments_data.setdefault(fingerprint, {
+                "file_path": comment.file_path,
+                "line_number": comment.line_number,
+                "content": comment.content,
+                "suggestion": comment.suggestion,
+                "fingerprint": fingerprint
+            })
+        return {"review_id": review.id, "review": review_data, "comments": list(comments_data.values())}
+
+    @staticmethod
+    def _apply_saved(review: Review, saved: dict) -> None:
+        """Asigna los IDs devueltos por save_review a la revisión y sus comentarios."""
+        review.id = saved["id"]
+        comment_ids = {c["fingerprint"]: c["id"] for c in saved["comments"]}
+        for comment in review.comments:
+            comment.id = comment_ids.get(comment.fingerprint())
+            comment.review_id = review.id
 
     async def get_by_pr_id(self, pr_id: int) -> Optional[Review]:
         """
@@ -96,25 +115,102 @@ class ReviewsRepository:
         Returns:
             Review: Última revisión encontrada o None
         """
-        # Obtener revisión
-        result = self.supabase.table("tech_reviews") \
-            .select("*") \
-            .eq("pull_request_id", pr_id) \
-            .order("created_at", desc=True) \
-            .limit(1) \
-            .execute()
+        result = await run_db(self.supabase.table("tech_reviews")
+            .select(REVIEW_WITH_COMMENTS)
+            .eq("pull_request_id", pr_id)
+            .order("created_at", desc=True)
+            .limit(1))
+
+        if not result.data:
+            return None
+
+        return self._to_review(result.data[0])
+
+    async def get_last_completed_by_pr_id(self, pr_id: int) -> Optional[Review]:
+        """
+        Obtiene la última revisión completada de un Pull Request con el SHA revisado.
+        Es la base de la revisión incremental en los eventos `synchronize`.
+
+        Args:
+            pr_id: ID del Pull Request
+
+        Returns:
+            Review: Última revisión completada o None
+        """
+        result = await run_db(self.supabase.table("tech_reviews")
+            .select(REVIEW_WITH_COMMENTS)
+            .eq("pull_request_id", pr_id)
+            .eq("status", ReviewStatus.COMPLETED.value)
+            .not_.is_("head_sha", "null")
+            .order("created_at", desc=True)
+            .limit(1))
 
         if not result.data:
             return None
 
-        review_data = result.data[0]
+        return self._to_review(result.data[0])
+
+    async def list_reviews(
+        self,
+        repository: Optional[str] = None,
+        author: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: int = 50
+    ) -> ReviewPageDTO:
+        """
+        Lista las revisiones de un repositorio o de un autor, de la más reciente a la más antigua.
+
+        Usa paginación por cursor (keyset) sobre tech_reviews.id: cada página es una
+        consulta acotada por índice, sin OFFSET, por profunda que sea.
 
-        # Obtener comentarios asociados
-        comments_result = self.supabase.table("tech_review_comments") \
-            .select("*") \
-            .eq("review_id", review_data["id"]) \
-            .execute()
+        Args:
+            repository: Repositorio (owner/repo)
+            author: Autor de los PRs
+            cursor: `next_cursor` de la página anterior (None para la primera)
+            limit: Revisiones por página
 
+        Returns:
+            ReviewPageDTO: Página de revisiones y cursor de la siguiente
+        """
+        query = self.supabase.table("tech_reviews").select(REVIEW_SUMMARY)
+        if repository is not None:
+            query = query.eq("tech_prs.repository", repository)
+        if author is not None:
+            query = query.eq("tech_prs.author", author)
+        if cursor is not None:
+            query = query.lt("id", cursor)
+
+        # Se pide una fila de más para saber si hay otra página
+        result = await run_db(query.order("id", desc=True).limit(limit + 1))
+        rows = result.data[:limit]
+        return ReviewPageDTO(
+            items=[self._to_summary(row) for row in rows],
+            next_cursor=rows[-1]["id"] if len(result.data) > limit else None
+        )
+
+    @staticmethod
+    def _to_summary(row: dict) -> ReviewSummaryDTO:
+        pr = row["tech_prs"]
+        counts = row.get("tech_review_comments") or [{"count": 0}]
+        return ReviewSummaryDTO(
+            id=row["id"],
+            pull_request_id=row["pull_request_id"],
+            pr_number=pr["number"],
+            pr_title=pr["title"],
+            repository=pr["repository"],
+            author=pr["author"],
+            status=ReviewStatus(row["status"]),
+            summary=row["summary"],
+            score=row["score"],
+            head_sha=row.get("head_sha"),
+            comment_count=counts[0]["count"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            updated_at=datetime.fromisoformat(row["updated_at"])
+        )
+
+    @staticmethod
+    def _to_review(review_data: dict) -> Review:
+        """Construye la revisión a partir de la fila de tech_reviews con sus comentarios embebidos."""
         # Construir comentarios
         comments = [
             ReviewComment(
@@ -125,9 +221,8 @@ class ReviewsRepository:
                 content=c["content"],
                 suggestion=c.get("suggestion")
             )
-            for c in comments_result.data
+            for c in review_data.get("tech_review_comments", [])
         ]
-
         # Construir y retornar revisión completa
         return Review(
             id=review_data["id"],
@@ -135,9 +230,10 @@ class ReviewsRepository:
             status=ReviewStatus(review_data["status"]),
             summary=review_data["summary"],
             score=review_data["score"],
+            head_sha=review_data.get("head_sha"),
             comments=comments,
             created_at=datetime.fromisoformat(review_data["created_at"]),
             updated_at=datetime.fromisoformat(review_data["updated_at"]),
             suggested_title=review_data.get("suggested_title"),
             suggested_labels=review_data.get("suggested_labels", [])
-        ) 
\ No newline at end of file
+        )
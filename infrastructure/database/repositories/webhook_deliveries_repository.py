@@ -0,0 +1,49 @@
+# Este módulo persiste las entregas de webhook ya recibidas (ver 007_webhook_deliveries.sql)
+import logging
+from typing import Optional
+from supabase import Client
+from infrastructure.database.db_executor import run_db
+
+logger = logging.getLogger(__name__)
+
+class WebhookDeliveriesRepository:
+    """
+    Repositorio de entregas de webhook procesadas.
+    Comparte la deduplicación entre réplicas y reinicios.
+    """
+
+    def __init__(self, supabase: Client):
+        self.supabase = supabase
+
+    async def register(
+        self,
+        delivery_id: str,
+        fingerprint: str,
+        repository: str,
+        pr_number: int,
+        head_sha: Optional[str],
+        action: Optional[str],
+        ttl_seconds: float
+    ) -> bool:
+        """
+        Registra la entrega de forma atómica.
+
+        Returns:
+            bool: True si es nueva, False si ya se había recibido dentro del TTL
+        """
+        result = await run_db(self.supabase.rpc("register_webhook_delivery", {
+            "p_delivery_id": delivery_id,
+            "p_fingerprint": fingerprint,
+            "p_repository": repository,
+            "p_pr_number": pr_number,
+            "p_head_sha": head_sha,
+            "p_action": action,
+            "p_ttl_seconds": ttl_seconds
+        }))
+        return bool(result.data)
+
+    async def delete(self, delivery_id: str) -> None:
+        """Olvida una entrega (p. ej. si no se pudo encolar y GitHub la reenviará)."""
+        await run_db(self.supabase.table("tech_webhook_deliveries")
+            .delete()
+            .eq("delivery_id", delivery_id))
@@ -0,0 +1,198 @@
+# Este módulo implementa el guardado diferido (write-behind) de las revisiones
+# La revisión se publica en GitHub sin esperar a la BD; se persiste después en lotes
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+from domain.models.review import Review, ReviewStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ReviewWriteBuffer:
+    """
+    Búfer en proceso de revisiones pendientes de guardar.
+
+    - Se vacía en lotes (ReviewsRepository.save_many) al llegar a `max_batch`
+      revisiones o cada `flush_interval` segundos.
+    - Un lote que falla se reintenta con espera exponencial; si sigue fallando
+      tras `max_retries`, sus revisiones se guardan una a una y solo las que
+      vuelven a fallar se vuelcan a `spill_path` (JSON por línea) y se
+      reintentan al arrancar.
+    - `shutdown()` vacía el búfer antes de apagar, volcando lo que no se pueda guardar.
+    """
+
+    def __init__(
+        self,
+        repository,
+        max_batch: int = 50,
+        flush_interval: float = 1.0,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        spill_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            repository: Repositorio de revisiones (con `save_many`)
+            max_batch: Revisiones por lote; al alcanzarse se vacía el búfer
+            flush_interval: Segundos máximos que una revisión espera en el búfer
+            max_retries: Reintentos de un lote antes de volcarlo a disco
+            retry_delay: Espera inicial entre reintentos (se duplica en cada uno)
+            spill_path: Archivo de volcado (None para descartar con un error en el log)
+        """
+        self.repository = repository
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.spill_path = spill_path
+        self._buffer: List[Review] = []
+        self._writing: List[Review] = []  # Lote que se está guardando
+        self._batch_ready = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = False
+        self._flush_lock = asyncio.Lock()
+        self._spill_lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "submitted": 0, "saved": 0, "batches": 0, "retries": 0, "spilled": 0, "replayed": 0, "dropped": 0
+        }
+
+    async def start(self) -> None:
+        """Reencola las revisiones volcadas en una ejecución anterior y arranca el vaciado periódico."""
+        if self._flusher is not None:
+            return
+        replayed = await asyncio.to_thread(self._read_spill)
+        if replayed:
+            logger.info(f"Reintentando {len(replayed)} revisiones volcadas a {self.spill_path}")
+            self._buffer.extend(replayed)
+            self._stats["replayed"] += len(replayed)
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    def submit(self, review: Review) -> None:
+        """Encola la revisión para guardarla en el siguiente lote (no espera a la BD)."""
+        self._buffer.append(review)
+        self._stats["submitted"] += 1
+        if len(self._buffer) >= self.max_batch:
+            self._batch_ready.set()
+
+    async def flush(self) -> None:
+        """Guarda ahora todas las revisiones del búfer, en lotes de `max_batch`."""
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._buffer[:self.max_batch]
+                del self._buffer[:self.max_batch]
+                self._writing = batch
+                try:
+                    await self._write(batch)
+                finally:
+                    self._writing = []
+
+    async def shutdown(self) -> None:
+        """Detiene el vaciado periódico y guarda (o vuelca) lo pendiente."""
+        # No se cancela el vaciado en curso: un lote a medio guardar se perdería
+        self._closing = True
+        self._batch_ready.set()
+        if self._flusher is not None:
+            await self._flusher
+            self._flusher = None
+        await self.flush()
+
+    def last_completed(self, pull_request_id: int) -> Optional[Review]:
+        """Última revisión completada de un PR que aún no se ha guardado (en el búfer o guardándose)."""
+        for review in reversed(self._writing + self._buffer):
+            if review.pull_request_id == pull_request_id and review.status == ReviewStatus.COMPLETED:
+                return review
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "buffered": len(self._buffer)}
+
+    async def _flush_loop(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+
+    async def _write(self, batch: List[Review]) -> None:
+        delay = self.retry_delay
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.repository.save_many(batch)
+                self._stats["saved"] += len(batch)
+                self._stats["batches"] += 1
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"No se pudo guardar un lote de {len(batch)} revisiones: {str(e)}")
+                    break
+                self._stats["retries"] += 1
+                logger.warning(f"Error guardando {len(batch)} revisiones (intento {attempt + 1}): {str(e)}")
+                await asyncio.sleep(delay)
+                delay *= 2
+        if len(batch) > 1:
+            # Una sola revisión inválida hace fallar todo el lote: no se vuelcan las demás
+            batch = await self._write_individually(batch)
+        if batch:
+            await asyncio.to_thread(self._spill, batch)
+
+    async def _write_individually(self, batch: List[Review]) -> List[Review]:
+        """Guarda las revisiones de un lote fallido por separado; devuelve las que siguen fallando."""
+        failed = []
+        for review in batch:
+            try:
+                await self.repository.save_many([review])
+                self._stats["saved"] += 1
+            except Exception as e:
+                logger.error(f"No se pudo guardar la revisión del PR {review.pull_request_id}: {str(e)}")
+                failed.append(review)
+        return failed
+
+    def _spill(self, batch: List[Review]) -> None:
+        if not self.spill_path:
+            self._stats["dropped"] += len(batch)
+            logger.error(f"Se descartan {len(batch)} revisiones sin guardar (REVIEW_WRITE_SPILL_PATH no configurado)")
+            return
+        with self._spill_lock:
+            directory = os.path.dirname(self.spill_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for review in batch:
+                    f.write(review.model_dump_json() + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        self._stats["spilled"] += len(batch)
+        logger.warning(f"{len(batch)} revisiones volcadas a {self.spill_path}")
+
+    def _read_spill(self) -> List[Review]:
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return []
+        with self._spill_lock:
+            with open(self.spill_path, encoding="utf-8") as f:
+                lines = [line for line in f if line.strip()]
+            os.remove(self.spill_path)  # Si vuelven a fallar se vuelcan de nuevo
+        reviews = []
+        for line in lines:
+            try:
+                reviews.append(Review.model_validate_json(line))
+            except ValueError as e:
+                logger.error(f"Revisión volcada ilegible, se descarta: {str(e)}")
+        return reviews
+
+
+def get_review_write_buffer(settings, repository) -> Optional[ReviewWriteBuffer]:
+    """Crea el búfer de guardado diferido según la configuración (None si está deshabilitado)."""
+    if not settings.REVIEW_WRITE_BEHIND:
+        return None
+    return ReviewWriteBuffer(
+        repository,
+        max_batch=settings.REVIEW_WRITE_MAX_BATCH,
+        flush_interval=settings.REVIEW_WRITE_FLUSH_INTERVAL,
+        max_retries=settings.REVIEW_WRITE_MAX_RETRIES,
+        spill_path=settings.REVIEW_WRITE_SPILL_PATH,
+    )
@@ -0,0 +1,124 @@
+# Este módulo construye un índice de posiciones sobre un diff unificado
+# Permite ubicar (archivo, línea) en su hunk en O(log n) para publicar comentarios en línea
+
+import logging
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import unidiff
+from domain.models.review import ReviewComment
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DiffPosition:
+    """Ubicación de una línea dentro del diff, en el formato que espera la API de reviews."""
+    path: str
+    line: int
+    side: str  # "RIGHT" (archivo nuevo) o "LEFT" (archivo original)
+    hunk_index: int
+
+
+@dataclass
+class _FileHunks:
+    """Rangos de los hunks de un archivo, ordenados para búsqueda binaria."""
+    target_starts: List[int] = field(default_factory=list)
+    target_ends: List[int] = field(default_factory=list)  # Exclusivo
+    target_hunks: List[int] = field(default_factory=list)
+    removed_lines: Dict[int, int] = field(default_factory=dict)  # línea original -> hunk
+
+
+class DiffIndex:
+    """
+    Índice de un diff unificado construido una sola vez por revisión.
+
+    Mapea (path, line) a su hunk y lado usando un diccionario por ruta y
+    búsqueda binaria sobre los rangos de los hunks, en lugar de re-parsear
+    el diff y recorrer archivos y hunks por cada comentario.
+    """
+
+    def __init__(self, files: Dict[str, _FileHunks]):
+        self._files = files
+
+    @classmethod
+    def from_diff(cls, diff: str) -> "DiffIndex":
+        """
+        Construye el índice a partir del texto de un diff unificado.
+
+        Args:
+            diff: Diff completo del PR
+
+        Returns:
+            DiffIndex: Índice listo para consultas
+
+        Raises:
+            unidiff.UnidiffParseError: Si el diff no se puede parsear
+        """
+        files: Dict[str, _FileHunks] = {}
+        for patched_file in unidiff.PatchSet(diff.splitlines(keepends=True)):
+            hunks = files.setdefault(patched_file.path, _FileHunks())
+            for hunk_index, hunk in enumerate(patched_file):
+                if hunk.target_length > 0:
+                    hunks.target_starts.append(hunk.target_start)
+                    hunks.target_ends.append(hunk.target_start + hunk.target_length)
+                    hunks.target_hunks.append(hunk_index)
+                for line in hunk:
+                    if line.is_removed:
+                        hunks.removed_lines[line.source_line_no] = hunk_index
+        return cls(files)
+
+    @property
+    def paths(self) -> Set[str]:
+        """Rutas de los archivos presentes en el diff."""
+        return set(self._files)
+
+    def locate(self, path: str, line: int) -> Optional[DiffPosition]:
+        """
+        Ubica una línea dentro del diff.
+
+        Primero busca la línea en el archivo nuevo (lado RIGHT); si no cae en
+        ningún hunk, acepta líneas eliminadas del archivo original (lado LEFT).
+
+        Args:
+            path: Ruta del archivo
+            line: Número de línea
+
+        Returns:
+            Optional[DiffPosition]: Posición encontrada o None si la línea no forma parte del diff
+        """
+        hunks = self._files.get(path)
+        if hunks is None:
+            return None
+
+        i = bisect_right(hunks.target_starts, line) - 1
+        if i >= 0 and line < hunks.target_ends[i]:
+            return DiffPosition(path=path, line=line, side="RIGHT", hunk_index=hunks.target_hunks[i])
+
+        hunk_index = hunks.removed_lines.get(line)
+        if hunk_index is not None:
+            return DiffPosition(path=path, line=line, side="LEFT", hunk_index=hunk_index)
+        return None
+
+    def partition(
+        self,
+        comments: Iterable[ReviewComment]
+    ) -> Tuple[List[Tuple[ReviewComment, DiffPosition]], List[ReviewComment]]:
+        """
+        Valida en bloque los comentarios generados por el LLM antes de publicarlos.
+
+        Args:
+            comments: Comentarios a validar
+
+        Returns:
+            Tuple: (comentarios ubicables junto con su posición, comentarios descartados)
+        """
+        located: List[Tuple[ReviewComment, DiffPosition]] = []
+        rejected: List[ReviewComment] = []
+        for comment in comments:
+            position = self.locate(comment.file_path, comment.line_number)
+            if position is None:
+                rejected.append(comment)
+            else:
+                located.append((comment, position))
+        return located, rejected
@@ -1,80 +1,584 @@
+import asyncio
+import re
 import jwt
 import time
 import httpx
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from domain.models.file_patch import FilePatch
 from domain.models.review import Review
+from infrastructure.github.diff_index import DiffIndex
+from infrastructure.github.rate_limiter import GitHubRateLimiter
+from infrastructure.github.retry_policy import IDEMPOTENT_METHODS, CircuitBreaker, RetryPolicy
+from infrastructure.github.response_cache import CachedResponse, ResponseCache
+from infrastructure.github.token_cache import InstallationToken, InstallationTokenCache
 import unidiff  # Asegúrate de tener instalada la librería unidiff
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Extrae "owner/repo" de las rutas /repos/{owner}/{repo}/...
+_REPOSITORY_PATH = re.compile(r"^/repos/([^/]+/[^/]+)")
+
+# GitHub devuelve como máximo 300 archivos en /compare; a partir de ahí la lista está truncada
+_COMPARE_MAX_FILES = 300
+
+
+class ResponseTooLargeError(Exception):
+    """El cuerpo de la respuesta supera el tope de bytes permitido."""
+    def __init__(self, max_bytes: int):
+        super().__init__(f"La respuesta supera el límite de {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
 
 class GitHubService:
     """
     Servicio para interactuar con la API de GitHub.
     Maneja autenticación y operaciones sobre Pull Requests.
+
+    Todas las peticiones comparten un único httpx.AsyncClient con pool de
+    conexiones (keep-alive y HTTP/2 opcional), de modo que las 5-7 llamadas
+    de una revisión reutilizan la misma conexión TCP+TLS.
     """
 
-    def __init__(self, app_id: str, private_key: str):
+    def __init__(
+        self,
+        app_id: str,
+        private_key: str,
+        base_url: str = "https://api.github.com",
+        http2: bool = False,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        token_refresh_margin: float = 300.0,
+        response_cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[GitHubRateLimiter] = None,
+        rate_limit_retries: int = 3,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        max_diff_bytes: int = 5 * 1024 * 1024,
+        files_page_concurrency: int = 4,
+    ):
         self.app_id = app_id
         self.private_key = private_key
-        self.base_url = "https://api.github.com"
-        self._installation_token = None
-        self._token_expires_at = 0
+        self.base_url = base_url.rstrip("/")
+        self._app_jwt: Optional[str] = None
+        self._app_jwt_expires_at = 0.0
+        self._repository_installations: Dict[str, int] = {}
+        self._token_cache = InstallationTokenCache(
+            self._fetch_installation_token,
+            refresh_margin=token_refresh_margin
+        )
+
+        # Configuración del pool de conexiones compartido
+        self._http2 = http2
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Caché de respuestas para peticiones condicionales (ETag / Last-Modified)
+        self._response_cache = response_cache
+
+        # Planificador que respeta el rate limit de GitHub
+        self._rate_limiter = rate_limiter
+        self._rate_limit_retries = rate_limit_retries
+
+        # Reintentos ante errores transitorios y corte rápido si GitHub está degradado
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
+
+        # Descarga del diff: tope de bytes y concurrencia del respaldo por archivo
+        self.max_diff_bytes = max_diff_bytes
+        self.files_page_concurrency = files_page_concurrency
+
+    async def start(self) -> None:
+        """
+        Abre el cliente HTTP compartido.
+        Se invoca desde el hook de arranque de la aplicación.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=self._http2,
+                limits=self._limits,
+                timeout=self._timeout,
+            )
+            logger.info(f"Cliente HTTP de GitHub iniciado (http2={self._http2})")
+
+    async def close(self) -> None:
+        """
+        Cierra el cliente HTTP compartido y libera las conexiones del pool.
+        Se invoca desde el hook de apagado de la aplicación.
+        """
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Cliente HTTP de GitHub cerrado")
+        self._client = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        Retorna el cliente compartido, abriéndolo de forma perezosa si
+        el servicio se usa fuera del ciclo de vida de la aplicación (CLI, tests).
+        """
+        if self._client is None or self._client.is_closed:
+            await self.start()
+        return self._client
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Punto único de salida hacia la API de GitHub.
+
+        Las lecturas (GET) se envían como peticiones condicionales cuando hay una
+        respuesta en caché: un 304 no consume rate limit y se sirve el cuerpo guardado.
+
+        Args:
+            method: Método HTTP
+            url: Ruta relativa a base_url (o URL absoluta)
+            **kwargs: Argumentos adicionales para httpx (headers, json, ...)
+
+        Returns:
+            httpx.Response: Respuesta sin validar
+        """
+        if method != "GET" or self._response_cache is None:
+            return await self._send(method, url, **kwargs)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        cache_key = ResponseCache.make_key(url, headers.get("Accept"), kwargs.get("params"))
+        cached = await self._response_cache.get(cache_key)
+        if cached is not None:
+            headers.update(cached.conditional_headers())
+
+        response = await self._send(method, url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            self._response_cache.record_hit()
+            return cached.to_response(response.request)
+
+        self._response_cache.record_miss()
+        if response.status_code == 200:
+            entry = CachedResponse.from_response(response)
+            if entry is not None:
+                await self._response_cache.put(cache_key, entry)
+        return response
+
+    async def _send(
+            self,
+            method: str,
+            url: str,
+            idempotent: Optional[bool] = None,
+            **kwargs
+    ) -> httpx.Response:
+        """
+        Envía la petición aplicando la política de reintentos y el circuit breaker.
+        Un 401 con un token de instalación se repite una vez con un token nuevo (el cacheado pudo revocarse).
+
+        Args:
+            method: Método HTTP
+            url: Ruta relativa a base_url
+            idempotent: Fuerza si la petición se puede repetir (por defecto, según el método)
+            **kwargs: Argumentos adicionales para httpx
+
+        Raises:
+            GitHubUnavailableException: Si el circuito hacia GitHub está abierto
+        """
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        policy = self._retry_policy
+        attempt = 0
+        reauthenticated = False
+        while True:
+            if self._circuit_breaker:
+                self._circuit_breaker.before_request()
+            try:
+                response = await self._send_once(method, url, **kwargs)
+            except httpx.TransportError as e:
+                self._record_failure()
+                if policy and attempt + 1 < policy.max_attempts and policy.can_retry_error(e, idempotent):
+                    delay = policy.backoff(attempt)
+                    logger.warning(f"Error de red en {method} {url} ({e!r}); reintento en {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+                raise
+            except BaseException:
+                # Cancelación u otro error sin respuesta de GitHub: no cuenta como éxito ni
+                # como fallo, pero la prueba del circuito semiabierto no puede quedar ocupada
+                if self._circuit_breaker:
+                    self._circuit_breaker.release_probe()
+                raise
+
+            if response.status_code >= 500:
+                self._record_failure()
+                if policy and attempt + 1 < policy.max_attempts and policy.can_retry_status(
+                        response.status_code, idempotent):
+                    delay = policy.backoff(attempt)
+                    logger.warning(f"GitHub respondió {response.status_code} en {method} {url}; reintento en {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+            elif self._circuit_breaker:
+                self._circuit_breaker.record_success()
+            if response.status_code == 401 and not reauthenticated:
+                headers = await self._reauthenticate(url, kwargs.get("headers"))
+                if headers is not None:
+                    logger.warning(f"GitHub rechazó el token de instalación en {method} {url}; se renueva y reintenta")
+                    kwargs["headers"] = headers
+                    reauthenticated = True
+                    continue
+            return response
+
+    async def _reauthenticate(self, url: str, headers: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        """
+        Descarta el token de instalación rechazado y devuelve las cabeceras con uno nuevo.
+
+        Returns:
+            Optional[Dict[str, str]]: Cabeceras renovadas, o None si la petición no usa un token de instalación
+        """
+        authorization = (headers or {}).get("Authorization", "")
+        match = _REPOSITORY_PATH.match(url)
+        installation_id = self._repository_installations.get(match.group(1)) if match else None
+        if not authorization.startswith("token ") or installation_id is None:
+            return None
+        self._token_cache.invalidate(installation_id, token=authorization[len("token "):])
+        token = await self._token_cache.get(installation_id)
+        return {**headers, "Authorization": f"token {token}"}
+
+    def _record_failure(self) -> None:
+        if self._circuit_breaker:
+            self._circuit_breaker.record_failure()
 
-    async def _get_auth_token(self) -> str:
+    async def _send_once(
+            self,
+            method: str,
+            url: str,
+            max_bytes: Optional[int] = None,
+            **kwargs
+    ) -> httpx.Response:
+        """
+        Envía la petición por el cliente compartido a través del planificador de rate limit.
+        Las peticiones rechazadas por rate limit se retienen y reenvían en lugar de fallar.
+        """
+        client = await self._get_client()
+        if self._rate_limiter is None:
+            return await self._transmit(client, method, url, max_bytes, **kwargs)
+
+        match = _REPOSITORY_PATH.match(url)
+        repository = match.group(1) if match else None
+        installation_key = str(self._repository_installations.get(repository, "app"))
+        write = method not in ("GET", "HEAD")
+
+        for attempt in range(self._rate_limit_retries + 1):
+            async with self._rate_limiter.slot(installation_key, repository, write):
+                response = await self._transmit(client, method, url, max_bytes, **kwargs)
+            if self._rate_limiter.observe(installation_key, response) is None:
+                break
+        return response
+
+    @staticmethod
+    async def _transmit(
+            client: httpx.AsyncClient,
+            method: str,
+            url: str,
+            max_bytes: Optional[int] = None,
+            **kwargs
+    ) -> httpx.Response:
+        """
+        Realiza la petición HTTP. Con `max_bytes` el cuerpo se descarga en streaming
+        y se aborta en cuanto supera el límite, sin cargarlo completo en memoria.
+
+        Raises:
+            ResponseTooLargeError: Si el cuerpo supera `max_bytes`
+        """
+        if max_bytes is None:
+            return await client.request(method, url, **kwargs)
+
+        request = client.build_request(method, url, **kwargs)
+        response = await client.send(request, stream=True)
+        try:
+            if response.status_code != 200:
+                await response.aread()
+                return response
+
+            content_length = response.headers.get("Content-Length")
+            if content_length and int(content_length) > max_bytes:
+                raise ResponseTooLargeError(max_bytes)
+
+            chunks, size = [], 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ResponseTooLargeError(max_bytes)
+                chunks.append(chunk)
+        finally:
+            await response.aclose()
+
+        # El cuerpo ya está decodificado: se descartan las cabeceras de codificación
+        headers = [
+            (name, value) for name, value in response.headers.multi_items()
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(response.status_code, headers=headers, content=b"".join(chunks), request=request)
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Contadores de la caché de respuestas condicionales."""
+        return self._response_cache.stats() if self._response_cache else {}
+
+    def rate_limit_stats(self) -> Dict[str, object]:
+        """Profundidad de cola y tiempos de espera del planificador de rate limit."""
+        return self._rate_limiter.stats() if self._rate_limiter else {}
+
+    def circuit_stats(self) -> Dict[str, object]:
+        """Estado del circuit breaker hacia GitHub."""
+        return self._circuit_breaker.stats() if self._circuit_breaker else {}
+
+    def _get_app_jwt(self) -> str:
+        """
+        Genera (o reutiliza) el JWT de la GitHub App.
+        El JWT es válido 10 minutos; se renueva un minuto antes de expirar.
+        """
         current_time = time.time()
-        if not self._installation_token or current_time >= self._token_expires_at:
-            jwt_token = jwt.encode(
+        if not self._app_jwt or current_time >= self._app_jwt_expires_at - 60:
+            self._app_jwt = jwt.encode(
                 {
-                    "iat": int(current_time),
+                    "iat": int(current_time - 60),  # Margen para desfases de reloj
                     "exp": int(current_time + 600),
                     "iss": self.app_id
                 },
                 self.private_key,
                 algorithm="RS256"
             )
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/app/installations",
-                    headers={"Authorization": f"Bearer {jwt_token}"}
-                )
-                response.raise_for_status()
-                installation_id = response.json()[0]["id"]
-                response = await client.post(
-                    f"{self.base_url}/app/installations/{installation_id}/access_tokens",
-                    headers={"Authorization": f"Bearer {jwt_token}"}
-                )
-                response.raise_for_status()
-                token_data = response.json()
-                self._installation_token = token_data["token"]
-                self._token_expires_at = time.time() + 3600  # Token válido por 1 hora
-        return self._installation_token
-
-    async def get_pull_request_diff(self, repository: str, pr_number: int) -> str:
-        token = await self._get_auth_token()
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/repos/{repository}/pulls/{pr_number}",
+            self._app_jwt_expires_at = current_time + 600
+        return self._app_jwt
+
+    async def _fetch_installation_token(self, installation_id: int) -> InstallationToken:
+        """
+        Emite un token nuevo para la instalación indicada.
+        Usa el campo `expires_at` que devuelve GitHub.
+        """
+        response = await self._request(
+            "POST",
+            f"/app/installations/{installation_id}/access_tokens",
+            headers={"Authorization": f"Bearer {self._get_app_jwt()}"},
+            idempotent=True  # Emitir otro token no tiene efectos secundarios
+        )
+        response.raise_for_status()
+        token_data = response.json()
+        expires_at = datetime.fromisoformat(token_data["expires_at"].replace("Z", "+00:00"))
+        return InstallationToken(token=token_data["token"], expires_at=expires_at.timestamp())
+
+    async def _get_installation_id(self, repository: str) -> int:
+        """
+        Resuelve la instalación de la App para un repositorio.
+        Solo se usa cuando el evento no trae `installation.id` (ejecuciones manuales o backfills).
+        """
+        installation_id = self._repository_installations.get(repository)
+        if installation_id is None:
+            response = await self._request(
+                "GET",
+                f"/repos/{repository}/installation",
+                headers={"Authorization": f"Bearer {self._get_app_jwt()}"}
+            )
+            response.raise_for_status()
+            installation_id = response.json()["id"]
+            self._repository_installations[repository] = installation_id
+        return installation_id
+
+    async def _get_auth_token(self, repository: str, installation_id: Optional[int] = None) -> str:
+        """
+        Obtiene el token de la instalación que corresponde al repositorio.
+
+        Args:
+            repository: Nombre completo del repositorio (owner/repo)
+            installation_id: ID de la instalación recibido en el webhook (opcional)
+        """
+        if installation_id is None:
+            installation_id = await self._get_installation_id(repository)
+        else:
+            self._repository_installations[repository] = installation_id
+        return await self._token_cache.get(installation_id)
+
+    async def iter_pull_request_files(
+            self,
+            repository: str,
+            pr_number: int,
+            installation_id: Optional[int] = None
+    ) -> AsyncIterator[FilePatch]:
+        """
+        Obtiene los cambios del PR como una secuencia de parches por archivo.
+
+        Primero descarga el `.diff` en streaming con un tope de bytes. Si se supera
+        el tope o GitHub rechaza el diff (406), recurre al endpoint paginado
+        `/pulls/{n}/files`, cuyas páginas se piden de forma concurrente.
+
+        Args:
+            repository: Nombre del repositorio
+            pr_number: Número del Pull Request
+            installation_id: ID de la instalación de la GitHub App (opcional)
+
+        Yields:
+            FilePatch: Parche de cada archivo modificado
+        """
+        token = await self._get_auth_token(repository, installation_id)
+        try:
+            response = await self._request(
+                "GET",
+                f"/repos/{repository}/pulls/{pr_number}",
                 headers={
                     "Authorization": f"token {token}",
                     "Accept": "application/vnd.github.v3.diff"
-                }
+                },
+                max_bytes=self.max_diff_bytes
             )
-            response.raise_for_status()
-            return response.text
+            if response.status_code != 406:
+                response.raise_for_status()
+                for patch in FilePatch.from_unified_diff(response.text):
+                    yield patch
+                return
+            logger.warning(f"GitHub rechazó el diff de {repository}#{pr_number} (406); se usa /files")
+        except ResponseTooLargeError:
+            logger.warning(
+                f"El diff de {repository}#{pr_number} supera {self.max_diff_bytes} bytes; se usa /files"
+            )
+
+        async for patch in self._iter_pull_request_files_api(repository, pr_number, installation_id):
+            yield patch
+
+    async def _iter_pull_request_files_api(
+            self,
+            repository: str,
+            pr_number: int,
+            installation_id: Optional[int] = None
+    ) -> AsyncIterator[FilePatch]:
+        """
+        Recorre `/pulls/{n}/files`. La primera página indica (cabecera Link) cuántas
+        hay; el resto se piden en paralelo con concurrencia acotada y se emiten en orden.
+        """
+        per_page = 100
+
+        async def fetch_page(page: int) -> httpx.Response:
+            async with semaphore:
+                token = await self._get_auth_token(repository, installation_id)
+                response = await self._request(
+                    "GET",
+                    f"/repos/{repository}/pulls/{pr_number}/files",
+                    headers={
+                        "Authorization": f"token {token}",
+                        "Accept": "application/vnd.github.v3+json"
+                    },
+                    params={"per_page": per_page, "page": page}
+                )
+                response.raise_for_status()
+                return response
+
+        semaphore = asyncio.Semaphore(self.files_page_concurrency)
+        first_page = await fetch_page(1)
+        for data in first_page.json():
+            yield FilePatch.from_github_file(data)
+
+        last_page = 1
+        last_link = first_page.links.get("last", {}).get("url")
+        if last_link:
+            last_page = int(httpx.URL(last_link).params.get("page", 1))
+
+        pending = [asyncio.ensure_future(fetch_page(page)) for page in range(2, last_page + 1)]
+        try:
+            for task in pending:
+                for data in (await task).json():
+                    yield FilePatch.from_github_file(data)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_compare_files(
+            self,
+            repository: str,
+            base_sha: str,
+            head_sha: str,
+            installation_id: Optional[int] = None
+    ) -> Optional[List[FilePatch]]:
+        """
+        Obtiene los parches por archivo entre dos commits (`/compare/{base}...{head}`).
+
+        Se usa para las revisiones incrementales. Devuelve None cuando el resultado
+        no sirve como incremento: si `head` no desciende de `base` (force-push o
+        rebase) o si la comparación está truncada por el límite de archivos de GitHub.
+
+        Args:
+            repository: Nombre del repositorio
+            base_sha: Último commit revisado
+            head_sha: Nuevo head del PR
+            installation_id: ID de la instalación de la GitHub App (opcional)
 
-    async def create_review_comments(self, repository: str, pr_number: int, review: Review, diff: str) -> None:
+        Returns:
+            Optional[List[FilePatch]]: Parches de los archivos modificados, o None
+        """
+        token = await self._get_auth_token(repository, installation_id)
+        response = await self._request(
+            "GET",
+            f"/repos/{repository}/compare/{base_sha}...{head_sha}",
+            headers={
+                "Authorization": f"token {token}",
+                "Accept": "application/vnd.github.v3+json"
+            }
+        )
+        if response.status_code == 404:
+            # El SHA anterior ya no existe (p. ej. tras un force-push y el GC de GitHub)
+            return None
+        response.raise_for_status()
+        data = response.json()
+
+        if data.get("status") not in ("ahead", "identical"):
+            logger.info(f"Comparación {base_sha[:7]}...{head_sha[:7]} con estado {data.get('status')}")
+            return None
+        files = data.get("files", [])
+        if len(files) >= _COMPARE_MAX_FILES:
+            return None
+        return [FilePatch.from_github_file(item) for item in files]
+
+    async def get_pull_request_diff(
+            self,
+            repository: str,
+            pr_number: int,
+            installation_id: Optional[int] = None
+    ) -> str:
+        """
+        Obtiene el diff del PR como texto unificado.
+        Usa `iter_pull_request_files`, por lo que respeta el tope de bytes y el respaldo por archivo.
+        """
+        patches = [
+            patch async for patch in self.iter_pull_request_files(repository, pr_number, installation_id)
+        ]
+        return "".join(patch.diff for patch in patches)
+
+    async def create_review_comments(
+            self,
+            repository: str,
+            pr_number: int,
+            review: Review,
+            diff: str,
+            installation_id: Optional[int] = None,
+            diff_index: Optional[DiffIndex] = None,
+            commit_id: Optional[str] = None
+    ) -> None:
         """
         Crea una revisión en GitHub con comentarios.
-        
+
         Args:
             repository: Nombre del repositorio
             pr_number: Número del Pull Request
             review: Objeto Review con los comentarios
             diff: Contenido del diff del PR
+            installation_id: ID de la instalación de la GitHub App (opcional)
+            diff_index: Índice del diff ya construido (opcional, se construye a partir de `diff` si falta)
+            commit_id: SHA del head del PR recibido en el webhook (opcional, se consulta a GitHub si falta)
         """
-        token = await self._get_auth_token()
+        token = await self._get_auth_token(repository, installation_id)
 
         # Determinar el evento según el score
         if review.score >= 90:
@@ -86,7 +590,7 @@ class GitHubService:
 
         # # Construir los comentarios con el formato correcto de GitHub
         # comments = []
-        
+
         # Construir el comentario general con el formato estructurado
         general_comment = (
             f"# Pull Request Analysis\n\n"
@@ -100,84 +604,114 @@ class GitHubService:
 
         # Agregar el comentario general como parte del body principal del review
         review_data = {
-            "commit_id": await self._get_latest_commit_sha(repository, pr_number),
+            "commit_id": commit_id or await self._get_head_sha(repository, pr_number, installation_id),
             "body": general_comment,
             "event": event,
             "comments": []
         }
-        # Luego agregar los comentarios específicos
-        for comment in review.comments:
-            if comment.file_path:  # Solo procesar comentarios con archivo asociado
-                try:
-                    # Obtener el diff específico del archivo
-                    patch_set = unidiff.PatchSet(diff.splitlines(keepends=True))
-                    target_file = None
-                    for patched_file in patch_set:
-                        if patched_file.path == comment.file_path:
-                            target_file = patched_file
-                            break
-
-                    if target_file:
-                        # Encontrar el hunk correcto y la posición
-                        for hunk in target_file:
-                            if hunk.target_start <= comment.line_number <= (hunk.target_start + hunk.target_length):
-                                comment_body = f"{comment.content}"
-                                
-                                if comment.suggestion:
-                                    comment_body += "\n\n```suggestion\n" + comment.suggestion + "\n```"
-                                
-                                comment_data = {
-                                    "path": comment.file_path,
-                                    "line": comment.line_number,
-                                    "body": comment_body
-                                }
-                                review_data["comments"].append(comment_data)
-                                break
-
-                except Exception as e:
-                    logger.error(f"Error procesando comentario para {comment.file_path}: {str(e)}")
-                    continue
+        # Luego agregar los comentarios específicos, validándolos en bloque contra
+        # un índice del diff construido una sola vez (fuera del event loop)
+        if diff_index is None:
+            try:
+                diff_index = await asyncio.to_thread(DiffIndex.from_diff, diff)
+            except unidiff.UnidiffParseError as e:
+                logger.error(f"No se pudo parsear el diff de {repository}#{pr_number}: {str(e)}")
+                diff_index = DiffIndex({})
 
+        located, rejected = diff_index.partition(
+            comment for comment in review.comments if comment.file_path  # Solo comentarios con archivo asociado
+        )
+        if rejected:
+            logger.warning(
+                f"Se descartan {len(rejected)} comentarios fuera del diff: "
+                + ", ".join(f"{c.file_path}:{c.line_number}" for c in rejected)
+            )
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/repos/{repository}/pulls/{pr_number}/reviews",
-                    headers={
-                        "Authorization": f"token {token}",
-                        "Accept": "application/vnd.github.v3+json"
-                    },
-                    json=review_data
-                )
-        
-                if not response.is_success:
-                    logger.error(f"GitHub API Error: {response.status_code}")
-                    logger.error(f"Response body: {response.text}")
-        
-                response.raise_for_status()
-        
-            except httpx.HTTPError as e:
-                logger.error(f"Error creating review: {str(e)}")
-                raise
+        for comment, position in located:
+            comment_body = f"{comment.content}"
 
-    async def _get_latest_commit_sha(self, repository: str, pr_number: int) -> str:
-        """
-        Obtiene el SHA del último commit en el PR.
-        """
-        token = await self._get_auth_token()
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/repos/{repository}/pulls/{pr_number}/commits",
+            # Las sugerencias solo aplican sobre el archivo nuevo
+            if comment.suggestion and position.side == "RIGHT":
+                comment_body += "\n\n```suggestion\n" + comment.suggestion + "\n```"
+
+            review_data["comments"].append({
+                "path": position.path,
+                "line": position.line,
+                "side": position.side,
+                "body": comment_body
+            })
+
+        try:
+            response = await self._request(
+                "POST",
+                f"/repos/{repository}/pulls/{pr_number}/reviews",
                 headers={
                     "Authorization": f"token {token}",
                     "Accept": "application/vnd.github.v3+json"
-                }
+                },
+                json=review_data
             )
+
+            if not response.is_success:
+                logger.error(f"GitHub API Error: {response.status_code}")
+                logger.error(f"Response body: {response.text}")
+
             response.raise_for_status()
-            commits = response.json()
-            return commits[-1]["sha"] if commits else None
 
-    async def create_metadata_comment(self, repository: str, pr_number: int, metadata: Dict[str, str]):
+        except httpx.HTTPError as e:
+            logger.error(f"Error creating review: {str(e)}")
+            raise
+
+    async def _get_head_sha(
+            self,
+            repository: str,
+            pr_number: int,
+            installation_id: Optional[int] = None
+    ) -> str:
+        """
+        Obtiene el SHA del head del PR desde la API.
+
+        Solo se usa como respaldo para ejecuciones manuales o backfills: en el flujo
+        normal el SHA llega en el webhook (`PullRequest.head_sha`). Se lee de
+        `pull_request.head.sha` en lugar del listado de commits, que está limitado
+        a 250 elementos.
+        """
+        pull_request = await self.get_pull_request(repository, pr_number, installation_id)
+        return pull_request["head"]["sha"]
+
+    async def get_pull_request(
+            self,
+            repository: str,
+            pr_number: int,
+            installation_id: Optional[int] = None
+    ) -> Dict:
+        """
+        Obtiene los datos del PR (título, cuerpo, head, ...) tal como los devuelve la API.
+
+        Args:
+            repository: Nombre del repositorio
+            pr_number: Número del Pull Request
+            installation_id: ID de la instalación de la GitHub App (opcional)
+        """
+        token = await self._get_auth_token(repository, installation_id)
+        response = await self._request(
+            "GET",
+            f"/repos/{repository}/pulls/{pr_number}",
+            headers={
+                "Authorization": f"token {token}",
+                "Accept": "application/vnd.github.v3+json"
+            }
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def create_metadata_comment(
+            self,
+            repository: str,
+            pr_number: int,
+            metadata: Dict[str, str],
+            installation_id: Optional[int] = None
+    ):
         """
         Crea un comentario en el PR con la metadata sugerida (título, descripción y etiquetas)
         para que el usuario pueda revisarla y, si lo desea, modificar el PR.
@@ -187,8 +721,9 @@ class GitHubService:
             pr_number: Número del Pull Request.
             metadata: Diccionario con keys 'suggested_title', 'suggested_description', y 'suggested_labels'
                       (este último es una cadena que se puede formatear, por ejemplo, separada por comas).
+            installation_id: ID de la instalación de la GitHub App (opcional).
         """
-        token = await self._get_auth_token()
+        token = await self._get_auth_token(repository, installation_id)
 
         # Construir el cuerpo del comentario con la metadata sugerida
         metadata_body = (
@@ -201,23 +736,24 @@ class GitHubService:
             "body": metadata_body
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/repos/{repository}/issues/{pr_number}/comments",
-                headers={"Authorization": f"token {token}"},
-                json=comment_data
-            )
-            print(f"Debug: Metadata comment response body:", response.text)
-            response.raise_for_status()
+        response = await self._request(
+            "POST",
+            f"/repos/{repository}/issues/{pr_number}/comments",
+            headers={"Authorization": f"token {token}"},
+            json=comment_data
+        )
+        print(f"Debug: Metadata comment response body:", response.text)
+        response.raise_for_status()
 
     async def update_pr(
             self,
             repository: str,
             pr_number: int,
             title: Optional[str] = None,
-            labels: Optional[List[str]] = None
+            labels: Optional[List[str]] = None,
+            installation_id: Optional[int] = None
     ) -> None:
-        token = await self._get_auth_token()
+        token = await self._get_auth_token(repository, installation_id)
         headers = {"Authorization": f"token {token}"}
         data = {}
         if title:
@@ -225,33 +761,51 @@ class GitHubService:
         if labels:
             data["labels"] = labels
         if data:
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    f"{self.base_url}/repos/{repository}/pulls/{pr_number}",
-                    headers=headers,
-                    json=data
-                )
-                response.raise_for_status()
+            response = await self._request(
+                "PATCH",
+                f"/repos/{repository}/pulls/{pr_number}",
+                headers=headers,
+                json=data
+            )
+            response.raise_for_status()
 
     async def create_check_run(
             self,
             repository: str,
-            head_sha: str,
+            head_sha: Optional[str],
             conclusion: str,
-            output: Dict
+            output: Dict,
+            installation_id: Optional[int] = None,
+            pr_number: Optional[int] = None
     ) -> None:
-        token = await self._get_auth_token()
+        """
+        Crea un check run sobre el head del PR.
+
+        Args:
+            repository: Nombre del repositorio
+            head_sha: SHA del head recibido en el webhook (`PullRequest.head_sha`)
+            conclusion: Conclusión del check (success, failure, neutral, ...)
+            output: Título, resumen y texto del check
+            installation_id: ID de la instalación de la GitHub App (opcional)
+            pr_number: Número del PR, para resolver el SHA si no se conoce (opcional)
+        """
+        if not head_sha:
+            if pr_number is None:
+                raise ValueError("Se requiere head_sha o pr_number para crear el check run")
+            head_sha = await self._get_head_sha(repository, pr_number, installation_id)
+
+        token = await self._get_auth_token(repository, installation_id)
         headers = {"Authorization": f"token {token}"}
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/repos/{repository}/check-runs",
-                headers=headers,
-                json={
-                    "name": "AI Code Review",
-                    "head_sha": head_sha,
-                    "status": "completed",
-                    "conclusion": conclusion,
-                    "output": output
-                }
-            )
-            response.raise_for_status()
+        response = await self._request(
+            "POST",
+            f"/repos/{repository}/check-runs",
+            headers=headers,
+            json={
+                "name": "AI Code Review",
+                "head_sha": head_sha,
+                "status": "completed",
+                "conclusion": conclusion,
+                "output": output
+            }
+        )
+        response.raise_for_status()
@@ -0,0 +1,208 @@
+# Este módulo implementa el planificador de peticiones a GitHub consciente del rate limit
+# Mantiene un token bucket por instalación, respeta X-RateLimit-* / Retry-After y serializa escrituras por repositorio
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class _TokenBucket:
+    """Token bucket con cola FIFO de espera."""
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float]):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._clock = clock
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, sleep: Callable[[float], Awaitable[None]]) -> None:
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class GitHubRateLimiter:
+    """
+    Planificador delante de todas las llamadas de GitHubService.
+
+    - Token bucket por instalación; cuando `X-RateLimit-Remaining` baja del 10%
+      del límite, el ritmo se ajusta para repartir lo que queda hasta `X-RateLimit-Reset`.
+    - Si el límite se agota o GitHub responde con `Retry-After` (rate limit secundario),
+      las peticiones de esa instalación se retienen hasta que se pueda volver a enviar.
+    - Las escrituras se serializan por repositorio con una separación mínima,
+      como recomienda GitHub para las peticiones que crean contenido.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = 10.0,
+        burst: int = 20,
+        write_interval: float = 1.0,
+        max_wait: float = 900.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        """
+        Args:
+            requests_per_second: Ritmo sostenido por instalación
+            burst: Ráfaga máxima por instalación
+            write_interval: Segundos mínimos entre escrituras al mismo repositorio
+            max_wait: Espera máxima aceptable por rate limit antes de devolver el error
+            clock: Fuente de tiempo en segundos epoch (inyectable para tests)
+            sleep: Función de espera (inyectable para tests)
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.write_interval = write_interval
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._write_locks: Dict[str, asyncio.Lock] = {}
+        self._last_write: Dict[str, float] = {}
+        self._remaining: Dict[str, int] = {}
+
+        # Métricas
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_wait_observed = 0.0
+        self.rate_limited = 0
+
+    def _bucket(self, installation_key: str) -> _TokenBucket:
+        bucket = self._buckets.get(installation_key)
+        if bucket is None:
+            bucket = _TokenBucket(self.requests_per_second, self.burst, self._clock)
+            self._buckets[installation_key] = bucket
+        return bucket
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        installation_key: str,
+        repository: Optional[str] = None,
+        write: bool = False
+    ) -> AsyncIterator[None]:
+        """
+        Reserva un turno para enviar una petición.
+
+        Args:
+            installation_key: Instalación a la que se imputa la petición
+            repository: Repositorio destino (para serializar escrituras)
+            write: Si la petición crea o modifica contenido
+        """
+        start = self._clock()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        write_lock = None
+        try:
+            blocked_until = self._blocked_until.get(installation_key, 0)
+            if blocked_until > start:
+                await self._sleep(blocked_until - start)
+            await self._bucket(installation_key).acquire(self._sleep)
+
+            if write and repository:
+                write_lock = self._write_locks.setdefault(repository, asyncio.Lock())
+                await write_lock.acquire()
+                elapsed = self._clock() - self._last_write.get(repository, 0)
+                if elapsed < self.write_interval:
+                    await self._sleep(self.write_interval - elapsed)
+        except BaseException:
+            if write_lock is not None and write_lock.locked():
+                write_lock.release()
+            raise
+        finally:
+            self.queue_depth -= 1
+
+        waited = self._clock() - start
+        self.requests += 1
+        self.total_wait += waited
+        self.max_wait_observed = max(self.max_wait_observed, waited)
+        try:
+            yield
+        finally:
+            if write_lock is not None:
+                self._last_write[repository] = self._clock()
+                write_lock.release()
+
+    def observe(self, installation_key: str, response: httpx.Response) -> Optional[float]:
+        """
+        Actualiza el estado a partir de las cabeceras de rate limit de la respuesta.
+
+        Returns:
+            Optional[float]: Segundos a esperar antes de reintentar si la petición fue
+            rechazada por rate limit, o None si la respuesta es definitiva
+        """
+        now = self._clock()
+        headers = response.headers
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        limit = headers.get("X-RateLimit-Limit")
+
+        if remaining is not None and reset is not None:
+            remaining, reset = int(remaining), float(reset)
+            self._remaining[installation_key] = remaining
+            if remaining == 0:
+                self._blocked_until[installation_key] = reset
+            elif limit is not None and remaining < int(limit) * 0.1:
+                # Repartir lo que queda hasta el reset en lugar de agotarlo en una ráfaga
+                window = max(reset - now, 1.0)
+                self._bucket(installation_key).rate = max(
+                    min(self.requests_per_second, remaining / window), 0.01
+                )
+            else:
+                self._bucket(installation_key).rate = self.requests_per_second
+
+        if response.status_code not in (403, 429):
+            return None
+
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            delay = float(retry_after)
+        elif remaining == 0 and reset is not None:
+            delay = reset - now
+        elif response.status_code == 429 or "rate limit" in response.text.lower():
+            delay = 60.0  # GitHub recomienda esperar al menos un minuto sin Retry-After
+        else:
+            return None  # 403 por permisos: no es un rate limit
+
+        delay = max(delay, 0.0)
+        if delay > self.max_wait:
+            logger.error(
+                f"Rate limit de GitHub para {installation_key}: espera de {delay:.0f}s supera el máximo"
+            )
+            return None
+
+        self.rate_limited += 1
+        self._blocked_until[installation_key] = max(self._blocked_until.get(installation_key, 0), now + delay)
+        logger.warning(f"Rate limit de GitHub para {installation_key}; reintentando en {delay:.1f}s")
+        return delay
+
+    def stats(self) -> Dict[str, object]:
+        """Métricas del planificador."""
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "avg_wait_seconds": self.total_wait / self.requests if self.requests else 0.0,
+            "max_wait_seconds": self.max_wait_observed,
+            "rate_limited": self.rate_limited,
+            "remaining": dict(self._remaining)
+        }
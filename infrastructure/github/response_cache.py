@@ -0,0 +1,225 @@
+# Este módulo implementa una caché de respuestas HTTP para peticiones condicionales a GitHub
+# Guarda ETag y Last-Modified por URL para revalidar con If-None-Match / If-Modified-Since
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+import httpx
+from infrastructure.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Cabeceras que se conservan con el cuerpo; Link es la paginación de los listados
+_STORED_HEADERS = ("Content-Type", "Link")
+
+
+@dataclass
+class CachedResponse:
+    """Respuesta almacenada junto con sus validadores."""
+    content: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> Optional["CachedResponse"]:
+        """Crea una entrada a partir de una respuesta, o None si no trae validadores."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return None
+        return cls(
+            content=response.content,
+            etag=etag,
+            last_modified=last_modified,
+            headers={
+                name: response.headers[name] for name in _STORED_HEADERS if name in response.headers
+            }
+        )
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Cabeceras para revalidar la entrada con GitHub."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        """Reconstruye una respuesta 200 con el cuerpo almacenado."""
+        return httpx.Response(200, content=self.content, headers=self.headers, request=request)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "content": base64.b64encode(self.content).decode(),
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "headers": self.headers
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "CachedResponse":
+        data = json.loads(raw)
+        return cls(
+            content=base64.b64decode(data["content"]),
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            headers=data.get("headers", {})
+        )
+
+
+class ResponseCache:
+    """
+    Caché de respuestas para peticiones condicionales.
+
+    Nivel en memoria: LRU acotado por número de entradas y por bytes.
+    Nivel en disco (opcional): un archivo por entrada dentro de `disk_path`,
+    que sobrevive a reinicios y se promueve a memoria al leerse.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_path: Optional[str] = None,
+        max_disk_entries: int = 10_000
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._disk_entries = 0
+        if disk_path:
+            os.makedirs(disk_path, exist_ok=True)
+            self._disk_entries = sum(1 for f in os.scandir(disk_path) if f.name.endswith(".json"))
+
+    @staticmethod
+    def make_key(url: str, accept: Optional[str], params: Optional[Any] = None) -> str:
+        """
+        Clave de la entrada: URL, parámetros de la query y tipo de contenido solicitado.
+        La URL incluye el repositorio, que pertenece a una sola instalación; los parámetros
+        distinguen, p. ej., las páginas de un mismo listado.
+        """
+        if params:
+            items = params.items() if hasattr(params, "items") else params
+            url = f"{url}?{urlencode(sorted((str(k), str(v)) for k, v in items))}"
+        return hashlib.sha256(f"{url}\n{accept or ''}".encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """Busca la entrada en memoria y, si no está, en disco."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if self.disk_path:
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None:
+                self._store_memory(key, entry)
+        return entry
+
+    async def put(self, key: str, entry: CachedResponse) -> None:
+        """Guarda la entrada en memoria y, si está configurado, en disco."""
+        self._store_memory(key, entry)
+        if self.disk_path:
+            await asyncio.to_thread(self._write_disk, key, entry)
+
+    def record_hit(self) -> None:
+        self.hits += 1
+
+    def record_miss(self) -> None:
+        self.misses += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Contadores de uso de la caché."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "evictions": self.evictions
+        }
+
+    def _store_memory(self, key: str, entry: CachedResponse) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous.content)
+        if len(entry.content) > self.max_bytes:
+            return  # Demasiado grande para memoria; solo queda en disco
+        self._entries[key] = entry
+        self._bytes += len(entry.content)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.content)
+            self.evictions += 1
+
+    def _disk_file(self, key: str) -> str:
+        return os.path.join(self.disk_path, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[CachedResponse]:
+        try:
+            with open(self._disk_file(key), "r", encoding="utf-8") as f:
+                return CachedResponse.from_json(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Entrada de caché corrupta {key}: {str(e)}")
+            return None
+
+    def _write_disk(self, key: str, entry: CachedResponse) -> None:
+        path = self._disk_file(key)
+        is_new = not os.path.exists(path)
+        tmp_file = path + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(entry.to_json())
+        os.replace(tmp_file, path)
+        if is_new:
+            self._disk_entries += 1
+            if self._disk_entries > self.max_disk_entries:
+                self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        """Elimina el 10% de entradas más antiguas cuando el disco supera su límite."""
+        files = [f for f in os.scandir(self.disk_path) if f.name.endswith(".json")]
+        files.sort(key=lambda f: f.stat().st_mtime)
+        removed = 0
+        for f in files[:max(1, len(files) // 10)]:
+            try:
+                os.remove(f.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        self._disk_entries = len(files) - removed
+
+
+def get_response_cache(settings: Settings) -> Optional[ResponseCache]:
+    """
+    Crea la caché de respuestas de GitHub según la configuración.
+
+    Args:
+        settings (Settings): Configuración de la aplicación
+
+    Returns:
+        Optional[ResponseCache]: Caché configurada, o None si está deshabilitada
+    """
+    if not settings.GITHUB_CACHE_ENABLED:
+        return None
+    return ResponseCache(
+        max_entries=settings.GITHUB_CACHE_MAX_ENTRIES,
+        max_bytes=settings.GITHUB_CACHE_MAX_BYTES,
+        disk_path=settings.GITHUB_CACHE_DIR
+    )
@@ -0,0 +1,131 @@
+# Este módulo define la política de reintentos y el circuit breaker para las llamadas a GitHub
+# Evita perder revisiones por errores transitorios y falla rápido cuando GitHub está degradado
+
+import logging
+import random
+import time
+from typing import Callable, Dict, FrozenSet
+import httpx
+from domain.exceptions import GitHubUnavailableException
+
+logger = logging.getLogger(__name__)
+
+# Métodos que se pueden repetir sin efectos secundarios
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"})
+
+# Errores en los que la petición nunca llegó a enviarse: se pueden reintentar con cualquier método
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class RetryPolicy:
+    """
+    Backoff exponencial con jitter completo.
+
+    Las peticiones idempotentes se reintentan ante errores de transporte y
+    respuestas 5xx transitorias. Las no idempotentes (POST) solo se reintentan
+    cuando se marcan explícitamente como idempotentes o cuando el error garantiza
+    que la petición no llegó a GitHub.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        retry_statuses: FrozenSet[int] = frozenset({500, 502, 503, 504}),
+        rng: Callable[[], float] = random.random
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+        self._rng = rng
+
+    def backoff(self, attempt: int) -> float:
+        """Espera antes del reintento `attempt` (0 = primer reintento)."""
+        return self._rng() * min(self.max_delay, self.base_delay * (2 ** attempt))
+
+    def can_retry_error(self, error: httpx.TransportError, idempotent: bool) -> bool:
+        return idempotent or isinstance(error, _NOT_SENT_ERRORS)
+
+    def can_retry_status(self, status_code: int, idempotent: bool) -> bool:
+        return idempotent and status_code in self.retry_statuses
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de tres estados (cerrado, abierto, semiabierto).
+
+    Tras `failure_threshold` fallos consecutivos el circuito se abre y las
+    peticiones fallan inmediatamente durante `reset_timeout` segundos; después
+    se deja pasar una petición de prueba que decide si se vuelve a cerrar.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+
+    def before_request(self) -> None:
+        """
+        Verifica si se puede enviar la petición.
+
+        Raises:
+            GitHubUnavailableException: Si el circuito está abierto
+        """
+        if self.state == self.CLOSED:
+            return
+        elapsed = self._clock() - self._opened_at
+        if self.state == self.OPEN and elapsed >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+        self.rejected += 1
+        raise GitHubUnavailableException(retry_after=max(self.reset_timeout - elapsed, 0.0))
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("Circuito hacia GitHub cerrado")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """
+        Libera la petición de prueba que terminó sin resultado (cancelada o con un
+        error que no es de GitHub), para que la siguiente pueda volver a probar.
+        """
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.error(f"Circuito hacia GitHub abierto tras {self.failures} fallos")
+            self.state = self.OPEN
+            self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected
+        }
@@ -0,0 +1,105 @@
+# Este módulo implementa la caché de tokens de instalación de la GitHub App
+# Mantiene un token por instalación, lo renueva antes de expirar y agrupa las renovaciones concurrentes
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class InstallationToken:
+    """Token de acceso de una instalación junto con su expiración real (epoch en segundos)."""
+    token: str
+    expires_at: float
+
+
+class InstallationTokenCache:
+    """
+    Caché de tokens de instalación indexada por installation_id.
+
+    - Usa el `expires_at` real devuelto por GitHub.
+    - Cuando el token entra en la ventana `refresh_margin` se sigue sirviendo
+      y se renueva en segundo plano, evitando el pico de latencia al expirar.
+    - Las renovaciones concurrentes de la misma instalación se agrupan en
+      una única petición (single-flight).
+    """
+
+    def __init__(
+        self,
+        fetch_token: Callable[[int], Awaitable[InstallationToken]],
+        refresh_margin: float = 300.0,
+        expiry_skew: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            fetch_token: Corrutina que emite un token nuevo para una instalación
+            refresh_margin: Segundos antes de expirar en que se lanza la renovación en segundo plano
+            expiry_skew: Segundos antes de expirar a partir de los cuales el token ya no se sirve
+            clock: Fuente de tiempo (inyectable para tests)
+        """
+        self._fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.expiry_skew = expiry_skew
+        self._clock = clock
+        self._tokens: Dict[int, InstallationToken] = {}
+        self._inflight: Dict[int, asyncio.Task] = {}
+
+    async def get(self, installation_id: int) -> str:
+        """
+        Obtiene un token válido para la instalación.
+
+        Args:
+            installation_id: ID de la instalación de la GitHub App
+
+        Returns:
+            str: Token de acceso de la instalación
+        """
+        cached = self._tokens.get(installation_id)
+        now = self._clock()
+        if cached and now < cached.expires_at - self.expiry_skew:
+            if now >= cached.expires_at - self.refresh_margin:
+                self._refresh(installation_id)  # Renovación proactiva sin bloquear
+            return cached.token
+
+        # Sin token o expirado: esperar a la renovación (compartida con otras peticiones)
+        token = await asyncio.shield(self._refresh(installation_id))
+        return token.token
+
+    def invalidate(self, installation_id: int, token: Optional[str] = None) -> None:
+        """
+        Descarta el token de una instalación (p. ej. tras un 401).
+
+        Args:
+            installation_id: ID de la instalación de la GitHub App
+            token: Token rechazado; si el cacheado ya es otro (otra petición lo renovó), se conserva
+        """
+        cached = self._tokens.get(installation_id)
+        if cached is not None and (token is None or cached.token == token):
+            del self._tokens[installation_id]
+
+    def _refresh(self, installation_id: int) -> asyncio.Task:
+        """Lanza la renovación del token o reutiliza la que ya está en curso."""
+        task = self._inflight.get(installation_id)
+        if task is None:
+            task = asyncio.ensure_future(self._do_refresh(installation_id))
+            self._inflight[installation_id] = task
+            task.add_done_callback(lambda t: self._on_refresh_done(installation_id, t))
+        return task
+
+    async def _do_refresh(self, installation_id: int) -> InstallationToken:
+        token = await self._fetch_token(installation_id)
+        self._tokens[installation_id] = token
+        logger.info(f"Token renovado para la instalación {installation_id}")
+        return token
+
+    def _on_refresh_done(self, installation_id: int, task: asyncio.Task) -> None:
+        self._inflight.pop(installation_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                f"Error renovando el token de la instalación {installation_id}: {task.exception()}"
+            )
@@ -0,0 +1,145 @@
+# Este módulo detecta entregas de webhook repetidas
+# GitHub reentrega los webhooks que no responden a tiempo y los operadores los reenvían a mano;
+# sin deduplicar, cada reentrega lanza otra revisión completa y comentarios duplicados
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+from domain.models.pull_request import PullRequest
+from infrastructure.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookDeduplicator:
+    """
+    Almacén acotado de entregas ya recibidas.
+
+    Una entrega es duplicada si se repite su `X-GitHub-Delivery` o su huella
+    (repositorio, PR, head SHA y acción) dentro de `ttl` segundos.
+    Nivel en memoria: LRU con TTL de hasta `max_entries` claves.
+    Nivel persistente (opcional): WebhookDeliveriesRepository, compartido entre réplicas.
+    """
+
+    def __init__(
+        self,
+        store=None,
+        ttl: float = 24 * 3600,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.store = store
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self.checked = 0
+        self.duplicates = 0
+
+    @staticmethod
+    def fingerprint(pull_request: PullRequest, action: Optional[str], label: Optional[str] = None) -> str:
+        """Huella del evento: dos entregas con la misma huella piden la misma revisión."""
+        parts = [pull_request.repository, str(pull_request.number), pull_request.head_sha or "", action or ""]
+        if label:
+            parts.append(label)
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    async def is_duplicate(
+        self,
+        delivery_id: Optional[str],
+        pull_request: PullRequest,
+        action: Optional[str],
+        label: Optional[str] = None
+    ) -> bool:
+        """
+        Comprueba la entrega y, si es nueva, la registra.
+
+        Args:
+            delivery_id: Cabecera X-GitHub-Delivery
+            pull_request: PR del evento
+            action: Acción del webhook
+            label: Label añadido (eventos `labeled`)
+
+        Returns:
+            bool: True si la entrega ya se había recibido
+        """
+        self.checked += 1
+        fingerprint = self.fingerprint(pull_request, action, label)
+        delivery_key = f"delivery:{delivery_id or fingerprint}"
+        fingerprint_key = f"fingerprint:{fingerprint}"
+
+        duplicate = self._contains(delivery_key) or self._contains(fingerprint_key)
+        if not duplicate and self.store is not None:
+            try:
+                duplicate = not await self.store.register(
+                    delivery_id or fingerprint, fingerprint, pull_request.repository,
+                    pull_request.number, pull_request.head_sha, action, self.ttl
+                )
+            except Exception as e:
+                # Ante un fallo de la base se prefiere revisar de más a perder el evento
+                logger.warning(f"No se pudo registrar la entrega {delivery_id}: {str(e)}")
+
+        self._remember(delivery_key)
+        self._remember(fingerprint_key)
+        if duplicate:
+            self.duplicates += 1
+            logger.info(
+                f"Entrega {delivery_id} duplicada para {pull_request.repository}#{pull_request.number}; se ignora"
+            )
+        return duplicate
+
+    async def forget(self, delivery_id: Optional[str], pull_request: PullRequest,
+                     action: Optional[str], label: Optional[str] = None) -> None:
+        """Olvida una entrega que no llegó a encolarse, para aceptar su reentrega."""
+        fingerprint = self.fingerprint(pull_request, action, label)
+        self._seen.pop(f"delivery:{delivery_id or fingerprint}", None)
+        self._seen.pop(f"fingerprint:{fingerprint}", None)
+        if self.store is not None:
+            try:
+                await self.store.delete(delivery_id or fingerprint)
+            except Exception as e:
+                logger.warning(f"No se pudo olvidar la entrega {delivery_id}: {str(e)}")
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            "hit_rate": self.duplicates / self.checked if self.checked else 0.0,
+            "entries": len(self._seen)
+        }
+
+    def _contains(self, key: str) -> bool:
+        seen_at = self._seen.get(key)
+        if seen_at is None:
+            return False
+        if self._clock() - seen_at >= self.ttl:
+            del self._seen[key]
+            return False
+        return True
+
+    def _remember(self, key: str) -> None:
+        if key in self._seen:
+            return  # Se conserva la primera vez que se vio: el TTL cuenta desde ahí
+        self._seen[key] = self._clock()
+        while len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+
+
+def get_webhook_deduplicator(settings: Settings, store=None) -> WebhookDeduplicator:
+    """
+    Crea el deduplicador de webhooks según la configuración.
+
+    Args:
+        settings (Settings): Configuración de la aplicación
+        store: Repositorio de entregas; solo se usa si WEBHOOK_DEDUPE_PERSISTENT está activo
+
+    Returns:
+        WebhookDeduplicator: Deduplicador configurado
+    """
+    return WebhookDeduplicator(
+        store=store if settings.WEBHOOK_DEDUPE_PERSISTENT else None,
+        ttl=settings.WEBHOOK_DEDUPE_TTL,
+        max_entries=settings.WEBHOOK_DEDUPE_MAX_ENTRIES
+    )
@@ -0,0 +1,202 @@
+# Este módulo consume la cola persistente de revisiones (SQLite o Supabase)
+# Permite escalar los workers en varias réplicas y no perder webhooks si un proceso muere
+
+import asyncio
+import logging
+import os
+import socket
+from typing import Dict, Optional, Set
+from application.use_cases.analyze_pull_request import AnalyzePullRequestUseCase
+from domain.exceptions import DomainException
+from domain.models.review_job import ReviewJobRecord
+from infrastructure.workers.review_worker_pool import ReviewJob
+
+logger = logging.getLogger(__name__)
+
+# Prioridad por acción: una apertura se revisa antes que un push o un cambio de labels
+_ACTION_PRIORITY = {"opened": 10, "reopened": 10, "synchronize": 5}
+
+
+class DurableReviewWorker:
+    """
+    Worker de la cola persistente de revisiones.
+
+    - Reclama trabajos con un lease de `lease_seconds` y lo renueva cada tercio
+      de ese tiempo mientras la revisión sigue en curso; si el proceso muere, el
+      lease expira y otra réplica retoma el trabajo.
+    - Un intento fallido se reprograma con backoff exponencial
+      (`retry_base_delay * 2^(intentos-1)`); sin intentos restantes pasa a 'dead'.
+      Si falló después de publicar la revisión en GitHub no se reintenta (se
+      duplicarían los comentarios) y pasa directamente a 'dead'.
+    - Si la renovación falla porque el trabajo fue sustituido por un push más
+      reciente del mismo PR, la revisión se cancela.
+
+    `queue` es un ReviewJobsRepository (Supabase) o un SQLiteJobQueue.
+    """
+
+    def __init__(
+        self,
+        queue,
+        use_case: AnalyzePullRequestUseCase,
+        concurrency: int = 4,
+        lease_seconds: float = 300.0,
+        poll_interval: float = 2.0,
+        max_attempts: int = 5,
+        retry_base_delay: float = 30.0,
+        debounce_seconds: float = 5.0,
+        drain_timeout: float = 60.0,
+        worker_id: Optional[str] = None
+    ):
+        self.queue = queue
+        self._use_case = use_case
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.debounce_seconds = debounce_seconds
+        self.drain_timeout = drain_timeout
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self._loop_task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        self._wake = asyncio.Event()
+        self._stopping = False
+
+        # Métricas
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+        self.dead = 0
+        self.superseded = 0
+
+    async def start(self) -> None:
+        if self._loop_task is not None:
+            return
+        self._stopping = False
+        self._loop_task = asyncio.create_task(self._claim_loop(), name=f"review-jobs-{self.worker_id}")
+        logger.info(f"Worker {self.worker_id} de la cola persistente iniciado ({self.concurrency} revisiones)")
+
+    async def submit(self, job: ReviewJob) -> None:
+        """
+        Persiste la revisión. Espera `debounce_seconds` antes de ser reclamable
+        y sustituye a las del mismo PR que aún esperan; un `synchronize` también
+        sustituye a la que está en ejecución.
+        """
+        pull_request = job.pull_request
+        await self.queue.enqueue(
+            repository=pull_request.repository,
+            pr_number=pull_request.number,
+            action=job.action,
+            payload=pull_request.model_dump(mode="json"),
+            delivery_id=job.delivery_id,
+            priority=_ACTION_PRIORITY.get(job.action, 0),
+            max_attempts=self.max_attempts,
+            delay_seconds=self.debounce_seconds,
+            supersede_running=job.action == "synchronize"
+        )
+        self.submitted += 1
+        self._wake.set()
+
+    async def shutdown(self) -> None:
+        """Deja de reclamar trabajos y espera a las revisiones en curso hasta `drain_timeout`."""
+        if self._loop_task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        await asyncio.gather(self._loop_task, return_exceptions=True)
+        self._loop_task = None
+        if self._running:
+            logger.info(f"Esperando a {len(self._running)} revisiones antes de detener el worker")
+            _, pending = await asyncio.wait(set(self._running), timeout=self.drain_timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        logger.info(f"Worker {self.worker_id} de la cola persistente detenido")
+
+    async def _claim_loop(self) -> None:
+        while not self._stopping:
+            free = self.concurrency - len(self._running)
+            if free <= 0:
+                # También se despierta con shutdown(), para no esperar a que termine una revisión
+                self._wake.clear()
+                waker = asyncio.ensure_future(self._wake.wait())
+                await asyncio.wait(self._running | {waker}, return_when=asyncio.FIRST_COMPLETED)
+                waker.cancel()
+                continue
+            try:
+                jobs = await self.queue.claim(self.worker_id, free, self.lease_seconds)
+            except Exception as e:
+                logger.error(f"Error reclamando trabajos de revisión: {str(e)}")
+                jobs = []
+            for job in jobs:
+                task = asyncio.create_task(self._process(job))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+            if not jobs:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _process(self, job: ReviewJobRecord) -> None:
+        label = f"{job.repository}#{job.pr_number} (trabajo {job.id}, intento {job.attempts})"
+        execution = asyncio.ensure_future(self._use_case.execute(job.pull_request(), action=job.action))
+        superseded = asyncio.Event()
+        keeper = asyncio.create_task(self._keep_lease(job, execution, superseded))
+        try:
+            await execution
+            self.processed += 1
+            await self.queue.complete(job.id, self.worker_id)
+        except asyncio.CancelledError:
+            if superseded.is_set():
+                self.superseded += 1
+                logger.info(f"Revisión {label} sustituida por un push más reciente")
+                return
+            # El worker se detiene sin terminar: el trabajo vuelve a la cola
+            await self.queue.fail(job.id, self.worker_id, "Worker detenido", 0.0)
+            raise
+        except Exception as e:
+            self.failed += 1
+            if isinstance(e, DomainException) and e.details.get("posted"):
+                self.dead += 1
+                logger.error(f"Revisión {label} fallida después de publicarse en GitHub; no se reintenta: {str(e)}")
+                await self.queue.fail(job.id, self.worker_id, str(e), None)
+            elif job.attempts >= job.max_attempts:
+                self.dead += 1
+                logger.error(f"Revisión {label} fallida sin intentos restantes: {str(e)}")
+                await self.queue.fail(job.id, self.worker_id, str(e), None)
+            else:
+                self.retried += 1
+                delay = self.retry_base_delay * 2 ** (job.attempts - 1)
+                logger.warning(f"Revisión {label} fallida; se reintenta en {delay:.0f}s: {str(e)}")
+                await self.queue.fail(job.id, self.worker_id, str(e), delay)
+        finally:
+            keeper.cancel()
+
+    async def _keep_lease(self, job: ReviewJobRecord, execution: asyncio.Future, superseded: asyncio.Event) -> None:
+        while not execution.done():
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                owned = await self.queue.renew(job.id, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"No se pudo renovar el lease del trabajo {job.id}: {str(e)}")
+                continue
+            if not owned:
+                superseded.set()
+                execution.cancel()
+                return
+
+    def stats(self) -> Dict[str, int]:
+        """Métricas del worker; los trabajos por estado se consultan en la cola."""
+        return {
+            "worker_id": self.worker_id,
+            "in_flight": len(self._running),
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dead": self.dead,
+            "superseded": self.superseded
+        }
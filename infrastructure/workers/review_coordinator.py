@@ -0,0 +1,118 @@
+# Este módulo coordina las revisiones por Pull Request antes de pasarlas al pool de workers
+# Evita analizar varias veces el mismo PR cuando llegan varios pushes seguidos
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+from domain.exceptions import ReviewQueueFullException
+from infrastructure.workers.review_worker_pool import ReviewJob, ReviewWorkerPool
+
+logger = logging.getLogger(__name__)
+
+PullRequestKey = Tuple[str, int]
+
+
+class ReviewCoordinator:
+    """
+    Coordinador por PR, identificado por (repositorio, número).
+
+    - Debounce: los eventos de un mismo PR que llegan dentro de `debounce_seconds`
+      se agrupan en una sola revisión, la del evento más reciente. Si alguno era
+      un `synchronize`, la revisión agrupada lo sigue siendo (incremental).
+    - Sustitución: un `synchronize` nuevo cancela la revisión del mismo PR que esté
+      en cola o en curso; su análisis ya no corresponde al último commit y al
+      cancelarse se abortan también sus peticiones al LLM.
+    """
+
+    def __init__(self, pool: ReviewWorkerPool, debounce_seconds: float = 5.0):
+        self._pool = pool
+        self.debounce_seconds = debounce_seconds
+        self._pending: Dict[PullRequestKey, ReviewJob] = {}
+        self._timers: Dict[PullRequestKey, asyncio.Task] = {}
+        self._active: Dict[PullRequestKey, ReviewJob] = {}
+
+        # Métricas
+        self.submitted = 0
+        self.coalesced = 0
+        self.superseded = 0
+
+    async def start(self) -> None:
+        await self._pool.start()
+
+    async def shutdown(self) -> None:
+        """Encola los eventos en espera de debounce y drena el pool."""
+        await self.flush()
+        await self._pool.shutdown()
+
+    async def submit(self, job: ReviewJob) -> None:
+        """
+        Registra un evento de revisión. La revisión se encola en el pool cuando
+        pasa la ventana de debounce sin nuevos eventos del mismo PR.
+
+        Raises:
+            ReviewQueueFullException: Si el pool no admite más trabajos
+        """
+        if self._pool.is_full():
+            raise ReviewQueueFullException(f"Cola de revisiones llena ({self._pool.max_queue_size})")
+
+        key = job.key
+        self.submitted += 1
+        if key in self._pending:
+            self.coalesced += 1
+            if self._pending[key].action == "synchronize":
+                # Un labeled/edited posterior no convierte la revisión incremental en completa
+                job.action = "synchronize"
+            logger.info(f"Evento de {key[0]}#{key[1]} agrupado con el pendiente")
+        self._pending[key] = job
+
+        active = self._active.get(key)
+        if active is not None and not active.done and job.action == "synchronize":
+            active.cancel()
+            self.superseded += 1
+            logger.info(f"Revisión en curso de {key[0]}#{key[1]} sustituida por un push más reciente")
+
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        if self.debounce_seconds <= 0:
+            await self._release(key)
+        else:
+            self._timers[key] = asyncio.create_task(self._release_after(key, self.debounce_seconds))
+
+    async def _release_after(self, key: PullRequestKey, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timers.pop(key, None)
+        try:
+            await self._release(key)
+        except ReviewQueueFullException as e:
+            logger.error(f"No se pudo encolar la revisión de {key[0]}#{key[1]}: {e.message}")
+
+    async def _release(self, key: PullRequestKey) -> None:
+        job: Optional[ReviewJob] = self._pending.pop(key, None)
+        if job is None:
+            return
+        await self._pool.enqueue(job)
+        # Se olvidan las revisiones terminadas para no acumular PRs cerrados
+        self._active = {k: j for k, j in self._active.items() if not j.done}
+        self._active[key] = job
+
+    async def flush(self) -> None:
+        """Encola de inmediato los eventos que esperan su ventana de debounce (p. ej. al apagar)."""
+        for key, timer in list(self._timers.items()):
+            timer.cancel()
+            self._timers.pop(key, None)
+            try:
+                await self._release(key)
+            except ReviewQueueFullException as e:
+                logger.error(f"No se pudo encolar la revisión de {key[0]}#{key[1]}: {e.message}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del coordinador."""
+        return {
+            "debounce_seconds": self.debounce_seconds,
+            "pending": len(self._pending),
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "superseded": self.superseded,
+            "workers": self._pool.stats()
+        }
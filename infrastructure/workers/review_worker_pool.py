@@ -0,0 +1,182 @@
+# Este módulo implementa el pool de workers que ejecuta las revisiones en segundo plano
+# Permite responder al webhook de GitHub en milisegundos y analizar el PR fuera de la petición HTTP
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from application.use_cases.analyze_pull_request import AnalyzePullRequestUseCase
+from domain.exceptions import ReviewQueueFullException
+from domain.models.pull_request import PullRequest
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReviewJob:
+    """Revisión pendiente de ejecutar."""
+    pull_request: PullRequest
+    action: Optional[str] = None
+    delivery_id: Optional[str] = None  # X-GitHub-Delivery del webhook
+    enqueued_at: float = field(default_factory=time.monotonic)
+    cancelled: bool = False
+    done: bool = False
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def key(self) -> Tuple[str, int]:
+        """Identifica el PR: (repositorio, número)."""
+        return self.pull_request.repository, self.pull_request.number
+
+    def cancel(self) -> None:
+        """
+        Cancela la revisión. Si aún está en cola no llega a ejecutarse; si está en
+        curso se cancela su tarea, lo que aborta también las peticiones al LLM pendientes.
+        """
+        self.cancelled = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+
+class ReviewWorkerPool:
+    """
+    Cola en memoria con un número fijo de workers asyncio que ejecutan
+    `AnalyzePullRequestUseCase`.
+
+    Al apagarse deja de aceptar trabajos, espera a que terminen las revisiones
+    en curso y las encoladas (hasta `drain_timeout`) y cancela el resto.
+    """
+
+    def __init__(
+        self,
+        use_case: AnalyzePullRequestUseCase,
+        workers: int = 4,
+        max_queue_size: int = 1000,
+        drain_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._use_case = use_case
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.drain_timeout = drain_timeout
+        self._clock = clock
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._accepting = False
+
+        # Métricas
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+        self.max_run = 0.0
+
+    async def start(self) -> None:
+        """Arranca los workers. Llamar varias veces no crea workers adicionales."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._accepting = True
+        self._tasks = [
+            asyncio.create_task(self._worker(index), name=f"review-worker-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"Pool de revisiones iniciado con {self.workers} workers")
+
+    async def enqueue(self, job: ReviewJob) -> None:
+        """
+        Encola una revisión sin esperar a que se ejecute.
+
+        Raises:
+            ReviewQueueFullException: Si el pool está detenido o la cola está llena
+        """
+        if not self._accepting:
+            raise ReviewQueueFullException("El pool de revisiones no está aceptando trabajos")
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise ReviewQueueFullException(f"Cola de revisiones llena ({self.max_queue_size})")
+
+    async def shutdown(self) -> None:
+        """Deja de aceptar trabajos y drena la cola antes de detener los workers."""
+        if not self._tasks:
+            return
+        self._accepting = False
+        pending = self._queue.qsize() + self.in_flight
+        if pending:
+            logger.info(f"Esperando a {pending} revisiones antes de detener el pool")
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Tiempo de drenado agotado; se cancelan {self._queue.qsize() + self.in_flight} revisiones"
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Pool de revisiones detenido")
+
+    def is_full(self) -> bool:
+        return self._queue is not None and self._queue.full()
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            if job.cancelled:
+                # Sustituida por un evento más reciente antes de empezar
+                self.cancelled += 1
+                job.done = True
+                self._queue.task_done()
+                continue
+
+            started = self._clock()
+            waited = started - job.enqueued_at
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self.in_flight += 1
+            job._task = asyncio.ensure_future(self._use_case.execute(job.pull_request, action=job.action))
+            try:
+                await job._task
+                self.processed += 1
+            except asyncio.CancelledError:
+                if not job.cancelled:
+                    raise  # Es el worker el que se está deteniendo
+                self.cancelled += 1
+                logger.info(
+                    f"Revisión de {job.pull_request.repository}#{job.pull_request.number} cancelada "
+                    f"por un evento más reciente"
+                )
+            except Exception as e:
+                self.processed += 1
+                self.failed += 1
+                logger.error(
+                    f"Error en la revisión de {job.pull_request.repository}#{job.pull_request.number}: {str(e)}"
+                )
+            finally:
+                elapsed = self._clock() - started
+                job.done = True
+                self.in_flight -= 1
+                self.total_run += elapsed
+                self.max_run = max(self.max_run, elapsed)
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, float]:
+        """Métricas del pool."""
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "avg_wait_seconds": self.total_wait / self.processed if self.processed else 0.0,
+            "max_wait_seconds": self.max_wait,
+            "avg_run_seconds": self.total_run / (self.processed + self.cancelled)
+            if self.processed + self.cancelled else 0.0,
+            "max_run_seconds": self.max_run
+        }
@@ -0,0 +1,212 @@
+# Este módulo implementa la cola persistente de revisiones sobre SQLite para ejecuciones locales
+# Tiene la misma interfaz que ReviewJobsRepository (Supabase) y sobrevive a reinicios del proceso
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from domain.models.review_job import ReviewJobRecord, ReviewJobStatus
+
+_COLUMNS = (
+    "id, repository, pr_number, action, delivery_id, payload, status, priority, attempts, "
+    "max_attempts, run_after, lease_until, locked_by, last_error, created_at"
+)
+
+
+class SQLiteJobQueue:
+    """
+    Cola de trabajos de revisión en un archivo SQLite.
+
+    SQLite no tiene SKIP LOCKED: el reclamo se hace en una transacción
+    `BEGIN IMMEDIATE`, que serializa a los escritores, de modo que dos procesos
+    que comparten el archivo nunca reclaman el mismo trabajo.
+    Las fechas se guardan como segundos desde epoch.
+    """
+
+    def __init__(self, db_path: str, clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self._clock = clock
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS review_jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, repository TEXT NOT NULL, pr_number INTEGER NOT NULL, "
+            "action TEXT, delivery_id TEXT, payload TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'queued', "
+            "priority INTEGER NOT NULL DEFAULT 0, attempts INTEGER NOT NULL DEFAULT 0, "
+            "max_attempts INTEGER NOT NULL DEFAULT 5, run_after REAL NOT NULL, lease_until REAL, "
+            "locked_by TEXT, last_error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS review_jobs_claim ON review_jobs (status, priority DESC, run_after, id)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS review_jobs_pr ON review_jobs (repository, pr_number, status)")
+
+    async def enqueue(
+        self,
+        repository: str,
+        pr_number: int,
+        action: Optional[str],
+        payload: Dict[str, Any],
+        delivery_id: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: int = 5,
+        delay_seconds: float = 0.0,
+        supersede_running: bool = False
+    ) -> int:
+        return await asyncio.to_thread(
+            self._enqueue, repository, pr_number, action, json.dumps(payload), delivery_id,
+            priority, max_attempts, delay_seconds, supersede_running
+        )
+
+    async def claim(self, worker_id: str, limit: int, lease_seconds: float) -> List[ReviewJobRecord]:
+        return await asyncio.to_thread(self._claim, worker_id, limit, lease_seconds)
+
+    async def renew(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        return await asyncio.to_thread(
+            self._update,
+            "UPDATE review_jobs SET lease_until = ?, updated_at = ? "
+            "WHERE id = ? AND locked_by = ? AND status = 'running'",
+            (self._clock() + lease_seconds, self._clock(), job_id, worker_id)
+        )
+
+    async def complete(self, job_id: int, worker_id: str) -> None:
+        await asyncio.to_thread(
+            self._update,
+            "UPDATE review_jobs SET status = 'completed', lease_until = NULL, updated_at = ? "
+            "WHERE id = ? AND locked_by = ? AND status = 'running'",
+            (self._clock(), job_id, worker_id)
+        )
+
+    async def fail(self, job_id: int, worker_id: str, error: str, retry_delay: Optional[float]) -> None:
+        now = self._clock()
+        status = ReviewJobStatus.DEAD.value if retry_delay is None else ReviewJobStatus.QUEUED.value
+        await asyncio.to_thread(
+            self._update,
+            "UPDATE review_jobs SET status = ?, run_after = ?, lease_until = NULL, locked_by = NULL, "
+            "last_error = ?, updated_at = ? WHERE id = ? AND locked_by = ? AND status = 'running'",
+            (status, now + (retry_delay or 0), error, now, job_id, worker_id)
+        )
+
+    async def list_by_status(self, status: ReviewJobStatus, limit: int = 50) -> List[ReviewJobRecord]:
+        return await asyncio.to_thread(self._list, status.value, limit)
+
+    async def retry(self, job_id: int) -> bool:
+        now = self._clock()
+        return await asyncio.to_thread(
+            self._update,
+            "UPDATE review_jobs SET status = 'queued', attempts = 0, run_after = ?, updated_at = ? "
+            "WHERE id = ? AND status = 'dead'",
+            (now, now, job_id)
+        )
+
+    async def count_by_status(self) -> Dict[str, int]:
+        return await asyncio.to_thread(self._count)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _enqueue(self, repository, pr_number, action, payload, delivery_id, priority, max_attempts,
+                 delay_seconds, supersede_running) -> int:
+        now = self._clock()
+        statuses = "('queued', 'running')" if supersede_running else "('queued')"
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    f"UPDATE review_jobs SET status = 'superseded', lease_until = NULL, updated_at = ? "
+                    f"WHERE repository = ? AND pr_number = ? AND status IN {statuses}",
+                    (now, repository, pr_number)
+                )
+                cursor = self._db.execute(
+                    "INSERT INTO review_jobs (repository, pr_number, action, delivery_id, payload, priority, "
+                    "max_attempts, run_after, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (repository, pr_number, action, delivery_id, payload, priority, max_attempts,
+                     now + delay_seconds, now, now)
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            return cursor.lastrowid
+
+    def _claim(self, worker_id: str, limit: int, lease_seconds: float) -> List[ReviewJobRecord]:
+        now = self._clock()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                # Los leases expirados sin intentos restantes pasan a 'dead'
+                self._db.execute(
+                    "UPDATE review_jobs SET status = 'dead', lease_until = NULL, locked_by = NULL, "
+                    "last_error = COALESCE(last_error, 'Lease expirado'), updated_at = ? "
+                    "WHERE status = 'running' AND lease_until < ? AND attempts >= max_attempts",
+                    (now, now)
+                )
+                ids = [row[0] for row in self._db.execute(
+                    "SELECT id FROM review_jobs "
+                    "WHERE (status = 'queued' AND run_after <= ?) OR (status = 'running' AND lease_until < ?) "
+                    "ORDER BY priority DESC, run_after, id LIMIT ?",
+                    (now, now, limit)
+                )]
+                if ids:
+                    placeholders = ",".join("?" * len(ids))
+                    self._db.execute(
+                        f"UPDATE review_jobs SET status = 'running', attempts = attempts + 1, locked_by = ?, "
+                        f"lease_until = ?, updated_at = ? WHERE id IN ({placeholders})",
+                        (worker_id, now + lease_seconds, now, *ids)
+                    )
+                    rows = self._db.execute(
+                        f"SELECT {_COLUMNS} FROM review_jobs WHERE id IN ({placeholders}) "
+                        f"ORDER BY priority DESC, run_after, id",
+                        ids
+                    ).fetchall()
+                else:
+                    rows = []
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return [self._to_record(row) for row in rows]
+
+    def _update(self, sql: str, params: tuple) -> bool:
+        with self._lock:
+            return self._db.execute(sql, params).rowcount > 0
+
+    def _list(self, status: str, limit: int) -> List[ReviewJobRecord]:
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} FROM review_jobs WHERE status = ? ORDER BY updated_at DESC LIMIT ?",
+                (status, limit)
+            ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def _count(self) -> Dict[str, int]:
+        counts = {status: 0 for status in ("queued", "running", "dead")}
+        with self._lock:
+            for status, count in self._db.execute(
+                    "SELECT status, COUNT(*) FROM review_jobs "
+                    "WHERE status IN ('queued', 'running', 'dead') GROUP BY status"):
+                counts[status] = count
+        return counts
+
+    @staticmethod
+    def _to_record(row: tuple) -> ReviewJobRecord:
+        def to_datetime(value: Optional[float]) -> Optional[datetime]:
+            return datetime.fromtimestamp(value, tz=timezone.utc) if value is not None else None
+
+        (job_id, repository, pr_number, action, delivery_id, payload, status, priority, attempts,
+         max_attempts, run_after, lease_until, locked_by, last_error, created_at) = row
+        return ReviewJobRecord(
+            id=job_id, repository=repository, pr_number=pr_number, action=action, delivery_id=delivery_id,
+            payload=json.loads(payload), status=status, priority=priority, attempts=attempts,
+            max_attempts=max_attempts, run_after=to_datetime(run_after), lease_until=to_datetime(lease_until),
+            locked_by=locked_by, last_error=last_error, created_at=to_datetime(created_at)
+        )
@@ -0,0 +1,46 @@
+import logging
+
+from fastapi import APIRouter, HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/config-cache",
+    tags=["config-cache"],
+    responses={404: {"description": "No se encontró el recurso"}}
+)
+
+
+def invalidate_config_cache(request: Request, reason: str) -> None:
+    """Invalida la caché de configuración tras una escritura de prompts, reglas o guías."""
+    cache = request.app.container.config_cache()
+    if cache is not None:
+        cache.invalidate(reason)
+
+
+def _get_cache(request: Request):
+    cache = request.app.container.config_cache()
+    if cache is None:
+        raise HTTPException(status_code=404, detail="La caché de configuración no está habilitada")
+    return cache
+
+
+@router.get(
+    "/",
+    summary="Ver la configuración cacheada",
+    description="Retorna la versión de la configuración y la instantánea de prompts, reglas y guías "
+                "que usan las revisiones, junto con su antigüedad."
+)
+async def get_config_cache_snapshot(request: Request):
+    cache = _get_cache(request)
+    return {**cache.snapshot(), "stats": cache.stats()}
+
+
+@router.post(
+    "/invalidate",
+    summary="Invalidar la configuración cacheada",
+    description="Descarta la instantánea; útil tras editar la configuración directamente en Supabase."
+)
+async def invalidate_config(request: Request):
+    version = _get_cache(request).invalidate("invalidación manual")
+    return {"message": "Configuration cache invalidated", "version": version}
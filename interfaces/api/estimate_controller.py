@@ -0,0 +1,39 @@
+import logging
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request
+from typing import Optional
+from application.dto.ai_analysis_result_dto import ReviewCostEstimate
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/estimates",
+    tags=["estimates"],
+    responses={404: {"description": "No se encontró el recurso"}}
+)
+
+@router.get(
+    "/{owner}/{repo}/pulls/{pr_number}",
+    response_model=ReviewCostEstimate,
+    summary="Estimar el coste de revisar un PR",
+    description="Calcula, sin llamar al modelo, los tokens, el coste y la latencia esperados del análisis "
+                "de código de un Pull Request, incluyendo los hunks que se recortarían por presupuesto."
+)
+async def estimate_review(
+        request: Request,
+        owner: str,
+        repo: str,
+        pr_number: int,
+        installation_id: Optional[int] = None
+):
+    """
+    Dry-run del análisis de código de un Pull Request.
+    """
+    use_case = request.app.container.estimate_review_cost_use_case()
+    try:
+        return await use_case.execute(f"{owner}/{repo}", pr_number, installation_id=installation_id)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            raise HTTPException(status_code=404, detail="Pull Request no encontrado")
+        raise HTTPException(status_code=502, detail=f"Error de GitHub: {e.response.status_code}")
@@ -3,6 +3,7 @@ import logging
 from fastapi import APIRouter, HTTPException, status, Request
 from typing import List
 from domain.models.pr_guidelines import PRTitleGuideline, PRDescriptionTemplate, PRLabel
+from interfaces.api.config_cache_controller import invalidate_config_cache
 
 logger = logging.getLogger(__name__)
 
@@ -18,28 +19,43 @@ router = APIRouter(
     summary="Listar guías de título activas",
     description="Obtiene la lista de todas las guías de título que se encuentran activas en el sistema."
 )
-def list_title_guidelines(request: Request):
+async def list_title_guidelines(request: Request):
     """
     Obtiene la lista de todas las guías de título que se encuentran activas en el sistema.
     """
     repo = request.app.container.pr_guidelines_repository()
     try:
-        return repo.get_active_title_guidelines()
+        return await repo.get_active_title_guidelines()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post(
+    "/titles",
+    response_model=PRTitleGuideline,
+    summary="Crear o actualizar una guía de título",
+    description="Guarda una guía de título (la actualiza si incluye id) e invalida la configuración cacheada."
+)
+async def save_title_guideline(request: Request, guideline: PRTitleGuideline):
+    """
+    Crea o actualiza una guía de título.
+    """
+    repo = request.app.container.pr_guidelines_repository()
+    saved = await repo.save_title_guideline(guideline)
+    invalidate_config_cache(request, f"guía de título '{guideline.prefix}' guardada")
+    return saved
+
 @router.get(
     "/templates",
     response_model=PRDescriptionTemplate,
     summary="Obtener plantilla de descripción activa",
     description="Retorna la plantilla de descripción activa para los pull requests."
 )
-def get_description_template(request: Request):
+async def get_description_template(request: Request):
     """
     Obtiene la plantilla de descripción activa para los pull requests.
     """
     repo = request.app.container.pr_guidelines_repository()
-    template = repo.get_active_template()
+    template = await repo.get_active_template()
     if not template:
         raise HTTPException(status_code=404, detail="No se encontró plantilla activa")
     return template
@@ -50,12 +66,12 @@ def get_description_template(request: Request):
     summary="Listar etiquetas activas",
     description="Obtiene la lista de etiquetas activas para los pull requests."
 )
-def list_labels(request: Request):
+async def list_labels(request: Request):
     """
     Obtiene la lista de etiquetas activas para los pull requests.
     """
     repo = request.app.container.pr_guidelines_repository()
     try:
-        return repo.get_active_labels()
+        return await repo.get_active_labels()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
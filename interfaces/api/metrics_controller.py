@@ -1,6 +1,6 @@
 import logging
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 import time
 import psutil  # Asegúrate de instalar psutil (pip install psutil)
 import os
@@ -16,13 +16,31 @@ router = APIRouter(
 @router.get(
     "/",
     summary="Obtener métricas básicas",
-    description="Retorna métricas básicas del sistema, como uso de CPU, memoria y tiempo de actividad."
+    description="Retorna métricas básicas del sistema, como uso de CPU, memoria y tiempo de actividad, "
+                "además de las métricas de la integración con GitHub y de la caché del LLM."
 )
-async def get_metrics():
+async def get_metrics(request: Request):
     uptime = time.time() - os.stat(".").st_ctime
+    github_service = request.app.container.github_service()
+    ai_service = request.app.container.ai_service()
+    config_cache = request.app.container.config_cache()
+    review_write_buffer = request.app.container.review_write_buffer()
     metrics = {
         "cpu_usage": psutil.cpu_percent(interval=1),
         "memory_usage": psutil.virtual_memory()._asdict(),
-        "uptime_seconds": uptime
+        "uptime_seconds": uptime,
+        "github": {
+            "response_cache": github_service.cache_stats(),
+            "rate_limiter": github_service.rate_limit_stats(),
+            "circuit_breaker": github_service.circuit_stats()
+        },
+        "llm_cache": ai_service.cache_stats(),
+        "llm_tokens": ai_service.usage_stats(),
+        "review_workers": request.app.container.review_dispatcher().stats(),
+        "webhook_dedupe": request.app.container.webhook_deduplicator().stats(),
+        "database": request.app.container.db_executor().stats(),
+        "review_inputs": request.app.container.analyze_pull_request_use_case().input_stats.stats(),
+        "config_cache": config_cache.stats() if config_cache else None,
+        "review_writes": review_write_buffer.stats() if review_write_buffer else None
     }
     return metrics
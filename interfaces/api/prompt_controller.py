@@ -6,6 +6,7 @@ from application.dto.prompt_dto import (
     CreateRuleDTO, UpdateRuleDTO
 )
 from infrastructure.database.repositories.prompt_repository import Prompt
+from interfaces.api.config_cache_controller import invalidate_config_cache
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +30,9 @@ async def create_prompt(request: Request, dto: CreatePromptDTO):
     - El prompt se crea inicialmente como activo
     """
     repo = request.app.container.prompt_repository()
-    return await repo.create_prompt(dto)
+    prompt = await repo.create_prompt(dto)
+    invalidate_config_cache(request, f"prompt '{dto.name}' creado")
+    return prompt
 
 @router.put("/prompts/{prompt_id}", response_model=Prompt)
 async def update_prompt(request: Request, prompt_id: str, dto: UpdatePromptDTO):
@@ -42,6 +45,7 @@ async def update_prompt(request: Request, prompt_id: str, dto: UpdatePromptDTO):
     prompt = await repo.update_prompt(prompt_id, dto)
     if not prompt:
         raise HTTPException(status_code=404, detail="Prompt no encontrado")
+    invalidate_config_cache(request, f"prompt {prompt_id} actualizado")
     return prompt
 
 @router.get("/prompts/{name}", response_model=List[Prompt])
@@ -58,7 +62,9 @@ async def create_rule(request: Request, dto: CreateRuleDTO):
     Crea una nueva regla para un prompt existente.
     """
     repo = request.app.container.prompt_repository()
-    return await repo.create_rule(dto)
+    rule = await repo.create_rule(dto)
+    invalidate_config_cache(request, f"regla '{dto.name}' creada")
+    return rule
 
 @router.put("/rules/{rule_id}")
 async def update_rule(request: Request, rule_id: str, dto: UpdateRuleDTO):
@@ -69,6 +75,7 @@ async def update_rule(request: Request, rule_id: str, dto: UpdateRuleDTO):
     rule = await repo.update_rule(rule_id, dto)
     if not rule:
         raise HTTPException(status_code=404, detail="Regla no encontrada")
+    invalidate_config_cache(request, f"regla {rule_id} actualizada")
     return rule
 
 @router.get("/rules/type/{rule_type}")
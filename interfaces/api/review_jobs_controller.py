@@ -0,0 +1,52 @@
+import logging
+
+from fastapi import APIRouter, HTTPException, Request
+from typing import Dict, List
+from domain.models.review_job import ReviewJobRecord, ReviewJobStatus
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/review-jobs",
+    tags=["review-jobs"],
+    responses={404: {"description": "No se encontró el recurso"}}
+)
+
+
+def _get_queue(request: Request):
+    queue = request.app.container.review_job_queue()
+    if queue is None:
+        raise HTTPException(status_code=404, detail="La cola persistente de revisiones no está habilitada")
+    return queue
+
+
+@router.get(
+    "/",
+    response_model=List[ReviewJobRecord],
+    summary="Listar trabajos de revisión",
+    description="Lista los trabajos de la cola persistente en un estado; por defecto los 'dead', "
+                "que agotaron sus intentos y necesitan un reintento manual."
+)
+async def list_review_jobs(request: Request, status: ReviewJobStatus = ReviewJobStatus.DEAD, limit: int = 50):
+    return await _get_queue(request).list_by_status(status, limit=min(limit, 500))
+
+
+@router.get(
+    "/stats",
+    summary="Trabajos por estado",
+    description="Número de trabajos en cola, en ejecución y 'dead'."
+)
+async def review_jobs_stats(request: Request) -> Dict[str, int]:
+    return await _get_queue(request).count_by_status()
+
+
+@router.post(
+    "/{job_id}/retry",
+    summary="Reintentar un trabajo 'dead'",
+    description="Vuelve a encolar un trabajo 'dead' con los intentos a cero."
+)
+async def retry_review_job(request: Request, job_id: int):
+    if not await _get_queue(request).retry(job_id):
+        raise HTTPException(status_code=404, detail=f"No hay un trabajo 'dead' con ID {job_id}")
+    logger.info(f"Trabajo de revisión {job_id} reencolado manualmente")
+    return {"message": "Job requeued", "job_id": job_id}
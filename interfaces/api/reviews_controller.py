@@ -0,0 +1,48 @@
+import logging
+
+from fastapi import APIRouter, Query, Request
+from typing import Optional
+from application.dto.review_dto import ReviewPageDTO
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/reviews",
+    tags=["reviews"],
+    responses={404: {"description": "No se encontró el recurso"}}
+)
+
+
+@router.get(
+    "/repos/{owner}/{repo}",
+    response_model=ReviewPageDTO,
+    summary="Listar revisiones de un repositorio",
+    description="Revisiones de un repositorio, de la más reciente a la más antigua. "
+                "Para la siguiente página se pasa `next_cursor` como `cursor`."
+)
+async def list_repository_reviews(
+        request: Request,
+        owner: str,
+        repo: str,
+        cursor: Optional[int] = None,
+        limit: int = Query(50, ge=1, le=200)
+):
+    repository = request.app.container.reviews_repository()
+    return await repository.list_reviews(repository=f"{owner}/{repo}", cursor=cursor, limit=limit)
+
+
+@router.get(
+    "/authors/{author}",
+    response_model=ReviewPageDTO,
+    summary="Listar revisiones de un autor",
+    description="Revisiones de los PRs de un autor, de la más reciente a la más antigua. "
+                "Para la siguiente página se pasa `next_cursor` como `cursor`."
+)
+async def list_author_reviews(
+        request: Request,
+        author: str,
+        cursor: Optional[int] = None,
+        limit: int = Query(50, ge=1, le=200)
+):
+    repository = request.app.container.reviews_repository()
+    return await repository.list_reviews(author=author, cursor=cursor, limit=limit)
@@ -4,8 +4,11 @@
 import hmac
 import hashlib
 from fastapi import APIRouter, Request, HTTPException
+from fastapi.responses import JSONResponse
+from domain.exceptions import ReviewQueueFullException
 from domain.models.pull_request import PullRequest
 from application.dto.webhook_dto import PullRequestWebhookDTO
+from infrastructure.workers.review_worker_pool import ReviewJob
 import logging
 
 # Configurar logging
@@ -17,13 +20,15 @@ router = APIRouter()
 async def github_webhook(request: Request):
     """
     Endpoint para recibir webhooks de GitHub.
-    Verifica la firma y procesa eventos de Pull Request.
+    Verifica la firma y encola la revisión de los eventos de Pull Request;
+    el análisis lo ejecuta el pool de workers en segundo plano, tras agrupar
+    los eventos seguidos de un mismo PR.
     
     Args:
         request: Petición HTTP con el webhook
         
     Returns:
-        dict: Resultado del procesamiento del webhook
+        JSONResponse: 202 cuando la revisión queda encolada
         
     Raises:
         HTTPException: Si hay errores de validación o procesamiento
@@ -31,7 +36,8 @@ async def github_webhook(request: Request):
     try:
         # Recuperamos la configuración y el caso de uso directamente del contenedor
         settings = request.app.container.config()
-        analyze_pr = request.app.container.analyze_pull_request_use_case()
+        review_dispatcher = request.app.container.review_dispatcher()
+        deduplicator = request.app.container.webhook_deduplicator()
 
         # Verificar firma del webhook si está configurada
         if settings.GITHUB_WEBHOOK_SECRET:
@@ -68,16 +74,39 @@ async def github_webhook(request: Request):
         # Convertir a modelo de dominio
         pull_request = PullRequest.from_github_payload(payload)
 
-        # Ejecutar análisis
-        logger.info(f"Iniciando análisis de PR #{pull_request.number}")
-        result = await analyze_pr.execute(pull_request)
+        # Ignorar reentregas de GitHub y reenvíos manuales ya procesados
+        delivery_id = request.headers.get("X-GitHub-Delivery")
+        label = (payload.get("label") or {}).get("name")
+        if await deduplicator.is_duplicate(delivery_id, pull_request, webhook_data.action, label):
+            return {"message": "Duplicate delivery ignored", "pull_request": pull_request.number}
 
-        return {
-            "message": "Analysis completed",
-            # "pull_request": pull_request.number,
-            # "status": result.status
-        }
-        
+        # Encolar el análisis y responder antes del timeout de GitHub (10 s);
+        # los eventos seguidos del mismo PR se agrupan antes de analizarse
+        try:
+            await review_dispatcher.submit(ReviewJob(
+                pull_request=pull_request,
+                action=webhook_data.action,
+                delivery_id=delivery_id
+            ))
+        except Exception:
+            # La entrega no se encoló: GitHub la reenviará y no debe tomarse por duplicada
+            await deduplicator.forget(delivery_id, pull_request, webhook_data.action, label)
+            raise
+        logger.info(f"Análisis de PR #{pull_request.number} encolado")
+
+        return JSONResponse(
+            status_code=202,
+            content={
+                "message": "Analysis queued",
+                "pull_request": pull_request.number
+            }
+        )
+
+    except ReviewQueueFullException as e:
+        logger.error(f"No se pudo encolar el webhook: {e.message}")
+        raise HTTPException(status_code=503, detail=e.message)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error procesando webhook: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
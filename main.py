@@ -8,6 +8,10 @@ from interfaces.api.webhook_controller import router as webhook_router
 from interfaces.api.prompt_controller import router as prompt_router
 from interfaces.api.metrics_controller import router as metrics_router
 from interfaces.api.guidelines_controller import router as guidelines_router
+from interfaces.api.estimate_controller import router as estimate_router
+from interfaces.api.review_jobs_controller import router as review_jobs_router
+from interfaces.api.config_cache_controller import router as config_cache_router
+from interfaces.api.reviews_controller import router as reviews_router
 from domain.exceptions import DomainException
 from infrastructure.api.error_handlers import (
     domain_exception_handler,
@@ -118,6 +122,10 @@ app.include_router(webhook_router, prefix="/webhook", tags=["webhook"])
 app.include_router(prompt_router)
 app.include_router(metrics_router)
 app.include_router(guidelines_router)
+app.include_router(estimate_router)
+app.include_router(review_jobs_router)
+app.include_router(config_cache_router)
+app.include_router(reviews_router)
 
 @app.on_event("startup")
 async def startup_event():
@@ -127,6 +135,16 @@ async def startup_event():
     """
     # Inicializar contenedor y sus dependencias
     container.init_resources()
+    # Crear el pool de hilos para las consultas a Supabase
+    container.db_executor()
+    # Abrir el cliente HTTP compartido (pool de conexiones) de GitHub
+    await container.github_service().start()
+    # Arrancar el guardado diferido de revisiones (reintenta las volcadas a disco)
+    review_write_buffer = container.review_write_buffer()
+    if review_write_buffer is not None:
+        await review_write_buffer.start()
+    # Arrancar los workers que ejecutan las revisiones encoladas por el webhook
+    await container.review_dispatcher().start()
     logger.info("Aplicación iniciada correctamente")
 
 @app.on_event("shutdown")
@@ -135,6 +153,21 @@ async def shutdown_event():
     Se ejecuta cuando se detiene la aplicación.
     Limpia recursos.
     """
+    # Encolar los eventos en espera de debounce y drenar las revisiones en curso
+    # antes de cerrar los servicios que usan
+    await container.review_dispatcher().shutdown()
+    # Guardar las revisiones pendientes del búfer (o volcarlas a disco)
+    review_write_buffer = container.review_write_buffer()
+    if review_write_buffer is not None:
+        await review_write_buffer.shutdown()
+    # Cerrar el cliente HTTP de GitHub y liberar sus conexiones
+    await container.github_service().close()
+    # Cerrar la base SQLite de la caché del LLM, si existe
+    llm_cache = container.llm_cache()
+    if llm_cache is not None:
+        llm_cache.close()
+    # Esperar a las consultas pendientes y detener el pool de hilos de Supabase
+    container.db_executor().shutdown()
     # Limpiar recursos del contenedor
     container.shutdown_resources()
     logger.info("Aplicación detenida correctamente")
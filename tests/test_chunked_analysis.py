@@ -0,0 +1,82 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from application.dto.ai_analysis_result_dto import CodeAnalysisComment, CodeAnalysisResult
+from application.helpers.transformers import merge_code_analysis_results
+from domain.models.file_patch import FilePatch
+from infrastructure.ai.diff_chunker import chunk_file_patches, estimate_tokens
+from infrastructure.ai.langchain_orchestrator import LangchainOrchestrator
+
+
+def _file_diff(path: str, hunks: int = 1, lines: int = 10) -> str:
+    parts = [f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n"]
+    for h in range(hunks):
+        parts.append(f"@@ -{h * 100 + 1},0 +{h * 100 + 1},{lines} @@\n")
+        parts.extend(f"+line {h}-{i} of {path}\n" for i in range(lines))
+    return "".join(parts)
+
+
+def test_chunker_packs_files_and_splits_large_ones_by_hunk():
+    small = FilePatch.from_unified_diff(_file_diff("a.py") + _file_diff("b.py"))
+    large = FilePatch.from_unified_diff(_file_diff("big.py", hunks=4))
+    budget = estimate_tokens(small[0].diff) * 2 + 1
+
+    chunks = chunk_file_patches(small + large, budget)
+
+    assert chunks[0].files == ["a.py", "b.py"]
+    assert all(chunk.files == ["big.py"] for chunk in chunks[1:])
+    assert len(chunks) > 2
+    # Cada fragmento del archivo grande repite sus cabeceras
+    assert all(chunk.diff.startswith("diff --git a/big.py") for chunk in chunks[1:])
+    assert sum(chunk.diff.count("\n@@ ") for chunk in chunks[1:]) == 4
+
+
+def test_merge_concatenates_comments_and_weights_score():
+    def result(score, concerns, path):
+        return CodeAnalysisResult(
+            summary=f"resumen {path}",
+            score=score,
+            comments=[CodeAnalysisComment(
+                file_path=path, line_number=1, content="c", type="bug", severity="low"
+            )],
+            security_concerns=concerns
+        )
+
+    merged = merge_code_analysis_results(
+        [result(90, ["SQL injection"], "a.py"), result(60, ["sql  injection", "XSS"], "b.py")],
+        weights=[1, 2]
+    )
+
+    assert merged.score == 70
+    assert [c.file_path for c in merged.comments] == ["a.py", "b.py"]
+    assert merged.security_concerns == ["SQL injection", "XSS"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_code_runs_chunks_concurrently_with_bound():
+    active, peak = 0, 0
+
+    async def agenerate(messages_list):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return SimpleNamespace(generations=[[SimpleNamespace(text=json.dumps({
+            "summary": "ok", "score": 80, "comments": []
+        }))]])
+
+    orchestrator = LangchainOrchestrator(openai_api_key="dummy", chunk_max_tokens=60, max_concurrency=2)
+    orchestrator.llm = SimpleNamespace(agenerate=agenerate)
+    diff = "".join(_file_diff(f"f{i}.py") for i in range(6))
+
+    result = await orchestrator.analyze_code(
+        diff=diff,
+        prompt="{diff}{rules}{context}{format_instructions}",
+        rules=[],
+        context={}
+    )
+
+    assert result.score == 80
+    assert peak == 2
@@ -0,0 +1,40 @@
+import asyncio
+import time
+import pytest
+from application.helpers.concurrent_fetch import FetchLatencyStats, fetch_concurrently
+
+
+async def _value(value, delay: float = 0.05):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def _fail():
+    raise RuntimeError("db caída")
+
+
+@pytest.mark.asyncio
+async def test_fetches_run_concurrently_with_per_input_timeouts_and_attribution():
+    started = time.perf_counter()
+    result = await fetch_concurrently(
+        {
+            "rules": lambda: _value([1]),
+            "labels": lambda: _value([2]),
+            "template": _fail,
+            "diff": lambda: _value("diff", delay=1),
+        },
+        timeout=0.5,
+        timeouts={"diff": 0.1}
+    )
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.2  # Las entradas no se esperan una tras otra
+    assert result.values == {"rules": [1], "labels": [2]}
+    assert result.errors["template"] == "RuntimeError: db caída"
+    assert result.errors["diff"].startswith("timeout")
+    assert set(result.latencies) == {"rules", "labels", "template", "diff"}
+
+    stats = FetchLatencyStats()
+    stats.record(result)
+    assert stats.stats()["diff"]["errors"] == 1
+    assert stats.stats()["rules"]["avg_seconds"] >= 0.05
@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from application.dto.prompt_dto import PromptDTO
+from domain.exceptions import ReviewInputFetchException
+from infrastructure.database.config_cache import ConfigurationCache
+
+
+@pytest.fixture
+def repos(mocker):
+    prompt_repo = mocker.Mock()
+
+    async def slow_prompt(category):
+        await asyncio.sleep(0.01)
+        return PromptDTO(name=category, version="1", prompt_text="{diff}")
+
+    prompt_repo.get_latest_prompt_by_category = mocker.AsyncMock(side_effect=slow_prompt)
+    prompt_repo.get_all_active_rules = mocker.AsyncMock(return_value=[])
+    guidelines_repo = mocker.Mock()
+    guidelines_repo.get_active_title_guidelines = mocker.AsyncMock(return_value=[])
+    guidelines_repo.get_active_template = mocker.AsyncMock(return_value=None)
+    guidelines_repo.get_active_labels = mocker.AsyncMock(return_value=[])
+    return prompt_repo, guidelines_repo
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load_and_hits_skip_the_database(repos):
+    prompt_repo, guidelines_repo = repos
+    cache = ConfigurationCache(prompt_repo, guidelines_repo, ttl=60)
+
+    contexts = await asyncio.gather(*(cache.get() for _ in range(5)))
+    await cache.get()
+
+    assert all(context is contexts[0] for context in contexts)
+    assert prompt_repo.get_all_active_rules.await_count == 1
+    assert guidelines_repo.get_active_labels.await_count == 1
+    assert cache.stats()["loads"] == 1 and cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_bumps_version_and_discards_inflight_load(repos):
+    prompt_repo, guidelines_repo = repos
+    cache = ConfigurationCache(prompt_repo, guidelines_repo, ttl=60)
+
+    stale = asyncio.ensure_future(cache.get())
+    await asyncio.sleep(0)
+    assert cache.invalidate("regla actualizada") == 1
+    await stale
+    assert cache.snapshot()["cached"] is False  # La carga anterior a la invalidación no se guarda
+
+    await cache.get()
+    snapshot = cache.snapshot()
+    assert snapshot["version"] == 1 and snapshot["cached"] is True
+    assert snapshot["context"]["code_analysis_prompt"]["name"] == "code_analysis"
+
+
+@pytest.mark.asyncio
+async def test_expired_snapshot_is_reloaded_and_errors_are_not_cached(repos):
+    prompt_repo, guidelines_repo = repos
+    now = [0.0]
+    cache = ConfigurationCache(prompt_repo, guidelines_repo, ttl=10, clock=lambda: now[0])
+    await cache.get()
+
+    now[0] = 11.0
+    guidelines_repo.get_active_labels.side_effect = RuntimeError("caída")
+    with pytest.raises(ReviewInputFetchException):
+        await cache.get()
+
+    guidelines_repo.get_active_labels.side_effect = None
+    await cache.get()
+    assert cache.stats()["loads"] == 3
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from infrastructure.database.db_executor import DatabaseExecutor
+
+
+class _BlockingQuery:
+    """Consulta cuyo execute() bloquea como el cliente síncrono de Supabase."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def execute(self):
+        with self.lock:
+            _BlockingQuery.active += 1
+            _BlockingQuery.peak = max(_BlockingQuery.peak, _BlockingQuery.active)
+        time.sleep(0.05)
+        with self.lock:
+            _BlockingQuery.active -= 1
+        return SimpleNamespace(data=[{"id": 1}])
+
+
+@pytest.mark.asyncio
+async def test_queries_run_off_the_event_loop_with_bounded_concurrency():
+    executor = DatabaseExecutor(max_workers=2)
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    beat = asyncio.create_task(heartbeat())
+    results = await asyncio.gather(*(executor.run(_BlockingQuery()) for _ in range(4)))
+    beat.cancel()
+    executor.shutdown()
+
+    assert all(result.data == [{"id": 1}] for result in results)
+    assert _BlockingQuery.peak == 2
+    assert ticks >= 5  # El loop siguió atendiendo otras corrutinas durante las consultas
+    stats = executor.stats()
+    assert stats["calls"] == 4 and stats["in_flight"] == 0 and stats["errors"] == 0
@@ -0,0 +1,151 @@
+import asyncio
+from datetime import datetime
+import pytest
+from domain.exceptions import ReviewFailedException
+from domain.models.pull_request import PullRequest, PullRequestStatus
+from domain.models.review_job import ReviewJobStatus
+from infrastructure.workers.durable_review_worker import DurableReviewWorker
+from infrastructure.workers.review_worker_pool import ReviewJob
+from infrastructure.workers.sqlite_job_queue import SQLiteJobQueue
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _job(number: int, action: str = "opened", sha: str = "a") -> ReviewJob:
+    now = datetime.utcnow()
+    return ReviewJob(pull_request=PullRequest(
+        github_id=number, number=number, title="t", body="", status=PullRequestStatus.OPEN,
+        author="dev", repository="owner/repo", base_branch="main", head_branch="f", head_sha=sha,
+        created_at=now, updated_at=now, suggested_title=""
+    ), action=action)
+
+
+async def _enqueue(queue, job: ReviewJob, **kwargs) -> int:
+    pull_request = job.pull_request
+    return await queue.enqueue(
+        pull_request.repository, pull_request.number, job.action,
+        pull_request.model_dump(mode="json"), **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_sqlite_queue_leases_claims_and_reclaims_expired_jobs(tmp_path):
+    clock = _Clock()
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.db"), clock=clock)
+    await _enqueue(queue, _job(1), priority=0)
+    await _enqueue(queue, _job(2), priority=10)
+    await _enqueue(queue, _job(3), delay_seconds=60)
+
+    claimed = await queue.claim("w1", 5, lease_seconds=30)
+    assert [job.pr_number for job in claimed] == [2, 1]  # Prioridad primero; el 3 aún no es reclamable
+    assert await queue.claim("w2", 5, lease_seconds=30) == []
+    assert claimed[1].pull_request().head_sha == "a"
+
+    # w1 muere: al expirar el lease, w2 retoma los trabajos y w1 ya no puede renovarlos
+    clock.now += 31
+    reclaimed = await queue.claim("w2", 5, lease_seconds=30)
+    assert sorted(job.pr_number for job in reclaimed) == [1, 2]
+    assert all(job.attempts == 2 for job in reclaimed)
+    assert not await queue.renew(reclaimed[0].id, "w1", 30)
+    assert await queue.renew(reclaimed[0].id, "w2", 30)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_queue_supersedes_jobs_of_the_same_pull_request(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.db"), clock=_Clock())
+    await _enqueue(queue, _job(1, sha="a"))
+    running = (await queue.claim("w1", 1, lease_seconds=30))[0]
+    await _enqueue(queue, _job(1, "labeled", sha="a"))
+    assert await queue.renew(running.id, "w1", 30)  # Un cambio de labels no sustituye la revisión en curso
+
+    await _enqueue(queue, _job(1, "synchronize", sha="b"), supersede_running=True)
+    assert not await queue.renew(running.id, "w1", 30)
+    queued = await queue.list_by_status(ReviewJobStatus.QUEUED)
+    assert [job.pull_request().head_sha for job in queued] == ["b"]
+
+
+class _FlakyUseCase:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    async def execute(self, pull_request, action=None):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("LLM no disponible")
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_with_backoff_and_marks_dead_jobs(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+    use_case = _FlakyUseCase(failures=10)
+    worker = DurableReviewWorker(
+        queue, use_case, concurrency=1, poll_interval=0.01, max_attempts=2,
+        retry_base_delay=0.05, debounce_seconds=0, worker_id="w1"
+    )
+    await worker.start()
+    await worker.submit(_job(1))
+    await asyncio.sleep(0.3)
+    await worker.shutdown()
+
+    assert use_case.calls == 2
+    assert worker.stats()["retried"] == 1 and worker.stats()["dead"] == 1
+    dead = await queue.list_by_status(ReviewJobStatus.DEAD)
+    assert len(dead) == 1 and dead[0].last_error == "LLM no disponible"
+    assert (await queue.count_by_status())["dead"] == 1
+
+    assert await queue.retry(dead[0].id)
+    assert (await queue.count_by_status()) == {"queued": 1, "running": 0, "dead": 0}
+
+
+class _PostedThenFailingUseCase:
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, pull_request, action=None):
+        self.calls += 1
+        raise ReviewFailedException("Error guardando la revisión", details={"posted": True})
+
+
+@pytest.mark.asyncio
+async def test_worker_does_not_retry_reviews_already_posted(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+    use_case = _PostedThenFailingUseCase()
+    worker = DurableReviewWorker(
+        queue, use_case, concurrency=1, poll_interval=0.01, max_attempts=3,
+        retry_base_delay=0.01, debounce_seconds=0, worker_id="w1"
+    )
+    await worker.start()
+    await worker.submit(_job(1))
+    await asyncio.sleep(0.2)
+    await worker.shutdown()
+
+    assert use_case.calls == 1
+    assert worker.stats()["retried"] == 0 and worker.stats()["dead"] == 1
+
+
+class _SlowUseCase:
+    async def execute(self, pull_request, action=None):
+        await asyncio.sleep(10)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_with_all_slots_busy_respects_drain_timeout(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+    worker = DurableReviewWorker(
+        queue, _SlowUseCase(), concurrency=1, poll_interval=0.01,
+        debounce_seconds=0, drain_timeout=0.1, worker_id="w1"
+    )
+    await worker.start()
+    await worker.submit(_job(1))
+    await asyncio.sleep(0.05)
+    assert worker.stats()["in_flight"] == 1
+
+    await asyncio.wait_for(worker.shutdown(), timeout=1)
+    assert (await queue.count_by_status())["queued"] == 1
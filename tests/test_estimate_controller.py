@@ -0,0 +1,27 @@
+from dependency_injector import providers
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from application.dto.ai_analysis_result_dto import ReviewCostEstimate
+from application.use_cases.estimate_review_cost import EstimateReviewCostUseCase
+from infrastructure.config.container import Container
+from interfaces.api.estimate_controller import router as estimate_router
+
+
+def test_estimate_endpoint_resolves_use_case_from_container(mocker, test_settings):
+    container = Container()
+    container.config.override(providers.Object(test_settings))
+    container.supabase_client.override(providers.Object(mocker.Mock()))
+    execute = mocker.patch.object(EstimateReviewCostUseCase, "execute", return_value=ReviewCostEstimate(
+        model="o1-mini", tokenizer="heuristic", files=1, calls=1, prompt_tokens=100,
+        estimated_output_tokens=50, estimated_cost_usd=0.01, estimated_latency_seconds=2.0
+    ))
+    app = FastAPI()
+    app.include_router(estimate_router)
+    app.container = container
+
+    response = TestClient(app).get("/api/v1/estimates/owner/repo/pulls/7")
+
+    assert response.status_code == 200
+    assert response.json()["calls"] == 1
+    execute.assert_awaited_once_with("owner/repo", 7, installation_id=None)
+    assert isinstance(container.estimate_review_cost_use_case(), EstimateReviewCostUseCase)
@@ -0,0 +1,41 @@
+from datetime import datetime
+from application.dto.prompt_dto import PromptDTO
+from application.dto.review_context import ReviewContext
+from application.use_cases.generate_pr_metadata import GeneratePRMetadataUseCase
+from domain.models.pr_guidelines import PRDescriptionTemplate, PRLabel, PRTitleGuideline
+from domain.models.pull_request import PullRequest, PullRequestStatus
+
+
+def _pull_request(title: str) -> PullRequest:
+    now = datetime.utcnow()
+    return PullRequest(
+        github_id=1, number=7, title=title, body="", status=PullRequestStatus.OPEN,
+        author="dev", repository="owner/repo", base_branch="main", head_branch="feature",
+        created_at=now, updated_at=now, suggested_title="", suggested_labels=["bug", "otra"]
+    )
+
+
+def _context(**overrides) -> ReviewContext:
+    prompt = PromptDTO(name="p", version="1", prompt_text="{diff}")
+    return ReviewContext(code_analysis_prompt=prompt, metadata_prompt=prompt, **overrides)
+
+
+def test_applies_guidelines_from_context_without_repository():
+    context = _context(
+        title_guidelines=[PRTitleGuideline(prefix="fix", description="Corrección")],
+        description_template=PRDescriptionTemplate(name="t", template_content="PR #{pr_number} de {author}"),
+        labels=[PRLabel(name="bug", description="Error")]
+    )
+
+    pull_request = GeneratePRMetadataUseCase().execute(_pull_request("arreglar login"), context)
+
+    assert pull_request.title == "fix: arreglar login"
+    assert pull_request.body == "PR #7 de dev"
+    assert pull_request.labels == ["bug"]
+    assert "fix: Corrección" in context.title_guidelines_text
+
+
+def test_without_title_guidelines_keeps_title():
+    pull_request = GeneratePRMetadataUseCase().execute(_pull_request("arreglar login"), _context())
+
+    assert pull_request.title == "arreglar login"
@@ -0,0 +1,458 @@
+import asyncio
+import json
+import httpx
+import pytest
+from domain.exceptions import GitHubUnavailableException
+from domain.models.file_patch import FilePatch
+from domain.models.review import Review, ReviewComment, ReviewStatus
+from infrastructure.github.diff_index import DiffIndex, DiffPosition
+from infrastructure.github.github_service import GitHubService
+from infrastructure.github.rate_limiter import GitHubRateLimiter
+from infrastructure.github.retry_policy import CircuitBreaker, RetryPolicy
+from infrastructure.github.response_cache import CachedResponse, ResponseCache
+from infrastructure.github.token_cache import InstallationToken, InstallationTokenCache
+
+
+def _mock_service(handler) -> GitHubService:
+    service = GitHubService(app_id="1", private_key="test_key", base_url="https://github.test")
+    service._client = httpx.AsyncClient(
+        base_url=service.base_url,
+        transport=httpx.MockTransport(handler)
+    )
+    service._repository_installations["owner/repo"] = 1
+    service._token_cache._tokens[1] = InstallationToken(token="ghs_test", expires_at=float("inf"))
+    return service
+
+
+@pytest.mark.asyncio
+async def test_requests_share_pooled_client():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, text="diff --git a/a.py b/a.py\n")
+
+    service = _mock_service(handler)
+    client = await service._get_client()
+
+    await service.get_pull_request_diff("owner/repo", 1)
+    await service.get_pull_request_diff("owner/repo", 2)
+
+    assert await service._get_client() is client
+    assert calls == ["/repos/owner/repo/pulls/1", "/repos/owner/repo/pulls/2"]
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_start_and_close_lifecycle():
+    service = GitHubService(app_id="1", private_key="test_key", max_connections=5)
+
+    await service.start()
+    client = service._client
+    assert client is not None and not client.is_closed
+
+    # Llamar start dos veces no abre un segundo cliente
+    await service.start()
+    assert service._client is client
+
+    await service.close()
+    assert client.is_closed
+    assert service._client is None
+
+
+@pytest.mark.asyncio
+async def test_token_cache_single_flight_per_installation():
+    fetches = []
+
+    async def fetch_token(installation_id: int) -> InstallationToken:
+        fetches.append(installation_id)
+        await asyncio.sleep(0.01)
+        return InstallationToken(token=f"token-{installation_id}", expires_at=10_000)
+
+    cache = InstallationTokenCache(fetch_token, clock=lambda: 0)
+    tokens = await asyncio.gather(*(cache.get(1) for _ in range(10)), cache.get(2))
+
+    assert tokens[:10] == ["token-1"] * 10
+    assert tokens[10] == "token-2"
+    assert sorted(fetches) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_token_cache_refreshes_in_background_before_expiry():
+    now = [0.0]
+    issued = iter(["old", "new"])
+
+    async def fetch_token(installation_id: int) -> InstallationToken:
+        return InstallationToken(token=next(issued), expires_at=now[0] + 3600)
+
+    cache = InstallationTokenCache(fetch_token, refresh_margin=300, clock=lambda: now[0])
+    assert await cache.get(1) == "old"
+
+    # Dentro de la ventana de renovación se sirve el token actual sin esperar
+    now[0] = 3400
+    assert await cache.get(1) == "old"
+    await asyncio.sleep(0)
+    assert await cache.get(1) == "new"
+
+
+SAMPLE_DIFF = (
+    "diff --git a/app.py b/app.py\n"
+    "--- a/app.py\n"
+    "+++ b/app.py\n"
+    "@@ -1,3 +1,3 @@\n"
+    " import os\n"
+    "-import json\n"
+    "+import sys\n"
+    " print(os.getcwd())\n"
+    "@@ -20,2 +20,3 @@\n"
+    " def main():\n"
+    "+    run()\n"
+    "     pass\n"
+)
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_is_invalidated_and_request_retried_once():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers["Authorization"])
+        if request.headers["Authorization"] == "token ghs_test":
+            return httpx.Response(401, json={"message": "Bad credentials"})
+        return httpx.Response(200, json={"head": {"sha": "abc"}})
+
+    async def fetch_token(installation_id: int) -> InstallationToken:
+        return InstallationToken(token="ghs_new", expires_at=float("inf"))
+
+    service = _mock_service(handler)
+    service._token_cache._fetch_token = fetch_token
+
+    pull_request = await service.get_pull_request("owner/repo", 1)
+
+    assert pull_request["head"]["sha"] == "abc"
+    assert seen == ["token ghs_test", "token ghs_new"]
+    assert await service._token_cache.get(1) == "ghs_new"
+    await service.close()
+
+
+def test_diff_index_locates_lines_by_hunk_and_side():
+    index = DiffIndex.from_diff(SAMPLE_DIFF)
+
+    assert index.locate("app.py", 2) == DiffPosition(path="app.py", line=2, side="RIGHT", hunk_index=0)
+    assert index.locate("app.py", 22).hunk_index == 1
+    assert index.locate("app.py", 23) is None  # Fuera del rango del hunk
+    assert index.locate("app.py", 10) is None
+    assert index.locate("other.py", 1) is None
+
+
+def test_diff_index_partitions_comments_in_bulk():
+    index = DiffIndex.from_diff(SAMPLE_DIFF)
+    comments = [
+        ReviewComment(file_path="app.py", line_number=21, content="ok"),
+        ReviewComment(file_path="app.py", line_number=99, content="fuera"),
+        ReviewComment(file_path="missing.py", line_number=1, content="fuera"),
+    ]
+
+    located, rejected = index.partition(comments)
+
+    assert [c.line_number for c, _ in located] == [21]
+    assert [c.file_path for c in rejected] == ["app.py", "missing.py"]
+
+
+@pytest.mark.asyncio
+async def test_create_review_uses_webhook_head_sha():
+    posted = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        posted.append((request.method, request.url.path, request.content))
+        return httpx.Response(201, json={"id": 1})
+
+    service = _mock_service(handler)
+    review = Review(
+        pull_request_id=1,
+        status=ReviewStatus.COMPLETED,
+        summary="ok",
+        score=80.0,
+        comments=[ReviewComment(file_path="app.py", line_number=21, content="ok")]
+    )
+
+    await service.create_review_comments("owner/repo", 1, review, SAMPLE_DIFF, commit_id="abc123")
+
+    assert [(method, path) for method, path, _ in posted] == [("POST", "/repos/owner/repo/pulls/1/reviews")]
+    body = json.loads(posted[0][2])
+    assert body["commit_id"] == "abc123"
+    assert body["comments"] == [{"path": "app.py", "line": 21, "side": "RIGHT", "body": "ok"}]
+
+
+@pytest.mark.asyncio
+async def test_head_sha_fallback_reads_pull_request():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/repos/owner/repo/pulls/7"
+        return httpx.Response(200, json={"head": {"sha": "def456"}})
+
+    service = _mock_service(handler)
+
+    assert await service._get_head_sha("owner/repo", 7) == "def456"
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_serves_cached_body_on_304():
+    seen_headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text=SAMPLE_DIFF, headers={"ETag": '"v1"'})
+
+    service = _mock_service(handler)
+    service._response_cache = ResponseCache(max_entries=2)
+
+    first = await service.get_pull_request_diff("owner/repo", 1)
+    second = await service.get_pull_request_diff("owner/repo", 1)
+
+    assert first == second == SAMPLE_DIFF
+    assert seen_headers == [None, '"v1"']
+    assert service.cache_stats()["hits"] == 1
+    assert service.cache_stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_caches_each_page_separately():
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = request.url.params["page"]
+        etag = f'"page-{page}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        headers = {"ETag": etag}
+        if page == "1":
+            headers["Link"] = '<https://github.test/repos/owner/repo/pulls/1/files?per_page=100&page=2>; rel="last"'
+        files = [{"filename": f"page{page}.py", "status": "modified", "patch": "@@ -1 +1 @@\n-a\n+b"}]
+        return httpx.Response(200, json=files, headers=headers)
+
+    service = _mock_service(handler)
+    service._response_cache = ResponseCache(max_entries=10)
+
+    async def paths():
+        return [p.path async for p in service._iter_pull_request_files_api("owner/repo", 1, None)]
+
+    assert await paths() == ["page1.py", "page2.py"]
+    assert await paths() == ["page1.py", "page2.py"]  # Cada 304 sirve el cuerpo de su propia página
+    assert service.cache_stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_response_cache_lru_and_disk_tier(tmp_path):
+    cache = ResponseCache(max_entries=1, disk_path=str(tmp_path))
+    await cache.put("a", CachedResponse(content=b"A", etag='"a"'))
+    await cache.put("b", CachedResponse(content=b"B", etag='"b"'))
+
+    # "a" fue desalojada de memoria pero sigue disponible en disco
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["evictions"] == 1
+    assert (await cache.get("a")).content == b"A"
+    assert (await ResponseCache(disk_path=str(tmp_path)).get("b")).etag == '"b"'
+
+
+def _fake_time():
+    now = [1000.0]
+
+    async def sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    return now, (lambda: now[0]), sleep
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_write_is_held_and_retried():
+    now, clock, sleep = _fake_time()
+    responses = iter([
+        httpx.Response(403, headers={"Retry-After": "30"}, text="secondary rate limit"),
+        httpx.Response(201, json={"id": 1}),
+    ])
+    service = _mock_service(lambda request: next(responses))
+    service._rate_limiter = GitHubRateLimiter(clock=clock, sleep=sleep)
+
+    await service.create_metadata_comment("owner/repo", 1, {"suggested_title": "feat: x"})
+
+    assert now[0] >= 1030.0
+    stats = service.rate_limit_stats()
+    assert stats["rate_limited"] == 1
+    assert stats["requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_paces_writes_per_repository():
+    now, clock, sleep = _fake_time()
+    limiter = GitHubRateLimiter(write_interval=1.0, clock=clock, sleep=sleep)
+
+    for _ in range(3):
+        async with limiter.slot("1", "owner/repo", write=True):
+            pass
+    async with limiter.slot("1", "owner/other", write=True):
+        pass
+
+    # Tres escrituras al mismo repositorio quedan separadas un segundo; otro repositorio no espera
+    assert now[0] == pytest.approx(1002.0)
+    assert limiter.stats()["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_idempotent_get_is_retried_on_transient_error():
+    responses = iter([httpx.Response(502), httpx.Response(200, text=SAMPLE_DIFF)])
+    service = _mock_service(lambda request: next(responses))
+    service._retry_policy = RetryPolicy(max_attempts=3, rng=lambda: 0.0)
+
+    assert await service.get_pull_request_diff("owner/repo", 1) == SAMPLE_DIFF
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried_after_reaching_github():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(502)
+
+    service = _mock_service(handler)
+    service._retry_policy = RetryPolicy(max_attempts=3, rng=lambda: 0.0)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await service.create_metadata_comment("owner/repo", 1, {})
+    assert calls == ["POST"]
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_while_github_is_degraded():
+    now = [0.0]
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(503)
+
+    service = _mock_service(handler)
+    service._circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: now[0])
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await service.get_pull_request_diff("owner/repo", 1)
+    with pytest.raises(GitHubUnavailableException):
+        await service.get_pull_request_diff("owner/repo", 1)
+    assert len(calls) == 2
+
+    # Tras el timeout se deja pasar una petición de prueba
+    now[0] = 31
+    with pytest.raises(httpx.HTTPStatusError):
+        await service.get_pull_request_diff("owner/repo", 1)
+    assert len(calls) == 3
+    assert service.circuit_stats()["state"] == CircuitBreaker.OPEN
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_probe_does_not_block_the_circuit():
+    now = [0.0]
+    slow = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if not slow.is_set():
+            slow.set()
+            await asyncio.sleep(10)
+        return httpx.Response(200, text=SAMPLE_DIFF)
+
+    service = _mock_service(handler)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=lambda: now[0])
+    breaker.record_failure()
+    service._circuit_breaker = breaker
+    now[0] = 31
+
+    probe = asyncio.create_task(service.get_pull_request_diff("owner/repo", 1))
+    await slow.wait()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    # La prueba cancelada no deja el circuito rechazando peticiones para siempre
+    assert await service.get_pull_request_diff("owner/repo", 1) == SAMPLE_DIFF
+    assert service.circuit_stats()["state"] == CircuitBreaker.CLOSED
+
+
+def test_file_patch_splits_unified_diff():
+    diff = SAMPLE_DIFF + (
+        "diff --git a/old.py b/new.py\n"
+        "similarity index 90%\n"
+        "rename from old.py\n"
+        "rename to new.py\n"
+        "diff --git a/gone.py b/gone.py\n"
+        "deleted file mode 100644\n"
+        "--- a/gone.py\n"
+        "+++ /dev/null\n"
+        "@@ -1 +0,0 @@\n"
+        "-x = 1\n"
+    )
+
+    patches = FilePatch.from_unified_diff(diff)
+
+    assert "".join(patch.diff for patch in patches) == diff
+    assert [(p.path, p.status) for p in patches][-2:] == [("new.py", "renamed"), ("gone.py", "removed")]
+    assert patches[-2].previous_path == "old.py"
+    assert patches[-1].deletions == 1 and len(patches[-1].hunks) == 1
+
+
+@pytest.mark.asyncio
+async def test_oversized_diff_falls_back_to_paginated_files():
+    requested_pages = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/files"):
+            page = int(request.url.params["page"])
+            requested_pages.append(page)
+            headers = {}
+            if page == 1:
+                headers["Link"] = '<https://github.test/repos/owner/repo/pulls/1/files?per_page=100&page=3>; rel="last"'
+            return httpx.Response(200, json=[
+                {"filename": f"f{page}.py", "status": "modified", "patch": "@@ -1 +1 @@\n-a\n+b", "additions": 1}
+            ], headers=headers)
+        return httpx.Response(200, content=b"x" * 2048)
+
+    service = _mock_service(handler)
+    service.max_diff_bytes = 1024
+
+    patches = [patch async for patch in service.iter_pull_request_files("owner/repo", 1)]
+
+    assert [patch.path for patch in patches] == ["f1.py", "f2.py", "f3.py"]
+    assert sorted(requested_pages) == [1, 2, 3]
+    assert patches[0].diff.startswith("diff --git a/f1.py b/f1.py\n--- a/f1.py\n+++ b/f1.py\n@@")
+
+
+@pytest.mark.asyncio
+async def test_diff_rejected_with_406_falls_back_to_files():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/files"):
+            return httpx.Response(200, json=[{"filename": "image.png", "status": "added"}])
+        return httpx.Response(406, json={"message": "diff too large"})
+
+    service = _mock_service(handler)
+
+    patches = [patch async for patch in service.iter_pull_request_files("owner/repo", 1)]
+
+    assert [(p.path, p.status, p.diff) for p in patches] == [("image.png", "added", "")]
+
+
+@pytest.mark.asyncio
+async def test_compare_files_only_for_descendant_heads():
+    statuses = iter(["ahead", "diverged"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/repos/owner/repo/compare/old...new"
+        return httpx.Response(200, json={
+            "status": next(statuses),
+            "files": [{"filename": "a.py", "status": "modified", "patch": "@@ -1 +1 @@\n-a\n+b"}]
+        })
+
+    service = _mock_service(handler)
+
+    patches = await service.get_compare_files("owner/repo", "old", "new")
+    assert [patch.path for patch in patches] == ["a.py"]
+    # Tras un force-push el head ya no desciende del SHA revisado
+    assert await service.get_compare_files("owner/repo", "old", "new") is None
@@ -0,0 +1,169 @@
+from datetime import datetime
+import pytest
+from application.dto.ai_analysis_result_dto import CodeAnalysisComment, CodeAnalysisResult, PRMetadataResult
+from application.dto.prompt_dto import PromptDTO
+from application.use_cases.analyze_pull_request import AnalyzePullRequestUseCase
+from domain.exceptions import ReviewFailedException
+from domain.models.file_patch import FilePatch
+from domain.models.pull_request import PullRequest, PullRequestStatus
+from domain.models.review import Review, ReviewComment, ReviewStatus
+from infrastructure.database.review_write_buffer import ReviewWriteBuffer
+
+
+def _patch(path: str, line: str) -> FilePatch:
+    return FilePatch.from_unified_diff(
+        f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -1 +1 @@\n-old\n+{line}\n"
+    )[0]
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+def _pull_request() -> PullRequest:
+    now = datetime.utcnow()
+    return PullRequest(
+        github_id=1, number=7, title="feat: x", body="", status=PullRequestStatus.OPEN,
+        author="dev", repository="owner/repo", base_branch="main", head_branch="feature",
+        head_sha="new-sha", created_at=now, updated_at=now, suggested_title="", installation_id=1
+    )
+
+
+@pytest.fixture
+def use_case(mocker):
+    reviews_repo = mocker.Mock()
+    reviews_repo.save = mocker.AsyncMock()
+    reviews_repo.get_last_completed_by_pr_id = mocker.AsyncMock(return_value=Review(
+        id=1, pull_request_id=10, status=ReviewStatus.COMPLETED, summary="antes", score=90.0,
+        head_sha="old-sha",
+        comments=[
+            ReviewComment(id=1, file_path="a.py", line_number=1, content="sigue valido"),
+            ReviewComment(id=2, file_path="b.py", line_number=1, content="obsoleto"),
+        ]
+    ))
+    pr_repo = mocker.Mock()
+    pr_repo.save = mocker.AsyncMock(return_value=10)
+    prompt_repo = mocker.Mock()
+    prompt_repo.get_latest_prompt_by_category = mocker.AsyncMock(
+        return_value=PromptDTO(name="code", version="1", prompt_text="{diff}")
+    )
+    prompt_repo.get_all_active_rules = mocker.AsyncMock(return_value=[])
+    guidelines_repo = mocker.Mock()
+    guidelines_repo.get_active_title_guidelines = mocker.AsyncMock(return_value=[])
+    guidelines_repo.get_active_template = mocker.AsyncMock(return_value=None)
+    guidelines_repo.get_active_labels = mocker.AsyncMock(return_value=[])
+
+    github = mocker.Mock()
+    github.iter_pull_request_files = lambda *args, **kwargs: _aiter([_patch("a.py", "x"), _patch("b.py", "y2")])
+    github.get_compare_files = mocker.AsyncMock(return_value=[_patch("b.py", "y2")])
+    github.create_review_comments = mocker.AsyncMock()
+    github.create_metadata_comment = mocker.AsyncMock()
+
+    ai = mocker.Mock()
+    ai.analyze_code = mocker.AsyncMock(return_value=CodeAnalysisResult(
+        summary="nuevo", score=50, comments=[CodeAnalysisComment(
+            file_path="b.py", line_number=1, content="nuevo", type="bug", severity="high"
+        )]
+    ))
+    ai.generate_metadata = mocker.AsyncMock(return_value=PRMetadataResult(
+        suggested_title="feat: x", suggested_description="", suggested_labels=[], reasoning="r"
+    ))
+    metadata_generator = mocker.Mock()
+    metadata_generator.execute = mocker.Mock(side_effect=lambda pr, context: pr)
+
+    return AnalyzePullRequestUseCase(
+        reviews_repository=reviews_repo,
+        pull_request_repository=pr_repo,
+        prompt_repository=prompt_repo,
+        github_service=github,
+        ai_service=ai,
+        pr_guidelines_repository=guidelines_repo,
+        metadata_generator=metadata_generator,
+    )
+
+
+@pytest.mark.asyncio
+async def test_synchronize_analyzes_only_compare_diff_and_carries_comments(use_case):
+    review = await use_case.execute(_pull_request(), action="synchronize")
+
+    use_case.github.get_compare_files.assert_awaited_once_with(
+        "owner/repo", "old-sha", "new-sha", installation_id=1
+    )
+    analyzed_diff = use_case.ai.analyze_code.call_args.kwargs["diff"]
+    assert "b/b.py" in analyzed_diff and "b/a.py" not in analyzed_diff
+
+    contents = [c.content for c in review.comments]
+    assert "sigue valido" in contents and "obsoleto" not in contents
+    assert review.head_sha == "new-sha"
+    assert review.score == 70.0
+
+    # Solo se publican los comentarios nuevos; los arrastrados ya están en GitHub
+    posted = use_case.github.create_review_comments.call_args.kwargs["review"]
+    assert "sigue valido" not in [c.content for c in posted.comments]
+
+
+@pytest.mark.asyncio
+async def test_opened_event_reviews_full_diff(use_case):
+    await use_case.execute(_pull_request(), action="opened")
+
+    use_case.github.get_compare_files.assert_not_called()
+    analyzed_diff = use_case.ai.analyze_code.call_args.kwargs["diff"]
+    assert "b/a.py" in analyzed_diff and "b/b.py" in analyzed_diff
+
+
+@pytest.mark.asyncio
+async def test_failed_input_is_attributed_and_review_marked_failed(use_case, mocker):
+    use_case.prompt_repo.get_all_active_rules = mocker.AsyncMock(side_effect=RuntimeError("db caída"))
+
+    with pytest.raises(ReviewFailedException, match="rules") as error:
+        await use_case.execute(_pull_request(), action="opened")
+
+    use_case.ai.analyze_code.assert_not_called()
+    saved = use_case.reviews_repo.save.call_args.args[0]
+    assert saved.status == ReviewStatus.FAILED and saved.pull_request_id == 10
+    assert use_case.input_stats.stats()["rules"]["errors"] == 1
+    assert error.value.details["posted"] is False
+
+
+@pytest.mark.asyncio
+async def test_failure_after_posting_is_flagged_as_posted(use_case, mocker):
+    use_case.github.create_metadata_comment = mocker.AsyncMock(side_effect=RuntimeError("502"))
+
+    with pytest.raises(ReviewFailedException) as error:
+        await use_case.execute(_pull_request(), action="opened")
+
+    use_case.github.create_review_comments.assert_awaited_once()
+    assert error.value.details["posted"] is True
+
+
+@pytest.mark.asyncio
+async def test_push_without_diff_changes_keeps_previous_review_without_posting(use_case, mocker):
+    use_case.github.get_compare_files = mocker.AsyncMock(return_value=[_patch("c.py", "fuera del PR")])
+
+    review = await use_case.execute(_pull_request(), action="synchronize")
+
+    use_case.ai.analyze_code.assert_not_called()
+    use_case.github.create_review_comments.assert_not_called()
+    use_case.github.create_metadata_comment.assert_not_called()
+    assert review.head_sha == "new-sha" and review.status == ReviewStatus.COMPLETED
+    assert review.summary == "antes" and review.score == 90.0
+    assert [c.content for c in review.comments] == ["sigue valido", "obsoleto"]
+    use_case.reviews_repo.save.assert_awaited_once_with(review)
+
+
+@pytest.mark.asyncio
+async def test_synchronize_finds_previous_review_still_in_write_buffer(use_case, mocker):
+    use_case.reviews_repo.get_last_completed_by_pr_id = mocker.AsyncMock(return_value=None)
+    use_case.review_writer = ReviewWriteBuffer(use_case.reviews_repo)
+    use_case.review_writer.submit(Review(
+        pull_request_id=10, status=ReviewStatus.COMPLETED, summary="en el búfer", score=80.0,
+        head_sha="buffered-sha", comments=[]
+    ))
+
+    await use_case.execute(_pull_request(), action="synchronize")
+
+    use_case.github.get_compare_files.assert_awaited_once_with(
+        "owner/repo", "buffered-sha", "new-sha", installation_id=1
+    )
+    use_case.reviews_repo.get_last_completed_by_pr_id.assert_not_called()
@@ -0,0 +1,133 @@
+import json
+from types import SimpleNamespace
+import pytest
+from domain.exceptions import CodeAnalysisFailedException
+from infrastructure.ai.langchain_orchestrator import LangchainOrchestrator
+from infrastructure.ai.llm_cache import LLMResultCache
+
+
+def _file_diff(path: str, line: str) -> str:
+    return f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -1 +1 @@\n-old\n+{line}\n"
+
+
+@pytest.mark.asyncio
+async def test_llm_cache_memory_lru_sqlite_tier_and_ttl(tmp_path):
+    now = [1000.0]
+    db_path = str(tmp_path / "llm_cache.db")
+    cache = LLMResultCache(max_entries=1, ttl=60, db_path=db_path, clock=lambda: now[0])
+
+    await cache.put("a", "A")
+    await cache.put("b", "B")  # Expulsa "a" de memoria, pero sigue en SQLite
+
+    assert await cache.get("a") == "A"
+    assert cache.stats()["disk_hits"] == 1
+
+    # Una nueva instancia lee las entradas persistidas
+    reopened = LLMResultCache(db_path=db_path, ttl=60, clock=lambda: now[0])
+    assert await reopened.get("b") == "B"
+
+    now[0] += 61
+    assert await reopened.get("b") is None
+    assert reopened.stats()["misses"] == 1
+    assert LLMResultCache.make_key("ab", "c") != LLMResultCache.make_key("a", "bc")
+
+
+@pytest.mark.asyncio
+async def test_llm_cache_trims_sqlite_by_size(tmp_path):
+    cache = LLMResultCache(max_entries=1, db_path=str(tmp_path / "c.db"), max_db_entries=10)
+    for i in range(15):
+        await cache.put(f"k{i}", "v")
+
+    assert cache._db_entries <= 10
+    assert cache.stats()["evictions"] > 0
+
+
+@pytest.mark.asyncio
+async def test_analyze_code_only_repays_changed_files():
+    sent_diffs = []
+
+    async def agenerate(messages_list):
+        prompt = messages_list[0][0].content
+        sent_diffs.append(prompt)
+        paths = [p for p in ("a.py", "b.py", "c.py") if f"b/{p}" in prompt]
+        return SimpleNamespace(generations=[[SimpleNamespace(text=json.dumps({
+            "summary": "ok",
+            "score": 70,
+            "comments": [
+                {"file_path": p, "line_number": 1, "content": "c", "type": "bug", "severity": "low"}
+                for p in paths
+            ]
+        }))]])
+
+    orchestrator = LangchainOrchestrator(openai_api_key="dummy", cache=LLMResultCache())
+    orchestrator.llm = SimpleNamespace(agenerate=agenerate, model_name="o1-mini")
+    prompt = "{diff}{rules}{context}{format_instructions}"
+
+    first = _file_diff("a.py", "x") + _file_diff("b.py", "y") + _file_diff("c.py", "z")
+    second = _file_diff("a.py", "x") + _file_diff("b.py", "changed") + _file_diff("c.py", "z")
+
+    await orchestrator.analyze_code(diff=first, prompt=prompt, rules=[], context={})
+    result = await orchestrator.analyze_code(diff=second, prompt=prompt, rules=[], context={})
+
+    assert len(sent_diffs) == 4
+    assert "b/b.py" in sent_diffs[3] and "b/a.py" not in sent_diffs[3]
+    assert [c.file_path for c in result.comments] == ["a.py", "b.py", "c.py"]
+    assert orchestrator.cache_stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_fails_analysis_and_caches_the_rest():
+    calls = []
+
+    async def agenerate(messages_list):
+        prompt = messages_list[0][0].content
+        calls.append(prompt)
+        if "b/b.py" in prompt and len(calls) <= 2:
+            raise RuntimeError("timeout")
+        return SimpleNamespace(generations=[[SimpleNamespace(text=json.dumps({
+            "summary": "resumen", "score": 80, "comments": [], "security_concerns": ["XSS"]
+        }))]])
+
+    orchestrator = LangchainOrchestrator(openai_api_key="dummy", cache=LLMResultCache())
+    orchestrator.llm = SimpleNamespace(agenerate=agenerate, model_name="o1-mini")
+    prompt = "{diff}{rules}{context}{format_instructions}"
+    diff = _file_diff("a.py", "x") + _file_diff("b.py", "y")
+
+    with pytest.raises(CodeAnalysisFailedException) as error:
+        await orchestrator.analyze_code(diff=diff, prompt=prompt, rules=[], context={})
+    assert error.value.details["failed_files"] == ["b.py"]
+
+    result = await orchestrator.analyze_code(diff=diff, prompt=prompt, rules=[], context={})
+
+    # Solo se repite el archivo que falló; cada archivo aporta su resumen una vez
+    assert len(calls) == 3 and "b/b.py" in calls[2]
+    assert result.summary == "resumen"
+    assert result.security_concerns == ["XSS"]
+
+
+@pytest.mark.asyncio
+async def test_growing_file_does_not_move_other_files_out_of_the_cache():
+    sent = []
+
+    async def agenerate(messages_list):
+        sent.append(messages_list[0][0].content)
+        return SimpleNamespace(generations=[[SimpleNamespace(text=json.dumps({
+            "summary": "ok", "score": 70, "comments": []
+        }))]])
+
+    orchestrator = LangchainOrchestrator(openai_api_key="dummy", chunk_max_tokens=40, cache=LLMResultCache())
+    orchestrator.llm = SimpleNamespace(agenerate=agenerate, model_name="o1-mini")
+    prompt = "{diff}{rules}{context}{format_instructions}"
+    grown = "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n" + "".join(
+        f"@@ -{i * 10 + 1} +{i * 10 + 1} @@\n-old\n+line {i} with a longer body\n" for i in range(4)
+    )
+
+    await orchestrator.analyze_code(
+        diff=_file_diff("a.py", "x") + _file_diff("b.py", "y"), prompt=prompt, rules=[], context={}
+    )
+    sent.clear()
+    await orchestrator.analyze_code(diff=grown + _file_diff("b.py", "y"), prompt=prompt, rules=[], context={})
+
+    # a.py se divide por hunks en varias llamadas; b.py sigue en caché
+    assert len(sent) > 1
+    assert not any("b/b.py" in prompt for prompt in sent)
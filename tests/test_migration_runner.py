@@ -0,0 +1,57 @@
+import pytest
+from infrastructure.database.migration_runner import MigrationError, MigrationRunner, connect, load_migrations
+
+
+@pytest.fixture
+def migrations_dir(tmp_path):
+    directory = tmp_path / "migrations"
+    directory.mkdir()
+    (directory / "001_initial.sql").write_text(
+        "-- Tabla inicial\ncreate table items (id integer primary key, name text);\n"
+        "insert into items (name) values ('a;b');\n"
+    )
+    (directory / "002_index.sql").write_text("create index idx_items_name on items(name);\n")
+    (directory / "README.md").write_text("no es una migración")
+    return directory
+
+
+@pytest.fixture
+def runner(tmp_path, migrations_dir):
+    connection, dialect = connect(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    return MigrationRunner(connection, dialect=dialect, migrations_dir=str(migrations_dir))
+
+
+def test_applies_pending_migrations_once_and_records_versions(runner):
+    assert [m.version for m in runner.migrate(target="001")] == ["001"]
+    assert [m.version for m in runner.migrate()] == ["002"]
+    assert runner.migrate() == []
+    assert set(runner.applied()) == {"001", "002"}
+
+    cursor = runner.connection.cursor()
+    cursor.execute("select name from items")
+    assert cursor.fetchall() == [("a;b",)]
+
+
+def test_failed_migration_is_rolled_back_and_not_recorded(runner, migrations_dir):
+    (migrations_dir / "003_broken.sql").write_text(
+        "create table other (id integer);\ninsert into missing_table values (1);\n"
+    )
+    with pytest.raises(MigrationError):
+        runner.migrate()
+
+    assert "003" not in runner.applied()
+    cursor = runner.connection.cursor()
+    cursor.execute("select count(*) from sqlite_master where name = 'other'")
+    assert cursor.fetchone() == (0,)
+
+
+def test_edited_migration_is_rejected_and_baseline_skips_execution(runner, migrations_dir):
+    assert [m.version for m in runner.baseline("001")] == ["001"]
+    (migrations_dir / "001_initial.sql").write_text("create table items (id integer primary key);\n")
+    with pytest.raises(MigrationError):
+        runner.migrate()
+
+
+def test_repository_migrations_have_unique_ordered_versions():
+    versions = [int(m.version) for m in load_migrations()]
+    assert versions == sorted(versions) and len(versions) >= 11
@@ -0,0 +1,68 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from domain.models.pull_request import PullRequest, PullRequestStatus
+from infrastructure.database.repositories.pull_request_repository import PullRequestRepository
+
+
+class _FakeTable:
+    """Tabla tech_prs en memoria que registra cada petición a PostgREST."""
+
+    def __init__(self):
+        self.rows = {}
+        self.requests = []
+        self._pending = None
+
+    def upsert(self, json, on_conflict=""):
+        self._pending = (json if isinstance(json, list) else [json], on_conflict)
+        return self
+
+    def execute(self):
+        rows, on_conflict = self._pending
+        self.requests.append((len(rows), on_conflict))
+        stored = []
+        for row in rows:
+            existing = self.rows.get(row["github_id"], {"id": len(self.rows) + 1})
+            self.rows[row["github_id"]] = {**existing, **row}
+            stored.append(self.rows[row["github_id"]])
+        return SimpleNamespace(data=stored)
+
+
+def _pull_request(github_id: int, title: str = "feat: x") -> PullRequest:
+    now = datetime.utcnow()
+    return PullRequest(
+        github_id=github_id, number=github_id, title=title, body="", status=PullRequestStatus.OPEN,
+        author="dev", repository="owner/repo", base_branch="main", head_branch="feature",
+        created_at=now, updated_at=now, suggested_title=""
+    )
+
+
+@pytest.fixture
+def table():
+    return _FakeTable()
+
+
+@pytest.fixture
+def repository(table):
+    return PullRequestRepository(SimpleNamespace(table=lambda name: table))
+
+
+@pytest.mark.asyncio
+async def test_save_is_a_single_upsert_on_github_id(repository, table):
+    first = await repository.save(_pull_request(42))
+    second = await repository.save(_pull_request(42, title="feat: y"))
+
+    assert first == second
+    assert table.requests == [(1, "github_id"), (1, "github_id")]
+    assert table.rows[42]["title"] == "feat: y"
+
+
+@pytest.mark.asyncio
+async def test_save_many_batches_and_keeps_last_version_of_each_pr(repository, table):
+    pull_requests = [_pull_request(n) for n in range(1, 251)] + [_pull_request(7, title="fix: ultima")]
+
+    ids = await repository.save_many(pull_requests, batch_size=100)
+
+    assert len(ids) == 250
+    assert table.requests == [(100, "github_id"), (100, "github_id"), (50, "github_id")]
+    assert table.rows[7]["title"] == "fix: ultima"
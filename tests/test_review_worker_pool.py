@@ -0,0 +1,147 @@
+import asyncio
+from datetime import datetime
+import pytest
+from domain.exceptions import ReviewQueueFullException
+from domain.models.pull_request import PullRequest, PullRequestStatus
+from infrastructure.workers.review_coordinator import ReviewCoordinator
+from infrastructure.workers.review_worker_pool import ReviewJob, ReviewWorkerPool
+
+
+def _job(number: int) -> ReviewJob:
+    now = datetime.utcnow()
+    return ReviewJob(pull_request=PullRequest(
+        github_id=number, number=number, title="t", body="", status=PullRequestStatus.OPEN,
+        author="dev", repository="owner/repo", base_branch="main", head_branch="f",
+        created_at=now, updated_at=now, suggested_title=""
+    ), action="opened")
+
+
+class _SlowUseCase:
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.done = []
+
+    async def execute(self, pull_request, action=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        self.done.append(pull_request.number)
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_jobs_in_background_with_bounded_workers():
+    use_case = _SlowUseCase()
+    pool = ReviewWorkerPool(use_case, workers=2)
+    await pool.start()
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for number in range(5):
+        await pool.enqueue(_job(number))
+    assert loop.time() - start < 0.01  # Encolar no espera al análisis
+
+    await pool.shutdown()
+
+    assert sorted(use_case.done) == [0, 1, 2, 3, 4]
+    assert use_case.peak == 2
+    stats = pool.stats()
+    assert stats["processed"] == 5 and stats["queue_depth"] == 0
+    assert stats["max_wait_seconds"] > 0 and stats["avg_run_seconds"] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_jobs_when_full_or_stopped():
+    pool = ReviewWorkerPool(_SlowUseCase(delay=1), workers=1, max_queue_size=1, drain_timeout=0.01)
+    await pool.start()
+    await pool.enqueue(_job(1))
+    await asyncio.sleep(0)  # El worker toma el primer trabajo
+    await pool.enqueue(_job(2))
+
+    with pytest.raises(ReviewQueueFullException):
+        await pool.enqueue(_job(3))
+
+    await pool.shutdown()
+    with pytest.raises(ReviewQueueFullException):
+        await pool.enqueue(_job(4))
+
+
+class _CancellableUseCase(_SlowUseCase):
+    def __init__(self, delay: float = 0.05):
+        super().__init__(delay)
+        self.cancelled = []
+
+    async def execute(self, pull_request, action=None):
+        try:
+            await super().execute(pull_request, action)
+        except asyncio.CancelledError:
+            self.cancelled.append(pull_request.head_sha)
+            raise
+
+
+def _push(number: int, sha: str) -> ReviewJob:
+    job = _job(number)
+    job.pull_request.head_sha = sha
+    job.action = "synchronize"
+    return job
+
+
+@pytest.mark.asyncio
+async def test_coordinator_coalesces_events_within_debounce_window():
+    use_case = _CancellableUseCase(delay=0.01)
+    pool = ReviewWorkerPool(use_case, workers=2)
+    coordinator = ReviewCoordinator(pool, debounce_seconds=0.05)
+    await pool.start()
+
+    for sha in ("a", "b", "c"):
+        await coordinator.submit(_push(1, sha))
+    await coordinator.submit(_push(2, "x"))
+    await asyncio.sleep(0.1)
+    await pool.shutdown()
+
+    assert sorted(use_case.done) == [1, 2]
+    assert coordinator.stats()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_coordinator_keeps_synchronize_when_coalescing_later_events():
+    actions = []
+
+    class _RecordingUseCase(_SlowUseCase):
+        async def execute(self, pull_request, action=None):
+            actions.append(action)
+            await super().execute(pull_request, action)
+
+    use_case = _RecordingUseCase(delay=0.01)
+    pool = ReviewWorkerPool(use_case, workers=1)
+    coordinator = ReviewCoordinator(pool, debounce_seconds=0.05)
+    await pool.start()
+
+    await coordinator.submit(_push(1, "a"))
+    labeled = _job(1)
+    labeled.action = "labeled"
+    await coordinator.submit(labeled)
+    await asyncio.sleep(0.1)
+    await pool.shutdown()
+
+    assert actions == ["synchronize"]
+
+
+@pytest.mark.asyncio
+async def test_coordinator_cancels_in_flight_review_on_newer_push():
+    use_case = _CancellableUseCase(delay=0.2)
+    pool = ReviewWorkerPool(use_case, workers=2)
+    coordinator = ReviewCoordinator(pool, debounce_seconds=0)
+    await pool.start()
+
+    await coordinator.submit(_push(1, "old"))
+    await asyncio.sleep(0.01)  # La primera revisión ya está en curso
+    await coordinator.submit(_push(1, "new"))
+    await pool.shutdown()
+
+    assert use_case.cancelled == ["old"]
+    assert use_case.done == [1]
+    assert coordinator.stats()["superseded"] == 1
+    assert pool.stats()["cancelled"] == 1 and pool.stats()["processed"] == 1
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from domain.models.review import Review, ReviewComment, ReviewStatus
+from infrastructure.database.review_write_buffer import ReviewWriteBuffer
+
+
+def _review(pr_id: int) -> Review:
+    return Review(
+        pull_request_id=pr_id, status=ReviewStatus.COMPLETED, summary="ok", score=90.0,
+        comments=[ReviewComment(file_path="a.py", line_number=1, content="c")]
+    )
+
+
+@pytest.mark.asyncio
+async def test_flushes_in_batches_by_size_and_by_time(mocker):
+    repository = mocker.Mock()
+    repository.save_many = mocker.AsyncMock()
+    buffer = ReviewWriteBuffer(repository, max_batch=3, flush_interval=0.05)
+    await buffer.start()
+
+    for pr_id in range(3):
+        buffer.submit(_review(pr_id))
+    await asyncio.sleep(0.01)
+    assert [len(call.args[0]) for call in repository.save_many.await_args_list] == [3]
+
+    buffer.submit(_review(3))
+    await asyncio.sleep(0.1)
+    await buffer.shutdown()
+
+    assert [len(call.args[0]) for call in repository.save_many.await_args_list] == [3, 1]
+    assert buffer.stats()["saved"] == 4 and buffer.stats()["buffered"] == 0
+
+
+@pytest.mark.asyncio
+async def test_spills_to_disk_when_database_is_down_and_replays_on_start(mocker, tmp_path):
+    spill_path = str(tmp_path / "spill.jsonl")
+    repository = mocker.Mock()
+    repository.save_many = mocker.AsyncMock(side_effect=RuntimeError("BD caída"))
+    buffer = ReviewWriteBuffer(repository, max_retries=1, retry_delay=0, spill_path=spill_path)
+    buffer.submit(_review(1))
+    await buffer.shutdown()
+
+    assert repository.save_many.await_count == 2
+    assert buffer.stats()["spilled"] == 1
+
+    repository.save_many = mocker.AsyncMock()
+    restarted = ReviewWriteBuffer(repository, spill_path=spill_path)
+    await restarted.start()
+    await restarted.shutdown()
+
+    saved = repository.save_many.await_args.args[0]
+    assert [review.pull_request_id for review in saved] == [1]
+    assert saved[0].comments[0].content == "c"
+    assert not (tmp_path / "spill.jsonl").exists()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_single_saves_and_spills_only_failures(mocker, tmp_path):
+    spill_path = tmp_path / "spill.jsonl"
+
+    async def save_many(reviews):
+        if any(review.pull_request_id == 2 for review in reviews):
+            raise RuntimeError("violates foreign key constraint")
+
+    repository = mocker.Mock()
+    repository.save_many = mocker.AsyncMock(side_effect=save_many)
+    buffer = ReviewWriteBuffer(repository, max_retries=1, retry_delay=0, spill_path=str(spill_path))
+    for pr_id in range(1, 4):
+        buffer.submit(_review(pr_id))
+    await buffer.shutdown()
+
+    assert buffer.stats()["saved"] == 2 and buffer.stats()["spilled"] == 1
+    spilled = [Review.model_validate_json(line) for line in spill_path.read_text().splitlines()]
+    assert [review.pull_request_id for review in spilled] == [2]
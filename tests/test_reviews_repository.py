@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+import pytest
+from domain.models.review import Review, ReviewComment, ReviewStatus
+from infrastructure.database.repositories.reviews_repository import ReviewsRepository
+
+
+class _FakeSaveReviewRpc:
+    """Emula save_review (008_review_upsert.sql) y registra qué comentarios se escriben."""
+
+    def __init__(self):
+        self.calls = 0
+        self.comments = {}  # fingerprint -> id
+        self.inserted = []
+        self.deleted = []
+        self._next_id = 100
+
+    def __call__(self, name, params):
+        assert name == "save_review"
+        self._params = params
+        return self
+
+    def execute(self):
+        self.calls += 1
+        wanted = {c["fingerprint"] for c in self._params["p_comments"]}
+        for fingerprint in set(self.comments) - wanted:
+            self.deleted.append(self.comments.pop(fingerprint))
+        for fingerprint in wanted - set(self.comments):
+            self._next_id += 1
+            self.comments[fingerprint] = self._next_id
+            self.inserted.append(self._next_id)
+        comments = [{"id": i, "fingerprint": f} for f, i in self.comments.items()]
+        return SimpleNamespace(data={"id": self._params["p_review_id"] or 1, "comments": comments})
+
+
+@pytest.mark.asyncio
+async def test_save_writes_review_and_only_changed_comments_in_one_call():
+    rpc = _FakeSaveReviewRpc()
+    repository = ReviewsRepository(SimpleNamespace(rpc=rpc))
+    review = Review(pull_request_id=10, status=ReviewStatus.IN_PROGRESS, summary="", score=0.0)
+
+    await repository.save(review)
+    assert review.id == 1 and rpc.calls == 1
+
+    kept = ReviewComment(file_path="a.py", line_number=1, content="sigue")
+    review.comments = [kept, ReviewComment(file_path="b.py", line_number=2, content="nuevo")]
+    review.status = ReviewStatus.COMPLETED
+    await repository.save(review)
+    kept_id = kept.id
+
+    review.comments = [ReviewComment(file_path="a.py", line_number=1, content="sigue")]
+    await repository.save(review)
+
+    assert rpc.calls == 3
+    assert review.comments[0].id == kept_id  # El comentario sin cambios conserva su fila
+    assert len(rpc.inserted) == 2 and len(rpc.deleted) == 1
+    assert all(comment.review_id == 1 for comment in review.comments)
+
+
+class _RecordingQuery:
+    """Constructor de consultas que registra los filtros y devuelve filas fijas."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            self.calls.append((name, args))
+            return self
+        return method
+
+    def execute(self):
+        self.calls.append(("execute", ()))
+        limit = next((args[0] for name, args in self.calls if name == "limit"), len(self.rows))
+        return SimpleNamespace(data=self.rows[:limit])
+
+
+def _summary_row(review_id: int) -> dict:
+    return {
+        "id": review_id, "pull_request_id": 10, "status": "completed", "summary": "ok", "score": 90.0,
+        "head_sha": "sha", "created_at": "2024-01-01T00:00:00+00:00", "updated_at": "2024-01-01T00:00:00+00:00",
+        "tech_prs": {"number": 7, "title": "feat: x", "repository": "owner/repo", "author": "dev"},
+        "tech_review_comments": [{"count": 3}]
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_by_pr_id_loads_comments_in_the_same_request():
+    query = _RecordingQuery([{
+        "id": 1, "pull_request_id": 10, "status": "completed", "summary": "ok", "score": 90.0,
+        "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00",
+        "tech_review_comments": [{"id": 5, "review_id": 1, "file_path": "a.py", "line_number": 1, "content": "c"}]
+    }])
+    repository = ReviewsRepository(SimpleNamespace(table=lambda name: query))
+
+    review = await repository.get_by_pr_id(10)
+
+    assert [c.id for c in review.comments] == [5]
+    assert [name for name, _ in query.calls].count("execute") == 1
+    assert ("select", ("*, tech_review_comments(*)",)) in query.calls
+
+
+@pytest.mark.asyncio
+async def test_list_reviews_uses_keyset_cursor():
+    query = _RecordingQuery([_summary_row(review_id) for review_id in (40, 39, 38)])
+    repository = ReviewsRepository(SimpleNamespace(table=lambda name: query))
+
+    page = await repository.list_reviews(repository="owner/repo", cursor=41, limit=2)
+
+    assert [item.id for item in page.items] == [40, 39]
+    assert page.next_cursor == 39
+    assert page.items[0].comment_count == 3 and page.items[0].author == "dev"
+    assert ("eq", ("tech_prs.repository", "owner/repo")) in query.calls
+    assert ("lt", ("id", 41)) in query.calls
+    assert ("limit", (3,)) in query.calls
@@ -0,0 +1,66 @@
+import json
+from types import SimpleNamespace
+import pytest
+from domain.models.file_patch import FilePatch
+from infrastructure.ai.diff_chunker import estimate_tokens
+from infrastructure.ai.langchain_orchestrator import LangchainOrchestrator
+from infrastructure.ai.token_budget import TokenBudget, TokenCounter
+
+
+class _HeuristicCounter(TokenCounter):
+    def __init__(self):
+        super().__init__("o1-mini")
+        self._encoding = None
+
+
+def _diff(path: str, hunks: int, added: bool = True) -> str:
+    parts = [f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n"]
+    for h in range(hunks):
+        sign = "+" if added else "-"
+        parts.append(f"@@ -{h * 10 + 1},1 +{h * 10 + 1},1 @@\n" + "".join(f"{sign}line {h} {i}\n" for i in range(20)))
+    return "".join(parts)
+
+
+def test_budget_trims_lowest_value_hunks_deterministically():
+    patches = FilePatch.from_unified_diff(
+        _diff("src/app.py", 2) + _diff("package-lock.json", 2) + _diff("src/old.py", 1, added=False)
+    )
+    hunk_tokens = estimate_tokens(patches[0].hunks[0])
+    budget = TokenBudget("o1-mini", max_review_tokens=hunk_tokens * 2, counter=_HeuristicCounter())
+
+    kept, trimmed = budget.trim(patches, overhead_tokens=100)
+    kept_again, trimmed_again = budget.trim(patches, overhead_tokens=100)
+
+    assert [str(h) for h in trimmed] == [str(h) for h in trimmed_again]
+    assert {str(h) for h in trimmed} == {"package-lock.json#0", "package-lock.json#1", "src/old.py#0"}
+    assert [patch.path for patch in kept] == ["src/app.py"]
+    assert kept[0].diff == patches[0].diff
+
+
+@pytest.mark.asyncio
+async def test_estimate_does_not_call_model_and_usage_is_recorded():
+    calls = []
+
+    async def agenerate(messages_list):
+        calls.append(messages_list)
+        return SimpleNamespace(
+            generations=[[SimpleNamespace(text=json.dumps({"summary": "ok", "score": 90, "comments": []}))]],
+            llm_output={"token_usage": {"prompt_tokens": 500, "completion_tokens": 40}}
+        )
+
+    orchestrator = LangchainOrchestrator(openai_api_key="dummy", chunk_max_tokens=200)
+    orchestrator.llm = SimpleNamespace(agenerate=agenerate, model_name="o1-mini")
+    diff = _diff("a.py", 2) + _diff("b.py", 2)
+    prompt = "{diff}{rules}{context}{format_instructions}"
+
+    estimate = await orchestrator.estimate_code_analysis(diff=diff, prompt=prompt, rules=[], context={})
+    assert calls == []
+    assert estimate.files == 2 and estimate.calls >= 2
+    assert estimate.prompt_tokens > estimate_tokens(diff)  # Incluye plantilla e instrucciones por llamada
+    assert estimate.estimated_cost_usd > 0 and estimate.estimated_latency_seconds > 0
+
+    await orchestrator.analyze_code(diff=diff, prompt=prompt, rules=[], context={})
+    usage = orchestrator.usage_stats()
+    assert usage["calls"] == len(calls) == estimate.calls
+    assert usage["actual_prompt_tokens"] == 500 * len(calls)
+    assert usage["estimated_prompt_tokens"] > 0
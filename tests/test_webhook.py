@@ -56,9 +56,9 @@ def test_github_webhook():
         }
     )
 
-    assert response.status_code == 200
+    assert response.status_code == 202
     result = response.json()
-    assert result["message"] == "Analysis completed"
+    assert result["message"] == "Analysis queued"
 
 def test_valid_webhook(test_client, mock_supabase, mocker):
     # Mock GitHub service
@@ -115,8 +115,8 @@ def test_valid_webhook(test_client, mock_supabase, mocker):
         }
     )
 
-    assert response.status_code == 200
-    assert response.json()["message"] == "Analysis completed"
+    assert response.status_code == 202
+    assert response.json()["message"] == "Analysis queued"
 
 def test_invalid_signature(test_client):
     response = test_client.post(
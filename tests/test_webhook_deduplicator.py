@@ -0,0 +1,61 @@
+from datetime import datetime
+import pytest
+from domain.models.pull_request import PullRequest, PullRequestStatus
+from infrastructure.github.webhook_deduplicator import WebhookDeduplicator
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _pull_request(sha: str = "abc") -> PullRequest:
+    now = datetime.utcnow()
+    return PullRequest(
+        github_id=1, number=7, title="t", body="", status=PullRequestStatus.OPEN,
+        author="dev", repository="owner/repo", base_branch="main", head_branch="f", head_sha=sha,
+        created_at=now, updated_at=now, suggested_title=""
+    )
+
+
+@pytest.mark.asyncio
+async def test_redelivery_and_replayed_event_are_duplicates_until_ttl():
+    clock = _Clock()
+    dedupe = WebhookDeduplicator(ttl=60, clock=clock)
+
+    assert not await dedupe.is_duplicate("d1", _pull_request(), "synchronize")
+    assert await dedupe.is_duplicate("d1", _pull_request(), "synchronize")  # Reentrega de GitHub
+    assert await dedupe.is_duplicate("d2", _pull_request(), "synchronize")  # Reenvío con otro id
+    assert not await dedupe.is_duplicate("d3", _pull_request("def"), "synchronize")  # Nuevo push
+    assert not await dedupe.is_duplicate("d4", _pull_request("def"), "labeled", label="bug")
+
+    clock.now += 61
+    assert not await dedupe.is_duplicate("d5", _pull_request(), "synchronize")
+
+    stats = dedupe.stats()
+    assert stats["checked"] == 6 and stats["duplicates"] == 2
+    assert stats["hit_rate"] == pytest.approx(2 / 6)
+
+
+@pytest.mark.asyncio
+async def test_persistent_store_shares_deliveries_and_forget_allows_redelivery(mocker):
+    store = mocker.Mock()
+    store.register = mocker.AsyncMock(return_value=False)  # Otra réplica ya la registró
+    store.delete = mocker.AsyncMock()
+    dedupe = WebhookDeduplicator(store=store)
+
+    assert await dedupe.is_duplicate("d1", _pull_request(), "opened")
+    store.register.assert_awaited_once()
+
+    store.register.return_value = True
+    assert not await dedupe.is_duplicate("d2", _pull_request("def"), "opened")
+    await dedupe.forget("d2", _pull_request("def"), "opened")
+    store.delete.assert_awaited_with("d2")
+    assert not await dedupe.is_duplicate("d2", _pull_request("def"), "opened")
+
+    # Si la base falla se procesa el evento
+    store.register.side_effect = RuntimeError("db caída")
+    assert not await dedupe.is_duplicate("d3", _pull_request("ghi"), "opened")